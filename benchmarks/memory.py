@@ -0,0 +1,146 @@
+"""
+Memory usage of parsed documents:
+
+- build steps: XML string kept together with dicts parsed from it by
+  xmltodict (if installed) and by `response2py`, as callers used to do with
+  raw `get_steps()` result, against StepTree parsed from undecoded response
+  body.
+- builds and audits: dicts of PARSE content type against records of RECORDS
+  content type, retained memory is also reported per row.
+- measurements: dicts of PARSE content type against columns of
+  `measurements.get_columns()`.
+
+Retained memory is what stays allocated while result is referenced, peak
+memory includes temporary objects of parsing.
+
+Per row numbers are stable from several thousands rows, tracing of
+allocations is slow, so default sizes are kept small.
+
+Usage:
+
+    python benchmarks/memory.py --steps 1000 --rows 10000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
+
+import payloads
+
+try:
+    import xmltodict
+except ImportError:
+    xmltodict = None
+
+from quickbuild.columns import parse_columns
+from quickbuild.helpers import ContentType, response2py
+from quickbuild.models import parse_steps
+from quickbuild.records import AuditRecord, BuildRecord, response2records
+
+
+def measure(func: Callable[[], Any]) -> Tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        # result is referenced until memory is traced
+        _ = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return current, peak
+
+
+def bench_memory(count: int) -> Dict[str, int]:
+    body = payloads.steps_to_xml(payloads.steps(count)).encode()
+
+    def legacy(parse: Callable[[str], Any]) -> Any:
+        text = body.decode()
+        return text, parse(text)
+
+    def typed() -> Any:
+        return parse_steps(response2py(body, ContentType.PARSE))
+
+    funcs = [
+        ('dicts', partial(legacy, partial(response2py, content_type=ContentType.PARSE))),
+        ('step_tree', typed),
+    ]
+
+    if xmltodict is not None:
+        funcs.insert(0, ('xmltodict', partial(legacy, xmltodict.parse)))
+
+    results = {}
+
+    for name, func in funcs:
+        current, peak = measure(func)
+        results['memory/steps/{}/retained'.format(name)] = current
+        results['memory/steps/{}/peak'.format(name)] = peak
+
+    return results
+
+
+def bench_records(count: int) -> Dict[str, float]:
+    documents = (
+        ('builds', 'Build', payloads.builds(count), BuildRecord),
+        ('audits', 'Audit', payloads.audits(count), AuditRecord),
+    )
+
+    results = {}  # type: Dict[str, float]
+
+    for name, class_name, records, record_type in documents:
+        body = payloads.to_xml(class_name, records).encode()
+
+        for content_type in (ContentType.PARSE, ContentType.RECORDS):
+            current, peak = measure(
+                partial(response2records, body, content_type, record_type)
+            )
+
+            key = 'memory/{}/{}'.format(name, content_type.name.lower())
+            results[key + '/retained'] = current
+            results[key + '/peak'] = peak
+            results[key + '/per_row'] = current / count
+
+    return results
+
+
+def bench_columns(count: int) -> Dict[str, float]:
+    body = payloads.to_xml('MeasurementDataR00', payloads.measurements(count)).encode()
+
+    results = {}  # type: Dict[str, float]
+
+    for name, func in (
+        ('parse', lambda: response2py(body, ContentType.PARSE)),
+        ('columns', lambda: parse_columns(body)),
+    ):
+        current, peak = measure(func)
+        results['memory/measurements/{}/retained'.format(name)] = current
+        results['memory/measurements/{}/peak'.format(name)] = peak
+        results['memory/measurements/{}/per_row'.format(name)] = current / count
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    for key, value in bench_memory(args.steps).items():
+        print('{:<40} {:>10.1f} KiB'.format(key, value / 1024))
+
+    records = bench_records(args.rows)
+    records.update(bench_columns(args.rows))
+
+    for key, value in records.items():
+        if key.endswith('/per_row'):
+            print('{:<40} {:>10.1f} B'.format(key, value))
+        else:
+            print('{:<40} {:>10.1f} KiB'.format(key, value / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Generators of realistic QuickBuild documents of arbitrary size.
+
+Every document is rendered from the same records both to XML, as QuickBuild
+serializes model objects, and to JSON, so both content types carry the same
+data.
+"""
+import json
+
+from typing import Any, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+CLASS_PREFIX = 'com.pmease.quickbuild.model.'
+
+STATUSES = ('SUCCESSFUL', 'FAILED', 'RECOMMENDED', 'CANCELLED', 'TIMEOUT')
+
+Record = Dict[str, Any]
+
+
+def _render_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    if isinstance(value, dict):
+        return ''.join(
+            '<{0}>{1}</{0}>'.format(key, _render_value(item))
+            for key, item in value.items()
+        )
+
+    return escape(str(value))
+
+
+def to_xml(class_name: str, records: List[Record]) -> str:
+    tag = CLASS_PREFIX + class_name
+    items = ''.join(
+        '<{0}>{1}</{0}>'.format(tag, _render_value(record))
+        for record in records
+    )
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n<list>{}</list>'.format(items)
+
+
+def to_json(records: List[Record]) -> str:
+    return json.dumps(records)
+
+
+def builds(count: int) -> List[Record]:
+    return [
+        {
+            'id': i,
+            'configuration': i % 100 + 1,
+            'version': '1.0.{}'.format(i),
+            'requester': 1,
+            'scheduled': i % 3 == 0,
+            'status': STATUSES[i % len(STATUSES)],
+            'statusDate': '2021-01-06T19:59:52.752Z',
+            'beginDate': '2021-01-06T19:59:52.617Z',
+            'duration': 1000 + i % 500,
+            'waitDuration': 96,
+            'stepRuntimes': {
+                'entry': {
+                    'string': 'master',
+                    'com.pmease.quickbuild.stepsupport.StepRuntime': {
+                        'status': 'SUCCESSFUL',
+                        'nodeAddress': 'node-{}:8810'.format(i % 8),
+                        'waitDuration': 96,
+                        'duration': 11,
+                    },
+                },
+            },
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def configurations(depth: int, fanout: int) -> List[Record]:
+    """
+    Tree of configurations, where each one except leaves has `fanout`
+    children, root has identifier 1.
+    """
+    records = []  # type: List[Record]
+    queue = [(1, None, 'root', 0)]  # type: List[Tuple[int, Any, str, int]]
+    next_id = 2
+
+    while queue:
+        configuration_id, parent, name, level = queue.pop(0)
+
+        record = {
+            'id': configuration_id,
+            'disabled': False,
+            'name': name,
+            'order': 100,
+            'statusDate': '2021-03-08T16:51:42.206Z',
+        }  # type: Record
+        if parent is not None:
+            record['parent'] = parent
+        records.append(record)
+
+        if level + 1 >= depth:
+            continue
+
+        for i in range(fanout):
+            queue.append((next_id, configuration_id, 'child-{}'.format(i), level + 1))
+            next_id += 1
+
+    return records
+
+
+def audits(count: int) -> List[Record]:
+    return [
+        {
+            'id': i,
+            'user': 'user{}'.format(i % 50),
+            'timestamp': '2021-05-10T07:11:32.285Z',
+            'configuration': i % 100 + 1,
+            'action': 'Build request was submitted by scheduler.',
+        }
+        for i in range(count, 0, -1)
+    ]
+
+
+def measurements(count: int, sources: int = 10) -> List[Record]:
+    """
+    Disk usage of `sources` nodes measured every minute, `count` points in
+    total.
+    """
+    return [
+        {
+            'id': i,
+            'timestamp': 1361854800000 + 60000 * (i // sources),
+            'source': 'agent-{}:8811'.format(i % sources),
+            'metricName': 'disk.usage',
+            'value': 50 + (i * 7919) % 5000 / 100,
+        }
+        for i in range(count)
+    ]
+
+
+def steps(count: int, fanout: int = 5) -> List[Record]:
+    """
+    Tree of build steps in breadth-first order, where each step except leaves
+    has `fanout` children, root step is `master`.
+    """
+    records = []  # type: List[Record]
+    queue = [['master']]
+
+    while queue and len(records) < count:
+        path = queue.pop(0)
+        records.append({
+            'name': path[-1],
+            'enabled': True,
+            'timeout': 0,
+            'command': 'make {}'.format(path[-1]),
+            'path': path,
+        })
+
+        for i in range(fanout):
+            queue.append(path + ['{}-{}'.format(path[-1], i)])
+
+    return records
+
+
+def steps_to_xml(records: List[Record]) -> str:
+    """
+    Steps have path elements with repeated tags, so they are rendered apart
+    from model objects.
+    """
+    items = []
+
+    for record in records:
+        elements = ''.join(
+            '<com.pmease.quickbuild.stepsupport.StepPath_-Element>'
+            '<stepName>{}</stepName><params class="linked-hash-map"/>'
+            '</com.pmease.quickbuild.stepsupport.StepPath_-Element>'.format(escape(name))
+            for name in record['path']
+        )
+        fields = _render_value({
+            key: value for key, value in record.items() if key != 'path'
+        })
+        items.append(
+            '<com.pmease.quickbuild.plugin.basis.CommandlineBuildStep>{}'
+            '<path><elements>{}</elements></path>'
+            '</com.pmease.quickbuild.plugin.basis.CommandlineBuildStep>'.format(fields, elements)
+        )
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n<list>{}</list>'.format(''.join(items))
+
+
+def sizes(maximum: int) -> Iterator[int]:
+    """
+    Payload sizes growing tenfold from 10 up to maximum.
+    """
+    size = 10
+    while size < maximum:
+        yield size
+        size *= 10
+
+    yield maximum
@@ -0,0 +1,68 @@
+"""
+Requests per second of both clients with different connection pool options.
+
+Usage:
+
+    python benchmarks/pool.py --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from stub_server import StubServer, text
+
+from quickbuild import AsyncQBClient, QBClient
+
+ROUTES = {
+    r'/rest/builds/\d+/status': text('SUCCESSFUL'),
+}
+
+
+def bench_sync(url: str, requests: int, concurrency: int, pool: dict) -> float:
+    client = QBClient(url, pool=pool)
+
+    started = time.monotonic()
+    client.gather_map(client.builds.get_status, range(requests), concurrency=concurrency)
+    elapsed = time.monotonic() - started
+
+    client.close()
+    return requests / elapsed
+
+
+async def bench_async(url: str, requests: int, concurrency: int, pool: dict) -> float:
+    client = AsyncQBClient(url, pool=pool)
+
+    started = time.monotonic()
+    await client.gather_map(client.builds.get_status, range(requests), concurrency=concurrency)
+    elapsed = time.monotonic() - started
+
+    await client.close()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    pools = {
+        'default': {},
+        'limit_per_host=concurrency': dict(limit_per_host=args.concurrency),
+        'limit_per_host=2': dict(limit_per_host=2),
+    }
+
+    with StubServer(ROUTES) as server:
+        for name, pool in pools.items():
+            sync_rps = bench_sync(server.url, args.requests, args.concurrency, pool)
+            async_rps = asyncio.run(
+                bench_async(server.url, args.requests, args.concurrency, pool)
+            )
+
+            print('{:<30} sync {:>8.0f} req/s   async {:>8.0f} req/s'.format(
+                name, sync_rps, async_rps,
+            ))
+
+
+if __name__ == '__main__':
+    main()
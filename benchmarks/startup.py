@@ -0,0 +1,50 @@
+"""
+Startup time of short-lived scripts: package import and client creation,
+each measured in fresh interpreter, the best of repeats is taken.
+
+Usage:
+
+    python benchmarks/startup.py --repeat 20
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from typing import Dict
+
+SCENARIOS = {
+    'python': 'pass',
+    'import': 'import quickbuild',
+    'sync_client': 'import quickbuild; quickbuild.QBClient("http://server").builds',
+    'async_client': 'import quickbuild; quickbuild.AsyncQBClient',
+}
+
+
+def bench_startup(repeat: int) -> Dict[str, float]:
+    results = {}
+
+    for name, code in SCENARIOS.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True)
+            timings.append(time.perf_counter() - started)
+
+        results['startup/' + name] = min(timings)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for key, value in bench_startup(args.repeat).items():
+        print('{:<30} {:>10.2f} ms'.format(key, value * 1000))
+
+
+if __name__ == '__main__':
+    main()
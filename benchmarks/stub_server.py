@@ -0,0 +1,86 @@
+"""
+Local QuickBuild stub server for benchmarks.
+
+Serves canned responses over HTTP/1.1 with keep-alive, so connection reuse of
+clients could be measured.
+"""
+import re
+import threading
+
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+
+Route = Callable[['StubHandler'], Tuple[str, str]]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    routes = {}  # type: Dict[str, Route]
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        path = self.path.split('?', 1)[0]
+
+        for pattern, route in self.routes.items():
+            if re.fullmatch(pattern, path):
+                content_type, body = route(self)
+                self.respond(HTTPStatus.OK, content_type, body)
+                return
+
+        self.respond(HTTPStatus.NOT_FOUND, 'text/plain', 'Not found')
+
+    def respond(self, status: HTTPStatus, content_type: str, body: str) -> None:
+        data = body.encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer:
+
+    def __init__(self, routes: Dict[str, Route]) -> None:
+        handler = type('Handler', (StubHandler,), {'routes': routes})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def __enter__(self) -> 'StubServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def text(body: str) -> Route:
+    return lambda _: ('text/plain', body)
+
+
+def xml(body: str) -> Route:
+    return lambda _: ('application/xml', body)
+
+
+def document(xml_body: str, json_body: str) -> Route:
+    """
+    Respond with JSON if client accepts it, otherwise with XML.
+    """
+    def route(handler: StubHandler) -> Tuple[str, str]:
+        if 'application/json' in handler.headers.get('Accept', ''):
+            return 'application/json', json_body
+        return 'application/xml', xml_body
+
+    return route
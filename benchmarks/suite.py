@@ -0,0 +1,262 @@
+"""
+Benchmark suite of client hot paths against local QuickBuild stub server.
+
+Measures package import and client creation time, parse time of response2py
+across payload sizes, throughput and latency of QBClient and AsyncQBClient on
+large documents (build search results, configuration trees, audit lists).
+Results are stored as JSON, so they could be compared with results of
+another version.
+
+Usage:
+
+    python benchmarks/suite.py
+    python benchmarks/suite.py --baseline benchmarks/results/0.18.0.json
+
+All stored metrics are seconds, so lower is better. Comparison with baseline
+fails if any metric is slower more than tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import payloads
+
+from startup import bench_startup
+from stub_server import StubServer, document
+
+import quickbuild
+
+from quickbuild import AsyncQBClient, ContentType, QBClient
+from quickbuild.helpers import response2py
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+Scenario = NamedTuple(
+    'Scenario', [
+        ('name', str),
+        ('path', str),
+        ('class_name', str),
+        ('records', List[payloads.Record]),
+        ('call', Callable[[Any], Any]),
+    ]
+)
+
+CONTENT_TYPES = {
+    'xml': ContentType.PARSE,
+    'json': ContentType.JSON,
+}
+
+
+def get_scenarios(args: argparse.Namespace) -> List[Scenario]:
+    return [
+        Scenario(
+            'builds.search',
+            r'/rest/builds',
+            'Build',
+            payloads.builds(args.builds),
+            lambda client: client.builds.search(args.builds),
+        ),
+        Scenario(
+            'configurations.get',
+            r'/rest/configurations',
+            'Configuration',
+            payloads.configurations(args.depth, args.fanout),
+            lambda client: client.configurations.get(),
+        ),
+        Scenario(
+            'audits.get',
+            r'/rest/audits',
+            'Audit',
+            payloads.audits(args.audits),
+            lambda client: client.audits.get(args.audits),
+        ),
+    ]
+
+
+def percentile(values: List[float], rank: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * rank), len(ordered) - 1)]
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    return min(timings)
+
+
+def bench_parse(args: argparse.Namespace) -> Dict[str, float]:
+    # pylint: disable=cell-var-from-loop
+    results = {}
+
+    for size in payloads.sizes(args.builds):
+        records = payloads.builds(size)
+
+        # adapters pass undecoded response body to parsers
+        body = payloads.to_xml('Build', records).encode()
+
+        results['parse/response2py/{}'.format(size)] = best_of(
+            lambda: response2py(body, content_type=ContentType.PARSE),
+            args.repeat,
+        )
+
+        body = payloads.to_json(records).encode()
+        results['parse/json/{}'.format(size)] = best_of(
+            lambda: json.loads(body),
+            args.repeat,
+        )
+
+    return results
+
+
+def summarize(prefix: str, timings: List[float], elapsed: float) -> Dict[str, float]:
+    return {
+        prefix + '/p50': statistics.median(timings),
+        prefix + '/p95': percentile(timings, 0.95),
+        # inverse throughput, seconds per request
+        prefix + '/per_request': elapsed / len(timings),
+    }
+
+
+def bench_sync(url: str, scenario: Scenario, content_type: ContentType,
+               args: argparse.Namespace) -> Dict[str, float]:
+    client = QBClient(url, content_type=content_type)
+
+    try:
+        batch = client.gather_map(
+            lambda _: scenario.call(client),
+            range(args.requests),
+            concurrency=args.concurrency,
+        )
+    finally:
+        client.close()
+
+    return summarize('sync', batch.timings, batch.elapsed)
+
+
+async def bench_async(url: str, scenario: Scenario, content_type: ContentType,
+                      args: argparse.Namespace) -> Dict[str, float]:
+    client = AsyncQBClient(url, content_type=content_type)
+
+    try:
+        batch = await client.gather_map(
+            lambda _: scenario.call(client),
+            range(args.requests),
+            concurrency=args.concurrency,
+        )
+    finally:
+        await client.close()
+
+    return summarize('async', batch.timings, batch.elapsed)
+
+
+def bench_http(args: argparse.Namespace) -> Dict[str, float]:
+    results = {}
+    scenarios = get_scenarios(args)
+
+    routes = {
+        scenario.path: document(
+            payloads.to_xml(scenario.class_name, scenario.records),
+            payloads.to_json(scenario.records),
+        )
+        for scenario in scenarios
+    }
+
+    with StubServer(routes) as server:
+        for scenario in scenarios:
+            for type_name, content_type in CONTENT_TYPES.items():
+                prefix = 'http/{}/{}/'.format(scenario.name, type_name)
+
+                metrics = bench_sync(server.url, scenario, content_type, args)
+                metrics.update(asyncio.run(
+                    bench_async(server.url, scenario, content_type, args)
+                ))
+
+                for key, value in metrics.items():
+                    results[prefix + key] = value
+
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> bool:
+    passed = True
+
+    for key, value in results.items():
+        if key not in baseline:
+            continue
+
+        change = value / baseline[key] - 1 if baseline[key] else 0
+        mark = ''
+        if change > tolerance:
+            mark = '  REGRESSION'
+            passed = False
+
+        print('{:<50} {:>10.2f} ms {:>10.2f} ms {:>+8.1%}{}'.format(
+            key, baseline[key] * 1000, value * 1000, change, mark,
+        ))
+
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--builds', type=int, default=10000,
+                        help='number of builds in search result')
+    parser.add_argument('--depth', type=int, default=5,
+                        help='depth of configuration tree')
+    parser.add_argument('--fanout', type=int, default=6,
+                        help='number of children of each configuration')
+    parser.add_argument('--audits', type=int, default=10000,
+                        help='number of audit entries')
+    parser.add_argument('--requests', type=int, default=20,
+                        help='number of requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='repeats of parse benchmark, the best is taken')
+    parser.add_argument('--output', default=os.path.join(
+        RESULTS_DIR, '{}.json'.format(quickbuild.__version__),
+    ))
+    parser.add_argument('--baseline', help='results of previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed slowdown relative to baseline (default 10%%)')
+    args = parser.parse_args()
+
+    results = bench_startup(args.repeat)
+    results.update(bench_parse(args))
+    results.update(bench_http(args))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': quickbuild.__version__,
+            'python': platform.python_version(),
+            'timestamp': time.time(),
+            'arguments': vars(args),
+            'results': results,
+        }, f, indent=2, sort_keys=True)
+
+    if args.baseline is None:
+        for key, value in results.items():
+            print('{:<50} {:>10.2f} ms'.format(key, value * 1000))
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    if not compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
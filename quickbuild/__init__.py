@@ -1,5 +1,6 @@
-from quickbuild.adapters.aio import AsyncQBClient
-from quickbuild.adapters.sync import QBClient
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
 from quickbuild.exceptions import (
     QBError,
     QBForbiddenError,
@@ -9,6 +10,29 @@ from quickbuild.exceptions import (
 )
 from quickbuild.helpers import ContentType
 
+if TYPE_CHECKING:
+    from quickbuild.adapters.aio import AsyncQBClient
+    from quickbuild.adapters.sync import QBClient
+    from quickbuild.collector import (
+        AsyncMeasurementsCollector,
+        MeasurementsCollector,
+    )
+    from quickbuild.graph import BuildGraph
+    from quickbuild.metrics import (
+        OpenTelemetryHook,
+        PrometheusHook,
+        RequestMetrics,
+    )
+    from quickbuild.tailer import (
+        AsyncAuditTailer,
+        AuditTailer,
+        FileMarkStore,
+        MarkStore,
+        SQLiteMarkStore,
+    )
+    from quickbuild.tree import ConfigurationTree
+    from quickbuild.watcher import AsyncBuildWatcher, BuildWatcher
+
 __version__ = '0.18.0'
 
 __all__ = (
@@ -22,5 +46,53 @@ __all__ = (
     'QBProcessingError',
     'QBServerError',
     # other
+    'AsyncAuditTailer',
+    'AsyncBuildWatcher',
+    'AsyncMeasurementsCollector',
+    'AuditTailer',
+    'BuildGraph',
+    'BuildWatcher',
+    'ConfigurationTree',
     'ContentType',
+    'FileMarkStore',
+    'MarkStore',
+    'MeasurementsCollector',
+    'OpenTelemetryHook',
+    'PrometheusHook',
+    'RequestMetrics',
+    'SQLiteMarkStore',
 )
+
+# adapters pull in heavy HTTP libraries, so they are imported on first access,
+# e.g. sync only script doesn't need to import aiohttp
+_LAZY_IMPORTS = {
+    'AsyncQBClient': 'quickbuild.adapters.aio',
+    'QBClient': 'quickbuild.adapters.sync',
+    'AsyncAuditTailer': 'quickbuild.tailer',
+    'AsyncBuildWatcher': 'quickbuild.watcher',
+    'AsyncMeasurementsCollector': 'quickbuild.collector',
+    'AuditTailer': 'quickbuild.tailer',
+    'BuildGraph': 'quickbuild.graph',
+    'BuildWatcher': 'quickbuild.watcher',
+    'ConfigurationTree': 'quickbuild.tree',
+    'FileMarkStore': 'quickbuild.tailer',
+    'MarkStore': 'quickbuild.tailer',
+    'MeasurementsCollector': 'quickbuild.collector',
+    'OpenTelemetryHook': 'quickbuild.metrics',
+    'PrometheusHook': 'quickbuild.metrics',
+    'RequestMetrics': 'quickbuild.metrics',
+    'SQLiteMarkStore': 'quickbuild.tailer',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
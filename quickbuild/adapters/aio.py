@@ -1,6 +1,29 @@
 import asyncio
-
-from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
+import pickle
+import time
+
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from http import HTTPStatus
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from aiohttp import (
     BasicAuth,
@@ -8,15 +31,24 @@ from aiohttp import (
     ClientResponse,
     ClientSession,
     ClientTimeout,
+    TCPConnector,
 )
 
-from quickbuild.core import ContentType, QuickBuild, Response
+from quickbuild.cache import CacheKey, Revalidation, get_request_key
+from quickbuild.core import BatchResult, ContentType, QuickBuild, Response
+from quickbuild.download import (
+    DEFAULT_CHUNK_SIZE,
+    DOWNLOAD_STATUSES,
+    DownloadTarget,
+    Target,
+)
 from quickbuild.exceptions import QBError, QBUnauthorizedError
+from quickbuild.metrics import RequestMetrics
 
 
 class RetryClientSession:
 
-    def __init__(self, options: dict) -> None:
+    def __init__(self, options: dict, connector: Optional[TCPConnector] = None) -> None:
         self.total = options['total']
         self.factor = options.get('factor', 1)
         self.statuses = options.get('statuses', [])
@@ -24,9 +56,16 @@ class RetryClientSession:
             'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'
         ])
 
-        self.session = ClientSession()
+        self.session = ClientSession(connector=connector)
 
     async def request(self, *args: Any, **kwargs: Any) -> ClientResponse:
+        response, _ = await self.send(*args, **kwargs)
+        return response
+
+    async def send(self, *args: Any, **kwargs: Any) -> Tuple[ClientResponse, int]:
+        """
+        Make request, returns response and number of retried attempts.
+        """
         for total in range(self.total):
             try:
                 response = await self.session.request(*args, **kwargs)
@@ -41,7 +80,7 @@ class RetryClientSession:
 
             await asyncio.sleep(self.factor * (2 ** (total - 1)))
 
-        return response
+        return response, total
 
     async def close(self) -> None:
         await self.session.close()
@@ -61,6 +100,11 @@ class AsyncQBClient(QuickBuild):
                  verify: bool = True,
                  timeout: Optional[float] = None,
                  retry: Optional[dict] = None,
+                 pool: Optional[dict] = None,
+                 cache: Optional[dict] = None,
+                 revalidate: Optional[dict] = None,
+                 coalesce: bool = False,
+                 offload: Optional[dict] = None,
                  auth_update_callback: Optional[Callable[[], Awaitable[Tuple[str, str]]]] = None
                  ) -> None:
         """
@@ -108,6 +152,98 @@ class AsyncQBClient(QuickBuild):
                         statuses=[500]
                     )
 
+            pool (Optional[dict]):
+                Connection pool options of aiohttp connector, aiohttp defaults
+                are used if not set.
+
+                - limit: ``int`` Total number of simultaneous connections.
+                    (default 100)
+                - limit_per_host: ``int`` Number of simultaneous connections
+                    to the same host. (default unlimited)
+                - keepalive_timeout: ``float`` Timeout in seconds to keep idle
+                    connection open for reuse. (default 15)
+                - ttl_dns_cache: ``int`` Time in seconds to cache DNS lookups,
+                    None caches forever. (default 10)
+
+                Example:
+
+                .. code-block:: python
+
+                    pool = dict(
+                        limit=200,
+                        limit_per_host=50,
+                        keepalive_timeout=60,
+                    )
+
+            cache (Optional[dict]):
+                Response cache options for read-mostly endpoints. Disabled by
+                default, any non empty dict enables it.
+
+                - size: ``int`` Maximum number of cached responses, least
+                    recently used are evicted. (default 1024)
+                - ttl: ``float`` TTL in seconds for GET requests not matched
+                    by endpoints. (default 0, not cached)
+                - endpoints: ``Dict[str, float]`` Regular expressions of REST
+                    path mapped to TTL in seconds. By default configuration
+                    paths, user display names, identifiers and server version
+                    are cached.
+
+                Update, create and delete requests invalidate cached responses
+                of the same resource family, ``client.cache.invalidate()`` can
+                be used to drop cache explicitly.
+
+                Example:
+
+                .. code-block:: python
+
+                    cache = dict(
+                        size=4096,
+                        endpoints={
+                            r'configurations/\\d+/path': 600,
+                            r'ids': 600,
+                        },
+                    )
+
+            revalidate (Optional[dict]):
+                Conditional GET options, disabled by default, use empty dict
+                to enable with default options. Validators (ETag and
+                Last-Modified) of responses are stored and sent back with next
+                identical request, on 304 (not modified) stored object is
+                returned without downloading and parsing.
+
+                - size: ``int`` Maximum number of stored responses. (default 256)
+                - endpoints: ``List[str]`` Regular expressions of REST path
+                    to revalidate. (default all GET requests)
+
+            coalesce (bool):
+                Deduplicate identical in-flight GET requests, all callers
+                share one HTTP request and one parsed result, so result must
+                not be modified in place. Number of coalesced calls is
+                available in ``client.coalesced`` (default false).
+
+            offload (Optional[dict]):
+                Parse large responses in executor instead of blocking event
+                loop. Disabled by default, use empty dict to enable with
+                default options.
+
+                - threshold: ``int`` Minimal size of response body in
+                    bytes to offload. (default 1048576)
+                - workers: ``int`` Size of dedicated pool, if not set, default
+                    executor of event loop is used.
+                - processes: ``bool`` Use process pool instead of threads,
+                    responses of endpoints with callbacks which can't be
+                    pickled are parsed in default executor. (default false)
+
+                Example:
+
+                .. code-block:: python
+
+                    offload = dict(
+                        threshold=256 * 1024,
+                        workers=4,
+                        processes=True,
+                    )
+
             auth_update_callback (Optional[Callable[[], Tuple[str, str]]):
                 Callback coroutine which will be called on QBUnauthorizedError
                 to update user and password and retry request again.
@@ -115,7 +251,7 @@ class AsyncQBClient(QuickBuild):
         Returns:
             AsyncClient instance
         """
-        super().__init__(content_type)
+        super().__init__(content_type, cache, revalidate)
 
         self.content_type = content_type
         self.host = url
@@ -128,15 +264,52 @@ class AsyncQBClient(QuickBuild):
 
         if retry:
             self._validate_retry_argument(retry)
-            self.session = RetryClientSession(retry)
+
+        connector = None
+        if pool:
+            self._validate_pool_argument(pool)
+            connector = TCPConnector(**pool)
+
+        if retry:
+            self.session = RetryClientSession(retry, connector)
         else:
-            self.session = ClientSession()
+            self.session = ClientSession(connector=connector)
 
         self.verify = verify
 
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self._in_flight = {}  # type: Dict[Hashable, asyncio.Future]
+
+        self.offload_threshold = None  # type: Optional[int]
+        self._executor = None  # type: Optional[Executor]
+
+        if offload is not None:
+            self._validate_offload_argument(offload)
+            self.offload_threshold = offload.get('threshold', 1024 * 1024)
+
+            if offload.get('processes'):
+                self._executor = ProcessPoolExecutor(offload.get('workers'))
+            elif offload.get('workers'):
+                self._executor = ThreadPoolExecutor(offload['workers'])
+
         if timeout:
             self.timeout = ClientTimeout(total=timeout)
 
+    async def _parse(self, parser: Callable[[bytes], Any], body: bytes) -> Any:
+        if self.offload_threshold is None or len(body) < self.offload_threshold:
+            return parser(body)
+
+        executor = self._executor
+        if isinstance(executor, ProcessPoolExecutor):
+            try:
+                pickle.dumps(parser)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                executor = None
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, parser, body)
+
     async def _http_request(self,
                             method: str,
                             path: str,
@@ -152,27 +325,127 @@ class AsyncQBClient(QuickBuild):
         kwargs.setdefault('headers', {})
         kwargs['headers'].update(self._get_headers(content_type))
 
-        response = await self.session.request(
-            method,
-            '{host}/rest/{path}'.format(
-                host=self.host,
-                path=path,
-            ),
-            auth=self.auth,
-            ssl=self.verify,
-            **kwargs
+        key, revalidation = self._get_revalidation(
+            method, path, content_type, callback, kwargs
+        )
+
+        if kwargs.get('params'):
+            kwargs['params'] = self._get_params(kwargs['params'])
+
+        url = '{host}/rest/{path}'.format(
+            host=self.host,
+            path=path,
         )
 
-        body = await response.text()
+        if not self.hooks:
+            response = await self.session.request(
+                method, url, auth=self.auth, ssl=self.verify, **kwargs
+            )
+            return await self._process_response(
+                response, key, revalidation, callback, content_type
+            )
+
+        started = time.perf_counter()
+
+        if isinstance(self.session, RetryClientSession):
+            response, retries = await self.session.send(
+                method, url, auth=self.auth, ssl=self.verify, **kwargs
+            )
+        else:
+            response = await self.session.request(
+                method, url, auth=self.auth, ssl=self.verify, **kwargs
+            )
+            retries = 0
+
+        size = len(await response.read())
+        received = time.perf_counter()
+
+        try:
+            return await self._process_response(
+                response, key, revalidation, callback, content_type
+            )
+        finally:
+            self._emit_metrics(RequestMetrics(
+                method,
+                path,
+                response.status,
+                size,
+                received - started,
+                time.perf_counter() - received,
+                retries,
+            ))
 
-        result = self._process(
+    @staticmethod
+    def _get_params(params: dict) -> dict:
+        # yarl rejects boolean query values
+        return {
+            k: str(v).lower() if isinstance(v, bool) else v
+            for k, v in params.items()
+        }
+
+    async def _process_response(self,  # pylint: disable=too-many-arguments
+                                response: ClientResponse,
+                                key: Optional[CacheKey],
+                                revalidation: Optional[Revalidation],
+                                callback: Optional[Callable],
+                                content_type: Optional[ContentType]
+                                ) -> Any:
+        if revalidation is not None and response.status == HTTPStatus.NOT_MODIFIED:
+            return revalidation.value
+
+        body = await response.read()
+
+        parser = self._get_parser(
             Response(response.status, response.headers, body),
-            callback
+            callback,
+            content_type,
         )
 
+        result = body if parser is None else await self._parse(parser, body)
+
+        self._store_revalidation(key, response.headers, result)
+
         return result
 
-    async def _request(self, *args: Any, **kwargs: Any) -> Any:
+    async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        if method != 'GET':
+            result = await self._cached_request(method, path, **kwargs)
+            self._invalidate_identifiers()
+            return result
+
+        if not self.coalesce:
+            return await self._cached_request(method, path, **kwargs)
+
+        key = get_request_key(path, **kwargs)
+        if key is None:
+            return await self._cached_request(method, path, **kwargs)
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(self._cached_request(method, path, **kwargs))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._in_flight[key] = future
+
+        # cancellation of one caller must not affect others
+        return await asyncio.shield(future)
+
+    async def _cached_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        if self.cache is None:
+            return await self._auth_request(method, path, **kwargs)
+
+        key = self.cache.key(method, path, **kwargs)
+        if key is not None:
+            found, result = self.cache.get(key)
+            if found:
+                return result
+
+        result = await self._auth_request(method, path, **kwargs)
+        self.cache.store(method, path, key, result)
+        return result
+
+    async def _auth_request(self, *args: Any, **kwargs: Any) -> Any:
         try:
             return await self._http_request(*args, **kwargs)
         except QBUnauthorizedError:
@@ -183,6 +456,145 @@ class AsyncQBClient(QuickBuild):
             self.auth = BasicAuth(user, password)
             return await self._http_request(*args, **kwargs)
 
+    async def _download(self,
+                        path: str,
+                        target: Target,
+                        *,
+                        params: Optional[dict] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        retries: int = 3,
+                        resume: bool = False
+                        ) -> int:
+        """
+        Stream response body to file, interrupted download is continued from
+        received position using Range header.
+        """
+        self._validate_download(chunk_size, retries)
+
+        url = '{host}/rest/{path}'.format(host=self.host, path=path)
+        error = None  # type: Optional[Exception]
+
+        if params:
+            params = self._get_params(params)
+
+        # whole download can't be limited by total timeout, so the timeout
+        # is applied to connection and each socket read instead
+        timeout = None
+        if self.timeout:
+            timeout = ClientTimeout(
+                sock_connect=self.timeout.total,
+                sock_read=self.timeout.total,
+            )
+
+        with DownloadTarget(target, resume) as download:
+            for _ in range(retries + 1):
+                try:
+                    response = await self.session.request(
+                        'GET',
+                        url,
+                        params=params,
+                        headers=download.get_headers(),
+                        auth=self.auth,
+                        ssl=self.verify,
+                        timeout=timeout,
+                    )
+
+                    try:
+                        if response.status not in DOWNLOAD_STATUSES:
+                            self._raise_for_status(Response(
+                                response.status,
+                                response.headers,
+                                await response.read(),
+                            ))
+
+                        if download.begin(response.status, response.headers):
+                            async for chunk in response.content.iter_chunked(chunk_size):
+                                download.write(chunk)
+                    finally:
+                        response.release()
+
+                except (ClientError, asyncio.TimeoutError) as e:
+                    error = e
+                    continue
+
+                if download.is_complete():
+                    return download.written
+
+        raise QBError('Download of {} is not completed'.format(path)) from error
+
+    async def gather_map(self,
+                         func: Callable[[Any], Awaitable[Any]],
+                         items: Iterable[Any],
+                         *,
+                         concurrency: int = 10,
+                         return_exceptions: bool = False
+                         ) -> BatchResult:
+        """
+        Call endpoint method for each item concurrently, but no more than
+        `concurrency` requests are in-flight at the same time.
+
+        Example:
+
+        .. code-block:: python
+
+            batch = await client.gather_map(client.builds.get_status, [1, 2, 3])
+            print(batch.results, batch.elapsed)
+
+        Args:
+            func (Callable[[Any], Awaitable[Any]]):
+                Coroutine function called with each item, e.g. endpoint method.
+
+            items (Iterable[Any]):
+                Items to call function with, e.g. build identifiers.
+
+            concurrency (int):
+                Maximum number of in-flight requests (default 10).
+
+            return_exceptions (bool):
+                If set, QBError raised for item is placed into results instead
+                of failing whole batch (default false).
+
+        Returns:
+            BatchResult: results in order of items, time spent on each item
+            and total elapsed time in seconds.
+        """
+        self._validate_concurrency(concurrency)
+
+        items = list(items)
+        semaphore = asyncio.Semaphore(concurrency)
+        timings = [0.0] * len(items)
+
+        async def run(index: int, item: Any) -> Any:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    return await func(item)
+                except QBError as e:
+                    if not return_exceptions:
+                        raise
+                    return e
+                finally:
+                    timings[index] = time.monotonic() - started
+
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(run(i, item)) for i, item in enumerate(items)]
+
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return BatchResult(list(results), timings, time.monotonic() - started)
+
+    @staticmethod
+    async def _then(result: Awaitable[Any], func: Callable[[Any], Any]) -> Any:
+        """
+        Helper function for post-processing of endpoint result.
+        """
+        return func(await result)
+
     @staticmethod
     async def _chain(functions: List[Callable]) -> Any:
         """
@@ -206,8 +618,188 @@ class AsyncQBClient(QuickBuild):
 
         return prev
 
+    @staticmethod
+    async def _paginate(fetch: Callable[[int, int], Awaitable[Any]],
+                        count: int,
+                        first: int = 0,
+                        read_ahead: bool = False
+                        ) -> AsyncIterator[Any]:
+        """
+        Helper function for iterating over paged results, `fetch` is called
+        with `first` and `count` arguments until short page is returned.
+
+        If `read_ahead` is set, next page is requested in background task
+        while current page is being consumed.
+        """
+        next_page = None  # type: Optional[asyncio.Future]
+
+        try:
+            page = await fetch(first, count)
+
+            while True:
+                QuickBuild._validate_page(page)
+
+                if len(page) < count:
+                    for item in page:
+                        yield item
+                    return
+
+                first += count
+
+                if read_ahead:
+                    next_page = asyncio.ensure_future(fetch(first, count))
+
+                for item in page:
+                    yield item
+
+                if next_page is None:
+                    page = await fetch(first, count)
+                else:
+                    page, next_page = await next_page, None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _map_ordered(self,
+                           func: Callable[[Any], Awaitable[Any]],
+                           items: Iterable[Any],
+                           *,
+                           concurrency: int
+                           ) -> AsyncIterator[Any]:
+        """
+        Helper function for calling `func` with items in background tasks, up
+        to `concurrency` calls are running at once, results are yielded in
+        order of items as soon as they are ready.
+        """
+        self._validate_concurrency(concurrency)
+
+        items = iter(items)
+
+        pending = deque(
+            asyncio.ensure_future(func(item)) for item in islice(items, concurrency)
+        )  # type: Deque[asyncio.Future]
+
+        try:
+            while pending:
+                result = await pending[0]
+                pending.popleft()
+
+                for item in islice(items, 1):
+                    pending.append(asyncio.ensure_future(func(item)))
+
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _paginate_many(self,
+                             sets: Iterable[Tuple[Callable[[], Awaitable[Any]],
+                                                  Callable[[int, int], Awaitable[Any]],
+                                                  Callable[[List[Any]], Iterable[Any]]]],
+                             count: int,
+                             *,
+                             concurrency: int = 4,
+                             reverse: bool = False
+                             ) -> AsyncIterator[Any]:
+        """
+        Helper function for iterating over several paged result sets in
+        order, each set is a tuple of `get_size`, `fetch` and `transform`
+        functions.
+
+        Sizes of all sets are requested first, then pages of all sets are
+        fetched in background tasks, up to `concurrency` pages at once, each
+        page is passed to `transform` of its set before its items are
+        yielded. If `reverse` is set, pages of each set are fetched from the
+        last one.
+        """
+        sets = list(sets)
+        sizes = [
+            size async for size in self._map_ordered(
+                lambda item: item[0](),
+                sets,
+                concurrency=concurrency,
+            )
+        ]
+
+        async def fetch_page(page: Tuple[Tuple[Any, ...], int]) -> List[Any]:
+            (_, fetch, transform), first = page
+            result = await fetch(first, count)
+            self._validate_page(result)
+            return list(transform(result))
+
+        pages = self._map_ordered(
+            fetch_page,
+            self._get_pages(sets, sizes, count, reverse),
+            concurrency=concurrency,
+        )
+
+        async for page in pages:
+            for item in page:
+                yield item
+
+    async def _paginate_offsets(self,
+                                get_size: Callable[[], Awaitable[Any]],
+                                fetch: Callable[[int, int], Awaitable[Any]],
+                                count: int,
+                                *,
+                                concurrency: int = 4
+                                ) -> AsyncIterator[Any]:
+        """
+        Helper function for iterating over paged results of known size,
+        `get_size` is called once, then `fetch` is called with `offset` and
+        `count` arguments of each page, up to `concurrency` pages are fetched
+        at once in background tasks.
+        """
+        size = await get_size()
+
+        pages = self._map_ordered(
+            lambda offset: fetch(offset, count),
+            range(0, size, count),
+            concurrency=concurrency,
+        )
+
+        async for page in pages:
+            for item in page:
+                yield item
+
+    async def _crawl(self,
+                     fetch: Callable[[Any], Awaitable[Any]],
+                     roots: Iterable[Hashable],
+                     neighbours: Callable[[Hashable, Any], Iterable[Hashable]],
+                     *,
+                     concurrency: int,
+                     max_depth: Optional[int] = None
+                     ) -> Dict[Hashable, Any]:
+        """
+        Helper function for breadth-first traversal, items of each level are
+        fetched concurrently and each item is fetched only once, next level
+        consists of `neighbours` of fetched items which are not visited yet.
+
+        Returns results of `fetch` by item.
+        """
+        visited = {}  # type: Dict[Hashable, Any]
+        frontier = list(dict.fromkeys(roots))
+        depth = 0
+
+        while frontier and (max_depth is None or depth <= max_depth):
+            batch = await self.gather_map(fetch, frontier, concurrency=concurrency)
+            visited.update(zip(frontier, batch.results))
+
+            frontier = list(dict.fromkeys(
+                neighbour
+                for item, result in zip(frontier, batch.results)
+                for neighbour in neighbours(item, result)
+                if neighbour not in visited
+            ))
+            depth += 1
+
+        return visited
+
     async def close(self) -> None:  # type: ignore
         """
         Close client session
         """
         await self.session.close()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
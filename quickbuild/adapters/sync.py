@@ -1,11 +1,43 @@
-from typing import Any, Callable, List, Optional, Tuple
+import time
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from http import HTTPStatus
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import requests
 
 from requests import Session
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 
-from quickbuild.core import ContentType, QuickBuild, Response
+from quickbuild.core import BatchResult, ContentType, QuickBuild, Response
+from quickbuild.download import (
+    DEFAULT_CHUNK_SIZE,
+    DOWNLOAD_STATUSES,
+    DownloadTarget,
+    Target,
+)
 from quickbuild.exceptions import QBError, QBUnauthorizedError
+from quickbuild.metrics import RequestMetrics
 
 
 class QBClient(QuickBuild):
@@ -19,6 +51,9 @@ class QBClient(QuickBuild):
                  verify: bool = True,
                  timeout: Optional[float] = None,
                  retry: Optional[dict] = None,
+                 pool: Optional[dict] = None,
+                 cache: Optional[dict] = None,
+                 revalidate: Optional[dict] = None,
                  auth_update_callback: Optional[Callable[[], Tuple[str, str]]] = None
                  ) -> None:
         """
@@ -93,6 +128,66 @@ class QBClient(QuickBuild):
                 20            72.8 hours
                 ============  =============
 
+            pool (Optional[dict]):
+                Connection pool options, by default pool of requests library
+                is used which keeps up to 10 connections per host.
+
+                - limit: ``int`` Not supported, total number of connections
+                    isn't limited by requests library.
+                - limit_per_host: ``int`` Maximum number of connections kept
+                    to the same host.
+                - keepalive_timeout: ``float`` Not supported, idle connections
+                    are kept until server closes them.
+                - ttl_dns_cache: ``int`` Not supported, system resolver is used.
+
+                Example:
+
+                .. code-block:: python
+
+                    pool = dict(
+                        limit_per_host=50,
+                    )
+
+            cache (Optional[dict]):
+                Response cache options for read-mostly endpoints. Disabled by
+                default, any non empty dict enables it.
+
+                - size: ``int`` Maximum number of cached responses, least
+                    recently used are evicted. (default 1024)
+                - ttl: ``float`` TTL in seconds for GET requests not matched
+                    by endpoints. (default 0, not cached)
+                - endpoints: ``Dict[str, float]`` Regular expressions of REST
+                    path mapped to TTL in seconds. By default configuration
+                    paths, user display names, identifiers and server version
+                    are cached.
+
+                Update, create and delete requests invalidate cached responses
+                of the same resource family, ``client.cache.invalidate()`` can
+                be used to drop cache explicitly.
+
+                Example:
+
+                .. code-block:: python
+
+                    cache = dict(
+                        size=4096,
+                        endpoints={
+                            r'configurations/\\d+/path': 600,
+                            r'ids': 600,
+                        },
+                    )
+
+            revalidate (Optional[dict]):
+                Conditional GET options, disabled by default, use empty dict
+                to enable with default options. Validators (ETag and
+                Last-Modified) of responses are stored and sent back with next
+                identical request, on 304 (not modified) stored object is
+                returned without downloading and parsing.
+
+                - size: ``int`` Maximum number of stored responses. (default 256)
+                - endpoints: ``List[str]`` Regular expressions of REST path
+                    to revalidate. (default all GET requests)
+
             auth_update_callback (Optional[Callable[[], Tuple[str, str]]])
                 Callback function which will be called on QBUnauthorizedError
                 to update user and password and retry request again.
@@ -100,7 +195,7 @@ class QBClient(QuickBuild):
         Returns:
             Client instance
         """
-        super().__init__(content_type)
+        super().__init__(content_type, cache, revalidate)
 
         self.content_type = content_type
         self.host = url
@@ -114,18 +209,34 @@ class QBClient(QuickBuild):
 
         self.auth_update_callback = auth_update_callback
 
-        if not retry:
+        self._pool_maxsize = DEFAULT_POOLSIZE
+        self._max_retries = Retry(0, read=False)
+
+        if not retry and not pool:
             return
 
-        self._validate_retry_argument(retry)
-        adapter = HTTPAdapter(max_retries=Retry(
-            total=retry['total'],
-            backoff_factor=retry.get('factor', 1),
-            status_forcelist=retry.get('statuses', []),
-            allowed_methods=retry.get('methods', [
-                'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'
-            ]),
-        ))
+        if pool:
+            self._validate_pool_argument(pool)
+            self._pool_maxsize = pool.get('limit_per_host', DEFAULT_POOLSIZE)
+
+        if retry:
+            self._validate_retry_argument(retry)
+            self._max_retries = Retry(
+                total=retry['total'],
+                backoff_factor=retry.get('factor', 1),
+                status_forcelist=retry.get('statuses', []),
+                allowed_methods=retry.get('methods', [
+                    'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'
+                ]),
+            )
+
+        self._mount_adapter()
+
+    def _mount_adapter(self) -> None:
+        adapter = HTTPAdapter(
+            pool_maxsize=self._pool_maxsize,
+            max_retries=self._max_retries,
+        )
 
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
@@ -145,6 +256,13 @@ class QBClient(QuickBuild):
         kwargs.setdefault('headers', {})
         kwargs['headers'].update(self._get_headers(content_type))
 
+        key, revalidation = self._get_revalidation(
+            method, path, content_type, callback, kwargs
+        )
+
+        measure = bool(self.hooks)
+        started = time.perf_counter() if measure else 0.0
+
         response = self.session.request(
             method,
             '{host}/rest/{path}'.format(
@@ -155,14 +273,64 @@ class QBClient(QuickBuild):
             **kwargs
         )
 
-        result = self._process(
-            Response(response.status_code, response.headers, response.text),
-            callback
-        )
+        received = time.perf_counter() if measure else 0.0
+
+        try:
+            if revalidation is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+                return revalidation.value
+
+            result = self._process(
+                Response(response.status_code, response.headers, response.content),
+                callback,
+                content_type,
+            )
+
+            self._store_revalidation(key, response.headers, result)
+
+            return result
+        finally:
+            if measure:
+                self._emit_metrics(RequestMetrics(
+                    method,
+                    path,
+                    response.status_code,
+                    len(response.content),
+                    received - started,
+                    time.perf_counter() - received,
+                    self._get_retries(response),
+                ))
+
+    @staticmethod
+    def _get_retries(response: requests.Response) -> int:
+        retries = getattr(response.raw, 'retries', None)
+        if retries is None:
+            return 0
+
+        return len(retries.history)
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        result = self._cached_request(method, path, **kwargs)
 
+        if method != 'GET':
+            self._invalidate_identifiers()
+
+        return result
+
+    def _cached_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        if self.cache is None:
+            return self._auth_request(method, path, **kwargs)
+
+        key = self.cache.key(method, path, **kwargs)
+        if key is not None:
+            found, result = self.cache.get(key)
+            if found:
+                return result
+
+        result = self._auth_request(method, path, **kwargs)
+        self.cache.store(method, path, key, result)
         return result
 
-    def _request(self, *args: Any, **kwargs: Any) -> Any:
+    def _auth_request(self, *args: Any, **kwargs: Any) -> Any:
         try:
             return self._http_request(*args, **kwargs)
         except QBUnauthorizedError:
@@ -173,6 +341,147 @@ class QBClient(QuickBuild):
             self.session.auth = (user, password)
             return self._http_request(*args, **kwargs)
 
+    def _download(self,
+                  path: str,
+                  target: Target,
+                  *,
+                  params: Optional[dict] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  retries: int = 3,
+                  resume: bool = False
+                  ) -> int:
+        """
+        Stream response body to file, interrupted download is continued from
+        received position using Range header.
+        """
+        self._validate_download(chunk_size, retries)
+
+        url = '{host}/rest/{path}'.format(host=self.host, path=path)
+        error = None  # type: Optional[Exception]
+
+        with DownloadTarget(target, resume) as download:
+            for _ in range(retries + 1):
+                try:
+                    with self.session.get(url,
+                                          params=params,
+                                          headers=download.get_headers(),
+                                          stream=True,
+                                          verify=self.verify,
+                                          timeout=self.timeout) as response:
+
+                        if response.status_code not in DOWNLOAD_STATUSES:
+                            self._raise_for_status(Response(
+                                response.status_code,
+                                response.headers,
+                                response.content,
+                            ))
+
+                        if download.begin(response.status_code, response.headers):
+                            for chunk in response.iter_content(chunk_size):
+                                download.write(chunk)
+
+                except (requests.ConnectionError,
+                        requests.Timeout,
+                        requests.exceptions.ChunkedEncodingError) as e:
+                    error = e
+                    continue
+
+                if download.is_complete():
+                    return download.written
+
+        raise QBError('Download of {} is not completed'.format(path)) from error
+
+    def _resize_pool(self, size: int) -> None:
+        """
+        Grow connection pool, so each worker thread could keep its own
+        connection to server.
+        """
+        if size <= self._pool_maxsize:
+            return
+
+        self._pool_maxsize = size
+        self._mount_adapter()
+
+    def gather_map(self,
+                   func: Callable[[Any], Any],
+                   items: Iterable[Any],
+                   *,
+                   concurrency: int = 10,
+                   return_exceptions: bool = False
+                   ) -> BatchResult:
+        """
+        Call endpoint method for each item in parallel using thread pool with
+        `concurrency` workers, connection pool is grown to the same size.
+
+        Example:
+
+        .. code-block:: python
+
+            batch = client.gather_map(client.builds.get_info, [1, 2, 3])
+            print(batch.results, batch.elapsed)
+
+        Args:
+            func (Callable[[Any], Any]):
+                Function called with each item, e.g. endpoint method.
+
+            items (Iterable[Any]):
+                Items to call function with, e.g. build identifiers.
+
+            concurrency (int):
+                Number of worker threads (default 10).
+
+            return_exceptions (bool):
+                If set, QBError raised for item is placed into results instead
+                of failing whole batch, otherwise calls which are not started
+                yet are cancelled on the first error (default false).
+
+        Returns:
+            BatchResult: results in order of items, time spent on each item
+            and total elapsed time in seconds.
+        """
+        self._validate_concurrency(concurrency)
+
+        items = list(items)
+        timings = [0.0] * len(items)
+
+        def run(index: int, item: Any) -> Any:
+            started = time.monotonic()
+            try:
+                return func(item)
+            except QBError as e:
+                if not return_exceptions:
+                    raise
+                return e
+            finally:
+                timings[index] = time.monotonic() - started
+
+        self._resize_pool(concurrency)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(run, i, item) for i, item in enumerate(items)]
+
+            # calls which are not started yet are cancelled on the first error
+            _, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+
+        for future in futures:
+            error = None if future.cancelled() else future.exception()
+            if error is not None:
+                raise error
+
+        results = [future.result() for future in futures]
+
+        return BatchResult(results, timings, time.monotonic() - started)
+
+    @staticmethod
+    def _then(result: Any, func: Callable[[Any], Any]) -> Any:
+        """
+        Helper function for post-processing of endpoint result.
+        """
+        return func(result)
+
     @staticmethod
     def _chain(functions: List[Callable]) -> Any:
         """
@@ -194,6 +503,176 @@ class QBClient(QuickBuild):
 
         return prev
 
+    @staticmethod
+    def _paginate(fetch: Callable[[int, int], Any],
+                  count: int,
+                  first: int = 0,
+                  read_ahead: bool = False
+                  ) -> Iterator[Any]:
+        """
+        Helper function for iterating over paged results, `fetch` is called
+        with `first` and `count` arguments until short page is returned.
+
+        If `read_ahead` is set, next page is requested in background thread
+        while current page is being consumed.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if read_ahead else None
+
+        try:
+            page = fetch(first, count)
+
+            while True:
+                QuickBuild._validate_page(page)
+
+                if len(page) < count:
+                    yield from page
+                    return
+
+                first += count
+
+                if executor is not None:
+                    next_page = executor.submit(fetch, first, count).result
+                else:
+                    next_page = partial(fetch, first, count)
+
+                yield from page
+                page = next_page()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _map_ordered(self,
+                     func: Callable[[Any], Any],
+                     items: Iterable[Any],
+                     *,
+                     concurrency: int
+                     ) -> Iterator[Any]:
+        """
+        Helper function for calling `func` with items in thread pool, up to
+        `concurrency` calls are running at once, results are yielded in order
+        of items as soon as they are ready.
+        """
+        self._validate_concurrency(concurrency)
+        self._resize_pool(concurrency)
+
+        items = iter(items)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = deque(
+                executor.submit(func, item) for item in islice(items, concurrency)
+            )  # type: Deque[Future]
+
+            try:
+                while pending:
+                    result = pending[0].result()
+                    pending.popleft()
+
+                    for item in islice(items, 1):
+                        pending.append(executor.submit(func, item))
+
+                    yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _paginate_many(self,
+                       sets: Iterable[Tuple[Callable[[], Any],
+                                            Callable[[int, int], Any],
+                                            Callable[[List[Any]], Iterable[Any]]]],
+                       count: int,
+                       *,
+                       concurrency: int = 4,
+                       reverse: bool = False
+                       ) -> Iterator[Any]:
+        """
+        Helper function for iterating over several paged result sets in
+        order, each set is a tuple of `get_size`, `fetch` and `transform`
+        functions.
+
+        Sizes of all sets are requested first, then pages of all sets are
+        fetched in thread pool, up to `concurrency` pages at once, each page
+        is passed to `transform` of its set before its items are yielded. If
+        `reverse` is set, pages of each set are fetched from the last one.
+        """
+        sets = list(sets)
+        sizes = list(self._map_ordered(
+            lambda item: item[0](),
+            sets,
+            concurrency=concurrency,
+        ))
+
+        def fetch_page(page: Tuple[Tuple[Any, ...], int]) -> List[Any]:
+            (_, fetch, transform), first = page
+            result = fetch(first, count)
+            self._validate_page(result)
+            return list(transform(result))
+
+        pages = self._map_ordered(
+            fetch_page,
+            self._get_pages(sets, sizes, count, reverse),
+            concurrency=concurrency,
+        )
+
+        for page in pages:
+            yield from page
+
+    def _paginate_offsets(self,
+                          get_size: Callable[[], Any],
+                          fetch: Callable[[int, int], Any],
+                          count: int,
+                          *,
+                          concurrency: int = 4
+                          ) -> Iterator[Any]:
+        """
+        Helper function for iterating over paged results of known size,
+        `get_size` is called once, then `fetch` is called with `offset` and
+        `count` arguments of each page, up to `concurrency` pages are fetched
+        at once in thread pool.
+        """
+        size = get_size()
+
+        pages = self._map_ordered(
+            lambda offset: fetch(offset, count),
+            range(0, size, count),
+            concurrency=concurrency,
+        )
+
+        for page in pages:
+            yield from page
+
+    def _crawl(self,
+               fetch: Callable[[Any], Any],
+               roots: Iterable[Hashable],
+               neighbours: Callable[[Hashable, Any], Iterable[Hashable]],
+               *,
+               concurrency: int,
+               max_depth: Optional[int] = None
+               ) -> Dict[Hashable, Any]:
+        """
+        Helper function for breadth-first traversal, items of each level are
+        fetched in thread pool and each item is fetched only once, next level
+        consists of `neighbours` of fetched items which are not visited yet.
+
+        Returns results of `fetch` by item.
+        """
+        visited = {}  # type: Dict[Hashable, Any]
+        frontier = list(dict.fromkeys(roots))
+        depth = 0
+
+        while frontier and (max_depth is None or depth <= max_depth):
+            batch = self.gather_map(fetch, frontier, concurrency=concurrency)
+            visited.update(zip(frontier, batch.results))
+
+            frontier = list(dict.fromkeys(
+                neighbour
+                for item, result in zip(frontier, batch.results)
+                for neighbour in neighbours(item, result)
+                if neighbour not in visited
+            ))
+            depth += 1
+
+        return visited
+
     def close(self) -> None:
         """
         Close client session
@@ -0,0 +1,356 @@
+import re
+import threading
+import time
+
+from collections import OrderedDict
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from quickbuild.exceptions import QBError
+
+# read-mostly endpoints which are cached by default, path pattern -> TTL
+DEFAULT_ENDPOINTS = {
+    r'configurations/\d+/path': 300,
+    r'users/\d+/display_name': 300,
+    r'ids': 300,
+    r'version': 3600,
+}  # type: Dict[str, float]
+
+# identifiers are resolved by names of other resources, so any modification
+# could change them as well
+IDENTIFIERS_FAMILY = 'ids'
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Any], ...], Any, Hashable]
+
+Revalidation = NamedTuple(
+    'Revalidation', [
+        ('headers', Dict[str, str]),
+        ('value', Any),
+    ]
+)
+
+
+def get_family(path: str) -> str:
+    return path.split('/', 1)[0]
+
+
+def get_callback_key(callback: Optional[Callable]) -> Hashable:
+    """
+    Callbacks are created on each endpoint call, so compare them by
+    function code, bound arguments, captured variables and bound instance.
+    """
+    if isinstance(callback, partial):
+        return (
+            get_callback_key(callback.func),
+            callback.args,
+            tuple(sorted(callback.keywords.items())),
+        )
+
+    func = getattr(callback, '__func__', callback)
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return callback
+
+    return (
+        code,
+        tuple(cell.cell_contents for cell in getattr(func, '__closure__', None) or ()),
+        getattr(callback, '__self__', None),
+    )
+
+
+def get_request_key(path: str, **kwargs: Any) -> Optional[CacheKey]:
+    """
+    Get key of GET request, the same request processed by different callbacks
+    has different keys. None is returned if arguments of request or callback
+    aren't hashable.
+    """
+    params = kwargs.get('params') or {}
+
+    key = (
+        path,
+        tuple(sorted(params.items())),
+        kwargs.get('content_type'),
+        get_callback_key(kwargs.get('callback')),
+    )
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+class LRUCache:
+    """
+    Thread safe storage with bounded size, least recently used entries are
+    evicted first.
+    """
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise QBError('Invalid `size` in cache argument must be > 0')
+
+        self.size = size
+
+        self._entries = OrderedDict()  # type: OrderedDict[CacheKey, Any]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: CacheKey) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+
+            return value
+
+    def _set(self, key: CacheKey, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, family: Optional[str] = None) -> None:
+        """
+        Drop cached responses.
+
+        Args:
+            family (Optional[str]):
+                Resource family, the first segment of REST path, for example
+                `configurations`. If not set, whole cache is cleared.
+        """
+        with self._lock:
+            if family is None:
+                self._entries.clear()
+                return
+
+            for key in list(self._entries):
+                if get_family(key[0]) == family:
+                    del self._entries[key]
+
+
+class ResponseCache(LRUCache):
+    """
+    LRU cache of processed responses with TTL per endpoint.
+
+    Only GET requests to endpoints matched by path patterns are cached, any
+    other request (update, create, delete) invalidates cached responses of the
+    same resource family, it's the first path segment, e.g. `configurations`.
+
+    NB: cached objects are shared between callers, so they must not be
+    modified in place.
+    """
+    def __init__(self,
+                 size: int = 1024,
+                 ttl: float = 0,
+                 endpoints: Optional[Dict[str, float]] = None
+                 ) -> None:
+        super().__init__(size)
+
+        if endpoints is None:
+            endpoints = DEFAULT_ENDPOINTS
+
+        self.ttl = ttl
+        self.endpoints = [
+            (re.compile(pattern), endpoint_ttl)
+            for pattern, endpoint_ttl in endpoints.items()
+        ]
+
+    def _get_ttl(self, path: str) -> float:
+        for pattern, ttl in self.endpoints:
+            if pattern.fullmatch(path):
+                return ttl
+
+        return self.ttl
+
+    def key(self, method: str, path: str, **kwargs: Any) -> Optional[CacheKey]:
+        """
+        Get cache key of request, None is returned if request is not cacheable.
+        """
+        if method != 'GET' or self._get_ttl(path) <= 0:
+            return None
+
+        return get_request_key(path, **kwargs)
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        """
+        Get cached value, returns tuple of found flag and value.
+        """
+        entry = self._get(key)
+        if entry is None:
+            return False, None
+
+        expires, value = entry
+        if expires < time.monotonic():
+            return False, None
+
+        return True, value
+
+    def store(self, method: str, path: str, key: Optional[CacheKey], value: Any) -> None:
+        """
+        Store processed response or invalidate resource family for requests
+        which modify data.
+        """
+        if method != 'GET':
+            self.invalidate(get_family(path))
+            self.invalidate(IDENTIFIERS_FAMILY)
+            return
+
+        if key is None:
+            return
+
+        self._set(key, (time.monotonic() + self._get_ttl(path), value))
+
+
+class RevalidationCache(LRUCache):
+    """
+    Storage of validators (ETag and Last-Modified) with processed responses
+    for conditional GET requests.
+
+    If server responds with 304 (not modified), stored object is returned
+    instead of downloading and parsing document again. Responses without
+    validators are not stored, so such endpoints are requested as usual.
+
+    NB: stored objects are shared between callers, so they must not be
+    modified in place.
+    """
+    def __init__(self,
+                 size: int = 256,
+                 endpoints: Optional[List[str]] = None
+                 ) -> None:
+        super().__init__(size)
+
+        self.endpoints = None  # type: Optional[List[Pattern]]
+        if endpoints is not None:
+            self.endpoints = [re.compile(pattern) for pattern in endpoints]
+
+    def key(self, method: str, path: str, **kwargs: Any) -> Optional[CacheKey]:
+        """
+        Get key of request, None is returned if request can't be conditional.
+        """
+        if method != 'GET':
+            return None
+
+        if self.endpoints is not None and \
+           not any(pattern.fullmatch(path) for pattern in self.endpoints):
+            return None
+
+        return get_request_key(path, **kwargs)
+
+    def get(self, key: CacheKey) -> Optional[Revalidation]:
+        """
+        Get stored validators and response.
+        """
+        return self._get(key)
+
+    def store(self, key: CacheKey, headers: Mapping[str, str], value: Any) -> None:
+        """
+        Store processed response if server has sent any validator.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        if etag is None and last_modified is None:
+            return
+
+        request_headers = {}
+        if etag is not None:
+            request_headers['If-None-Match'] = etag
+        if last_modified is not None:
+            request_headers['If-Modified-Since'] = last_modified
+
+        self._set(key, Revalidation(request_headers, value))
+
+
+class IdentifierCache:
+    """
+    Thread safe bidirectional map of object names and identifiers per kind
+    (configuration, user, etc.) used by bulk identifier resolution.
+
+    Names which aren't found are stored as negative entries with short TTL,
+    so repeated lookups of missing objects don't reach server.
+
+    Args:
+        ttl (float):
+            Time to live of resolved identifiers in seconds (default 300).
+
+        negative_ttl (float):
+            Time to live of missing names in seconds (default 30).
+    """
+    def __init__(self, ttl: float = 300, negative_ttl: float = 30) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # (kind, name) -> (expires, identifier or None if missing)
+        self._ids = {}  # type: Dict[Tuple[str, str], Tuple[float, Optional[int]]]
+        self._names = {}  # type: Dict[Tuple[str, int], str]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get_id(self, kind: str, name: str) -> Tuple[bool, Optional[int]]:
+        """
+        Get identifier by name, returns tuple of found flag and identifier,
+        which is None for known missing name.
+        """
+        with self._lock:
+            entry = self._ids.get((kind, name))
+            if entry is None:
+                return False, None
+
+            expires, identifier = entry
+            if expires < time.monotonic():
+                del self._ids[(kind, name)]
+                if identifier is not None:
+                    self._names.pop((kind, identifier), None)
+                return False, None
+
+            return True, identifier
+
+    def get_name(self, kind: str, identifier: int) -> Optional[str]:
+        """
+        Get name of previously resolved identifier.
+        """
+        with self._lock:
+            name = self._names.get((kind, identifier))
+            if name is None:
+                return None
+
+        found, _ = self.get_id(kind, name)
+        return name if found else None
+
+    def store(self, kind: str, name: str, identifier: Optional[int]) -> None:
+        """
+        Store resolved identifier, None means that object is missing.
+        """
+        with self._lock:
+            if identifier is None:
+                self._ids[(kind, name)] = (time.monotonic() + self.negative_ttl, None)
+                return
+
+            self._ids[(kind, name)] = (time.monotonic() + self.ttl, identifier)
+            self._names[(kind, identifier)] = name
+
+    def invalidate(self) -> None:
+        """
+        Drop all entries.
+        """
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
@@ -0,0 +1,238 @@
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from quickbuild.exceptions import QBError
+
+# explicit pattern of `start_time` and `end_time`, so server doesn't guess
+# time zone of dates
+DATE_PATTERN = "yyyy-MM-dd'T'HH:mm:ssZ"
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+# node, start and end timestamps in seconds
+Chunk = Tuple[str, float, float]
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(DATE_FORMAT)
+
+
+def get_node_address(agent: dict) -> str:
+    """
+    Get address of build agent as it's used in `source` of measurements,
+    e.g. `myagent:8811`.
+    """
+    return '{}:{}'.format(agent.get('hostName') or agent['ip'], agent['port'])
+
+
+class BaseMeasurementsCollector:
+    """
+    Common state of measurements collectors, which doesn't depend on client
+    type.
+    """
+    def __init__(self,
+                 client: Any,
+                 *,
+                 metric: Optional[str] = None,
+                 nodes: Optional[List[str]] = None,
+                 since: Optional[datetime] = None,
+                 chunk: timedelta = timedelta(hours=6),
+                 concurrency: int = 8,
+                 positions: Optional[Dict[str, int]] = None
+                 ) -> None:
+        if chunk < timedelta(minutes=1):
+            raise QBError('Invalid `chunk` argument must be >= 1 minute')
+
+        client._validate_concurrency(concurrency)
+
+        self.client = client
+        self.metric = metric
+        self.nodes = nodes
+        self.since = since
+        self.chunk = chunk.total_seconds()
+        self.concurrency = concurrency
+        self.positions = dict(positions or {})
+
+    @staticmethod
+    def _get_node_addresses(agents: List[Any]) -> List[str]:
+        addresses = []  # type: List[str]
+
+        for result in agents:
+            if not isinstance(result, list):
+                raise QBError('Measurements collector requires PARSE or JSON content type')
+
+            addresses.extend(get_node_address(agent) for agent in result)
+
+        # agent could be listed both as active and inactive while it's reconnecting
+        return list(dict.fromkeys(addresses))
+
+    def _get_chunks(self, nodes: List[str], until: Optional[datetime]) -> Iterator[Chunk]:
+        end = time.time() if until is None else until.timestamp()
+
+        if self.since is None:
+            default_start = end - 3600
+        else:
+            default_start = self.since.timestamp()
+
+        for node in nodes:
+            position = self.positions.get(node)
+
+            # measurements of the last collected second are requested again
+            # and skipped on merge, since server compares times with seconds
+            start = default_start if position is None else position // 1000
+
+            while start < end:
+                yield node, start, min(start + self.chunk, end)
+                start += self.chunk
+
+    def _fetch(self, chunk: Chunk) -> Any:
+        node, start, end = chunk
+
+        return self.client.measurements.get(
+            source=node,
+            start_time=_format_time(start),
+            end_time=_format_time(end),
+            metric=self.metric,
+            date_pattern=DATE_PATTERN,
+        )
+
+    def _merge(self, chunks: List[Chunk], results: List[Any]) -> List[Any]:
+        """
+        Merge measurements of chunks in time order and advance positions of
+        nodes, measurements which are already collected are skipped.
+        """
+        unique = {}  # type: Dict[Any, Any]
+        positions = {}  # type: Dict[str, int]
+
+        for (node, _, _), result in zip(chunks, results):
+            if not isinstance(result, list):
+                raise QBError('Measurements collector requires PARSE or JSON content type')
+
+            position = self.positions.get(node, -1)
+
+            # adjacent chunks share boundary second
+            for measurement in result:
+                timestamp = measurement['timestamp']
+                if timestamp > position:
+                    unique[measurement['id']] = measurement
+                    positions[node] = max(timestamp, positions.get(node, timestamp))
+
+        self.positions.update(positions)
+
+        return sorted(
+            unique.values(),
+            key=lambda measurement: (measurement['timestamp'], measurement['source']),
+        )
+
+
+class MeasurementsCollector(BaseMeasurementsCollector):
+    """
+    Collect measurements of all nodes, time range of each node is split into
+    chunks, and all chunks of all nodes are requested in parallel, so there
+    is no huge response of all nodes for the whole period.
+
+    Position of each node is the timestamp of its last collected
+    measurement, next collection of node starts from it, positions could be
+    saved and passed to new collector to resume collection.
+
+    Example:
+
+    .. code-block:: python
+
+        collector = MeasurementsCollector(
+            client,
+            metric='disk.usage',
+            since=datetime.now() - timedelta(days=30),
+            chunk=timedelta(days=1),
+        )
+
+        for measurement in collector.collect():
+            print(measurement['source'], measurement['timestamp'], measurement['value'])
+
+        json.dump(collector.positions, open('positions.json', 'w'))
+
+    Args:
+        client (QBClient):
+            Client instance.
+
+        metric (Optional[str]):
+            Metric name, e.g. `disk.usage` (default all metrics).
+
+        nodes (Optional[List[str]]):
+            Node addresses, e.g. `myagent:8811` (default active and inactive
+            build agents).
+
+        since (Optional[datetime]):
+            Start of collection for nodes without position (default one
+            hour before end of collection).
+
+        chunk (timedelta):
+            Duration of time range of one request (default 6 hours).
+
+        concurrency (int):
+            Maximum number of in-flight requests (default 8).
+
+        positions (Optional[Dict[str, int]]):
+            Timestamps in milliseconds of the last collected measurement by
+            node address, e.g. `positions` of previous collector.
+    """
+    def collect(self, until: Optional[datetime] = None) -> List[Any]:
+        """
+        Collect new measurements.
+
+        Args:
+            until (Optional[datetime]):
+                End of collection (default now).
+
+        Returns:
+            List[Any]: measurements of all nodes sorted by timestamp.
+        """
+        nodes = self.nodes
+        if nodes is None:
+            agents = self.client.gather_map(
+                lambda get: get(),
+                [self.client.agents.get_active, self.client.agents.get_inactive],
+            )
+            nodes = self._get_node_addresses(agents.results)
+
+        chunks = list(self._get_chunks(nodes, until))
+        batch = self.client.gather_map(self._fetch, chunks, concurrency=self.concurrency)
+
+        return self._merge(chunks, batch.results)
+
+
+class AsyncMeasurementsCollector(BaseMeasurementsCollector):
+    """
+    Async version of MeasurementsCollector, see its documentation.
+
+    Example:
+
+    .. code-block:: python
+
+        collector = AsyncMeasurementsCollector(client, positions=positions)
+        measurements = await collector.collect()
+    """
+    async def collect(self, until: Optional[datetime] = None) -> List[Any]:
+        """
+        Collect new measurements.
+
+        Args:
+            until (Optional[datetime]):
+                End of collection (default now).
+
+        Returns:
+            List[Any]: measurements of all nodes sorted by timestamp.
+        """
+        nodes = self.nodes
+        if nodes is None:
+            agents = await self.client.gather_map(
+                lambda get: get(),
+                [self.client.agents.get_active, self.client.agents.get_inactive],
+            )
+            nodes = self._get_node_addresses(agents.results)
+
+        chunks = list(self._get_chunks(nodes, until))
+        batch = await self.client.gather_map(self._fetch, chunks, concurrency=self.concurrency)
+
+        return self._merge(chunks, batch.results)
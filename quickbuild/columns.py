@@ -0,0 +1,340 @@
+import math
+
+from array import array
+from collections.abc import Mapping
+from datetime import timedelta
+from itertools import groupby, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from xml.parsers.expat import ExpatError, ParserCreate
+
+from quickbuild.exceptions import QBError
+
+# depth of elements in `<list><MeasurementData><value>` document
+RECORD_DEPTH = 2
+FIELD_DEPTH = 3
+
+FIELDS = ('timestamp', 'source', 'metricName', 'value')
+
+AGGREGATES = {
+    'mean': lambda values: sum(values) / len(values),
+    'min': min,
+    'max': max,
+    'last': lambda values: values[-1],
+}  # type: Dict[str, Callable[[List[float]], float]]
+
+SeriesKey = Tuple[str, str]
+
+
+def get_numpy() -> Any:
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise QBError('NumPy arrays require numpy package') from e
+
+    return numpy
+
+
+def _is_sorted(timestamps: Any) -> bool:
+    return all(a <= b for a, b in zip(timestamps, islice(timestamps, 1, None)))
+
+
+class Series:
+    """
+    Time series of one metric of one node, timestamps are milliseconds since
+    epoch sorted in ascending order.
+
+    Columns are `array.array` of int64 timestamps and float64 values, or
+    NumPy arrays of the same types, 16 bytes per point in both cases.
+    """
+    __slots__ = ('source', 'metric', 'timestamps', 'values')
+
+    def __init__(self, source: str, metric: str, timestamps: Any, values: Any) -> None:
+        self.source = source
+        self.metric = metric
+        self.timestamps = timestamps
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __repr__(self) -> str:
+        return 'Series({!r}, {!r}, {} points)'.format(self.source, self.metric, len(self))
+
+    def _is_numpy(self) -> bool:
+        return not isinstance(self.values, array)
+
+    def _sort(self) -> None:
+        if self._is_numpy():
+            numpy = get_numpy()
+            if numpy.all(self.timestamps[1:] >= self.timestamps[:-1]):
+                return
+
+            order = numpy.argsort(self.timestamps, kind='stable')
+            self.timestamps = self.timestamps[order]
+            self.values = self.values[order]
+            return
+
+        if _is_sorted(self.timestamps):
+            return
+
+        order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+        self.timestamps = array('q', (self.timestamps[i] for i in order))
+        self.values = array('d', (self.values[i] for i in order))
+
+    def to_numpy(self) -> 'Series':
+        """
+        Get series with NumPy arrays, columns are shared without copying.
+
+        Raises:
+            QBError: numpy package is not installed.
+        """
+        if self._is_numpy():
+            return self
+
+        numpy = get_numpy()
+
+        return Series(
+            self.source,
+            self.metric,
+            numpy.frombuffer(self.timestamps, dtype=numpy.int64),
+            numpy.frombuffer(self.values, dtype=numpy.float64),
+        )
+
+    def downsample(self, interval: timedelta, how: str = 'mean') -> 'Series':
+        """
+        Aggregate points into buckets of fixed duration.
+
+        Args:
+            interval (timedelta):
+                Duration of bucket, timestamps of result are starts of buckets.
+
+            how (str):
+                Aggregate function of bucket: `mean`, `min`, `max` or `last`
+                (default `mean`).
+
+        Returns:
+            Series: series with one point per non-empty bucket.
+
+        Raises:
+            QBError: invalid arguments.
+        """
+        step = int(interval.total_seconds() * 1000)
+
+        if step <= 0:
+            raise QBError('Invalid `interval` argument must be >= 1 ms')
+
+        if how not in AGGREGATES:
+            raise QBError('Invalid `how` argument must be one of: ' + ', '.join(AGGREGATES))
+
+        if len(self) == 0:
+            return Series(self.source, self.metric, self.timestamps[:0], self.values[:0])
+
+        if self._is_numpy():
+            return self._downsample_numpy(step, how)
+
+        timestamps = array('q')
+        values = array('d')
+
+        points = zip(self.timestamps, self.values)
+        for bucket, group in groupby(points, key=lambda point: point[0] // step * step):
+            timestamps.append(bucket)
+            values.append(AGGREGATES[how]([value for _, value in group]))
+
+        return Series(self.source, self.metric, timestamps, values)
+
+    def _downsample_numpy(self, step: int, how: str) -> 'Series':
+        numpy = get_numpy()
+
+        buckets = self.timestamps // step * step
+        starts = numpy.flatnonzero(numpy.r_[True, buckets[1:] != buckets[:-1]])
+        ends = numpy.r_[starts[1:], len(buckets)]
+
+        if how == 'mean':
+            values = numpy.add.reduceat(self.values, starts) / (ends - starts)
+        elif how == 'min':
+            values = numpy.minimum.reduceat(self.values, starts)
+        elif how == 'max':
+            values = numpy.maximum.reduceat(self.values, starts)
+        else:
+            values = self.values[ends - 1]
+
+        return Series(self.source, self.metric, buckets[starts], values)
+
+    def percentile(self, q: float) -> float:
+        """
+        Get percentile of values, values between data points are linearly
+        interpolated, as NumPy does by default.
+
+        Args:
+            q (float):
+                Percentile in range from 0 to 100, e.g. 95.
+
+        Returns:
+            float: percentile value.
+
+        Raises:
+            QBError: invalid percentile or series is empty.
+        """
+        if not 0 <= q <= 100:
+            raise QBError('Invalid `q` argument must be in range from 0 to 100')
+
+        if len(self) == 0:
+            raise QBError('Percentile of empty series')
+
+        if self._is_numpy():
+            return float(get_numpy().percentile(self.values, q))
+
+        values = sorted(self.values)
+        position = (len(values) - 1) * q / 100
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class MeasurementColumns(Mapping):
+    """
+    Measurements grouped by node and metric, series are available by
+    `(source, metric)` key.
+
+    Example:
+
+    .. code-block:: python
+
+        columns = client.measurements.get_columns(period='LAST_MONTH', metric='disk.usage')
+
+        for (source, metric), series in columns.items():
+            hourly = series.downsample(timedelta(hours=1), how='max')
+            print(source, hourly.percentile(95))
+    """
+    def __init__(self, series: Optional[Dict[SeriesKey, Series]] = None) -> None:
+        self._series = series or {}
+
+    def __getitem__(self, key: SeriesKey) -> Series:
+        return self._series[key]
+
+    def __iter__(self) -> Iterator[SeriesKey]:
+        return iter(self._series)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    @property
+    def sources(self) -> List[str]:
+        """
+        Names of nodes in order of first appearance.
+        """
+        return list(dict.fromkeys(source for source, _ in self._series))
+
+    @property
+    def metrics(self) -> List[str]:
+        """
+        Names of metrics in order of first appearance.
+        """
+        return list(dict.fromkeys(metric for _, metric in self._series))
+
+    def get_series(self, source: str, metric: str) -> Series:
+        """
+        Get series of node metric.
+
+        Raises:
+            QBError: there are no measurements of metric for node.
+        """
+        try:
+            return self._series[source, metric]
+        except KeyError:
+            raise QBError('No measurements of {} on {}'.format(metric, source)) from None
+
+    def to_numpy(self) -> 'MeasurementColumns':
+        """
+        Get columns with NumPy arrays, columns are shared without copying.
+
+        Raises:
+            QBError: numpy package is not installed.
+        """
+        return MeasurementColumns({key: series.to_numpy() for key, series in self.items()})
+
+
+class _ColumnsParser:
+    """
+    Single pass parser of measurements XML document, values are appended
+    right to arrays of series without creating intermediate objects of
+    records.
+    """
+    def __init__(self) -> None:
+        self.depth = 0
+        self.field = None  # type: Optional[str]
+        self.text = []  # type: List[str]
+        self.record = {}  # type: Dict[str, str]
+        self.series = {}  # type: Dict[SeriesKey, Series]
+
+    def parse(self, document: Union[str, bytes]) -> Dict[SeriesKey, Series]:
+        parser = ParserCreate('utf-8')
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._characters
+
+        # do not expand entities declared in DTD
+        parser.DefaultHandler = lambda _: None
+        parser.ExternalEntityRefHandler = lambda *_: 1
+
+        if isinstance(document, str):
+            document = document.encode('utf-8')
+
+        parser.Parse(document, True)
+        return self.series
+
+    def _start(self, name: str, _: Any) -> None:
+        self.depth += 1
+
+        if self.depth == FIELD_DEPTH and name in FIELDS:
+            self.field = name
+            self.text = []
+
+    def _characters(self, data: str) -> None:
+        if self.field is not None:
+            self.text.append(data)
+
+    def _end(self, _: str) -> None:
+        if self.depth == FIELD_DEPTH and self.field is not None:
+            self.record[self.field] = ''.join(self.text).strip()
+            self.field = None
+        elif self.depth == RECORD_DEPTH:
+            self._append(self.record)
+            self.record = {}
+
+        self.depth -= 1
+
+    def _append(self, record: Dict[str, str]) -> None:
+        key = (record.get('source', ''), record.get('metricName', ''))
+
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = Series(key[0], key[1], array('q'), array('d'))
+
+        series.timestamps.append(int(record['timestamp']))
+        series.values.append(float(record['value']))
+
+
+def parse_columns(document: Union[str, bytes], numpy: bool = False) -> MeasurementColumns:
+    """
+    Parse measurements XML document to columns, each series is sorted by
+    timestamp.
+
+    Raises:
+        QBError: document is not a measurements list.
+    """
+    try:
+        series = _ColumnsParser().parse(document)
+    except (ExpatError, KeyError, ValueError) as e:
+        raise QBError('Unexpected measurements document') from e
+
+    columns = MeasurementColumns(series)
+    if numpy:
+        columns = columns.to_numpy()
+
+    for item in columns.values():
+        item._sort()
+
+    return columns
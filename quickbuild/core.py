@@ -1,33 +1,37 @@
+import codecs
 import json
+import re
 
 from collections import namedtuple
+from functools import partial
 from http import HTTPStatus
 from inspect import signature
-from typing import Any, Callable, Optional
-
-from quickbuild.endpoints import (
-    Agents,
-    Audits,
-    Authorizations,
-    Builds,
-    Changes,
-    Configurations,
-    Dashboards,
-    Groups,
-    Identifiers,
-    Issues,
-    Measurements,
-    Memberships,
-    Nodes,
-    Profiles,
-    Reports,
-    Requests,
-    Resources,
-    Shares,
-    System,
-    Tokens,
-    Users,
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
 )
+
+from quickbuild import endpoints
+from quickbuild.cache import (
+    CacheKey,
+    ResponseCache,
+    Revalidation,
+    RevalidationCache,
+)
+from quickbuild.columns import parse_columns
 from quickbuild.exceptions import (
     QBError,
     QBForbiddenError,
@@ -36,42 +40,159 @@ from quickbuild.exceptions import (
     QBServerError,
     QBUnauthorizedError,
 )
-from quickbuild.helpers import ContentType
+from quickbuild.helpers import ContentType, response2py
+from quickbuild.metrics import MetricsHook, RequestMetrics, path_template
+from quickbuild.records import response2records
+
+if TYPE_CHECKING:
+    from quickbuild.endpoints import (
+        Agents,
+        Audits,
+        Authorizations,
+        Builds,
+        Changes,
+        Configurations,
+        Dashboards,
+        Groups,
+        Identifiers,
+        Issues,
+        Measurements,
+        Memberships,
+        Nodes,
+        Profiles,
+        Reports,
+        Requests,
+        Resources,
+        Shares,
+        System,
+        Tokens,
+        Users,
+    )
 
 CONTENT_JSON = 'application/json'
 
+CHARSET = re.compile(r';\s*charset="?([\w.:-]+)', re.IGNORECASE)
+DEFAULT_CHARSET = 'utf-8'
+
+# parsers which consume undecoded UTF-8 body
+BYTES_PARSERS = (json.loads, response2py, response2records, parse_columns)
+
 Response = namedtuple('Response', ['status', 'headers', 'body'])
 
+BatchResult = NamedTuple(
+    'BatchResult', [
+        ('results', List[Any]),
+        ('timings', List[float]),
+        ('elapsed', float),
+    ]
+)
+
+
+T = TypeVar('T')
+
+
+def get_charset(headers: Mapping[str, str]) -> str:
+    """
+    Get charset from Content-Type header, UTF-8 is assumed if it's not set
+    or unknown instead of guessing it from content.
+    """
+    match = CHARSET.search(headers.get('Content-Type', ''))
+    if match is None:
+        return DEFAULT_CHARSET
+
+    try:
+        return codecs.lookup(match.group(1)).name
+    except LookupError:
+        return DEFAULT_CHARSET
+
+
+def decode(body: bytes, charset: str, parser: Optional[Callable[[str], Any]] = None) -> Any:
+    """
+    Decode response body and pass it to parser, module level function is used
+    to keep parser picklable.
+    """
+    text = body.decode(charset, 'replace')
+    if parser is None:
+        return text
+
+    return parser(text)
+
+
+class Endpoint(Generic[T]):
+    """
+    Endpoint object is created on first access and stored in client instance,
+    so creation of client doesn't import and construct all endpoints.
+    """
+    def __init__(self, class_name: str) -> None:
+        self.class_name = class_name
+        self.name = class_name.lower()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: Type) -> 'Endpoint[T]':
+        ...
+
+    @overload
+    def __get__(self, instance: 'QuickBuild', owner: Type) -> T:
+        ...
+
+    def __get__(self, instance: Optional['QuickBuild'], owner: Type) -> Union['Endpoint[T]', T]:
+        if instance is None:
+            return self
+
+        endpoint = getattr(endpoints, self.class_name)(instance)
+
+        # non-data descriptor, so next access finds endpoint in instance dict
+        return instance.__dict__.setdefault(self.name, endpoint)
+
 
 class QuickBuild:
     """
     NB: somehow using -H Accept: application/json,application/xml,*/* leads to
     server error.
     """
-    def __init__(self, content_type: Optional[ContentType]) -> None:
+    agents = Endpoint('Agents')  # type: Endpoint[Agents]
+    audits = Endpoint('Audits')  # type: Endpoint[Audits]
+    authorizations = Endpoint('Authorizations')  # type: Endpoint[Authorizations]
+    builds = Endpoint('Builds')  # type: Endpoint[Builds]
+    changes = Endpoint('Changes')  # type: Endpoint[Changes]
+    configurations = Endpoint('Configurations')  # type: Endpoint[Configurations]
+    dashboards = Endpoint('Dashboards')  # type: Endpoint[Dashboards]
+    groups = Endpoint('Groups')  # type: Endpoint[Groups]
+    identifiers = Endpoint('Identifiers')  # type: Endpoint[Identifiers]
+    issues = Endpoint('Issues')  # type: Endpoint[Issues]
+    measurements = Endpoint('Measurements')  # type: Endpoint[Measurements]
+    memberships = Endpoint('Memberships')  # type: Endpoint[Memberships]
+    nodes = Endpoint('Nodes')  # type: Endpoint[Nodes]
+    profiles = Endpoint('Profiles')  # type: Endpoint[Profiles]
+    reports = Endpoint('Reports')  # type: Endpoint[Reports]
+    requests = Endpoint('Requests')  # type: Endpoint[Requests]
+    resources = Endpoint('Resources')  # type: Endpoint[Resources]
+    shares = Endpoint('Shares')  # type: Endpoint[Shares]
+    system = Endpoint('System')  # type: Endpoint[System]
+    tokens = Endpoint('Tokens')  # type: Endpoint[Tokens]
+    users = Endpoint('Users')  # type: Endpoint[Users]
+
+    def __init__(self,
+                 content_type: Optional[ContentType],
+                 cache: Optional[dict] = None,
+                 revalidate: Optional[dict] = None
+                 ) -> None:
         self._content_type = content_type
 
-        self.agents = Agents(self)
-        self.audits = Audits(self)
-        self.authorizations = Authorizations(self)
-        self.builds = Builds(self)
-        self.changes = Changes(self)
-        self.configurations = Configurations(self)
-        self.dashboards = Dashboards(self)
-        self.groups = Groups(self)
-        self.identifiers = Identifiers(self)
-        self.issues = Issues(self)
-        self.measurements = Measurements(self)
-        self.memberships = Memberships(self)
-        self.nodes = Nodes(self)
-        self.profiles = Profiles(self)
-        self.reports = Reports(self)
-        self.requests = Requests(self)
-        self.resources = Resources(self)
-        self.shares = Shares(self)
-        self.system = System(self)
-        self.tokens = Tokens(self)
-        self.users = Users(self)
+        self.cache = None  # type: Optional[ResponseCache]
+        if cache:
+            self._validate_cache_argument(cache)
+            self.cache = ResponseCache(**cache)
+
+        self.revalidation = None  # type: Optional[RevalidationCache]
+        if revalidate is not None:
+            self._validate_revalidate_argument(revalidate)
+            self.revalidation = RevalidationCache(**revalidate)
+
+        self.hooks = []  # type: List[MetricsHook]
 
     def _get_headers(self, content_type: Optional[ContentType]) -> dict:
         headers = {}
@@ -85,31 +206,111 @@ class QuickBuild:
 
         return headers
 
-    def _process(self, response: Response, callback: Optional[Callable] = None) -> Any:
-        if response.status == HTTPStatus.INTERNAL_SERVER_ERROR:
-            raise QBServerError('JSON is supported by QB10+\n\n' + response.body)
+    def add_hook(self, hook: MetricsHook) -> None:
+        """
+        Register metrics hook, it's called after each HTTP request with
+        RequestMetrics: method, path template, status code, response size in
+        bytes, network time, parse time in seconds and number of retries.
 
-        if response.status == HTTPStatus.NO_CONTENT:
-            raise QBProcessingError(response.body)
+        Requests aren't measured at all if there are no hooks.
 
-        if response.status == HTTPStatus.NOT_FOUND:
-            raise QBNotFoundError(response.body)
+        Args:
+            hook (Callable[[RequestMetrics], None]):
+                Function or ready-made PrometheusHook, OpenTelemetryHook.
+        """
+        self.hooks.append(hook)
 
-        if response.status == HTTPStatus.UNAUTHORIZED:
-            raise QBUnauthorizedError(response.body)
+    def remove_hook(self, hook: MetricsHook) -> None:
+        """
+        Unregister metrics hook.
 
-        if response.status == HTTPStatus.FORBIDDEN:
-            raise QBForbiddenError(response.body)
+        Args:
+            hook (Callable[[RequestMetrics], None]):
+                Previously registered hook.
+        """
+        self.hooks.remove(hook)
+
+    def _emit_metrics(self, metrics: RequestMetrics) -> None:
+        metrics = metrics._replace(path=path_template(metrics.path))
+
+        for hook in self.hooks:
+            hook(metrics)
+
+    def _invalidate_identifiers(self) -> None:
+        """
+        Drop identifiers resolved by names, since any modification could
+        rename, move or delete objects. Identifiers endpoint is created on
+        first access, so there is nothing to drop before it.
+        """
+        identifiers = self.__dict__.get('identifiers')
+        if identifiers is not None:
+            identifiers.cache.invalidate()
+
+    def _get_revalidation(self,  # pylint: disable=too-many-arguments
+                          method: str,
+                          path: str,
+                          content_type: Optional[ContentType],
+                          callback: Optional[Callable],
+                          kwargs: dict
+                          ) -> Tuple[Optional[CacheKey], Optional[Revalidation]]:
+        """
+        Add conditional headers to request if validators of previous response
+        are known.
+        """
+        if self.revalidation is None:
+            return None, None
+
+        key = self.revalidation.key(
+            method,
+            path,
+            params=kwargs.get('params'),
+            content_type=content_type,
+            callback=callback,
+        )
+
+        if key is None:
+            return None, None
+
+        revalidation = self.revalidation.get(key)
+        if revalidation is not None:
+            kwargs['headers'].update(revalidation.headers)
 
+        return key, revalidation
+
+    def _store_revalidation(self,
+                            key: Optional[CacheKey],
+                            headers: Mapping[str, str],
+                            result: Any
+                            ) -> None:
+        if key is not None and self.revalidation is not None:
+            self.revalidation.store(key, headers, result)
+
+    def _get_parser(self,
+                    response: Response,
+                    callback: Optional[Callable] = None,
+                    content_type: Optional[ContentType] = None
+                    ) -> Optional[Callable[[bytes], Any]]:
+        """
+        Check response status and get function which converts undecoded
+        response body, None is returned if body must be returned as is.
+
+        JSON and XML parsers consume UTF-8 bytes directly, otherwise body is
+        decoded with charset from headers.
+        """
         if response.status != HTTPStatus.OK:
-            raise QBError(response.body)
+            self._raise_for_status(response)
+
+        if (content_type or self._content_type) == ContentType.RAW:
+            return None
 
         # native json from server
         if response.headers.get('Content-Type') == CONTENT_JSON:
-            return json.loads(response.body)
+            return json.loads
+
+        charset = get_charset(response.headers)
 
         if not callback:
-            return response.body
+            return partial(decode, charset=charset)
 
         cb_parameters = signature(callback).parameters
 
@@ -120,9 +321,44 @@ class QuickBuild:
             else:
                 content_type = cb_parameters['content_type'].default
 
-            return callback(response.body, content_type=content_type)
+            callback = partial(callback, content_type=content_type)
 
-        return callback(response.body)
+        if charset == DEFAULT_CHARSET and getattr(callback, 'func', callback) in BYTES_PARSERS:
+            return callback
+
+        return partial(decode, charset=charset, parser=callback)
+
+    @staticmethod
+    def _raise_for_status(response: Response) -> None:
+        body = response.body.decode(get_charset(response.headers), 'replace')
+
+        if response.status == HTTPStatus.INTERNAL_SERVER_ERROR:
+            raise QBServerError('JSON is supported by QB10+\n\n' + body)
+
+        if response.status == HTTPStatus.NO_CONTENT:
+            raise QBProcessingError(body)
+
+        if response.status == HTTPStatus.NOT_FOUND:
+            raise QBNotFoundError(body)
+
+        if response.status == HTTPStatus.UNAUTHORIZED:
+            raise QBUnauthorizedError(body)
+
+        if response.status == HTTPStatus.FORBIDDEN:
+            raise QBForbiddenError(body)
+
+        raise QBError(body)
+
+    def _process(self,
+                 response: Response,
+                 callback: Optional[Callable] = None,
+                 content_type: Optional[ContentType] = None
+                 ) -> Any:
+        parser = self._get_parser(response, callback, content_type)
+        if parser is None:
+            return response.body
+
+        return parser(response.body)
 
     @staticmethod
     def _validate_retry_argument(retry: dict) -> None:
@@ -133,6 +369,74 @@ class QuickBuild:
         if retry.get('total', 0) <= 0:
             raise QBError('Invalid `total` in retry argument must be > 0')
 
+    @staticmethod
+    def _validate_cache_argument(cache: dict) -> None:
+        for key in cache:
+            if key not in ('size', 'ttl', 'endpoints'):
+                raise QBError('Unknown key in cache argument: ' + key)
+
+    @staticmethod
+    def _validate_revalidate_argument(revalidate: dict) -> None:
+        for key in revalidate:
+            if key not in ('size', 'endpoints'):
+                raise QBError('Unknown key in revalidate argument: ' + key)
+
+    @staticmethod
+    def _validate_offload_argument(offload: dict) -> None:
+        for key in offload:
+            if key not in ('threshold', 'workers', 'processes'):
+                raise QBError('Unknown key in offload argument: ' + key)
+
+    @staticmethod
+    def _validate_pool_argument(pool: dict) -> None:
+        for key in pool:
+            if key not in ('limit', 'limit_per_host', 'keepalive_timeout', 'ttl_dns_cache'):
+                raise QBError('Unknown key in pool argument: ' + key)
+
+        for key in ('limit', 'limit_per_host'):
+            if pool.get(key, 1) <= 0:
+                raise QBError('Invalid `{}` in pool argument must be > 0'.format(key))
+
+    @staticmethod
+    def _validate_concurrency(concurrency: int) -> None:
+        if concurrency <= 0:
+            raise QBError('Invalid `concurrency` argument must be > 0')
+
+    @staticmethod
+    def _validate_download(chunk_size: int, retries: int) -> None:
+        if chunk_size <= 0:
+            raise QBError('Invalid `chunk_size` argument must be > 0')
+
+        if retries < 0:
+            raise QBError('Invalid `retries` argument must be >= 0')
+
+    def _validate_pagination(self) -> None:
+        if self._content_type not in (ContentType.PARSE, ContentType.JSON, ContentType.RECORDS):
+            raise QBError('Pagination is supported only for PARSE, JSON and RECORDS content types')
+
+    @staticmethod
+    def _validate_page(page: Any) -> None:
+        if not isinstance(page, list):
+            raise QBError('Unexpected page of results: {!r}'.format(page))
+
+    @staticmethod
+    def _get_pages(sets: Iterable[Tuple[Any, ...]],
+                   sizes: Iterable[Any],
+                   count: int,
+                   reverse: bool
+                   ) -> Iterator[Tuple[Tuple[Any, ...], int]]:
+        """
+        Get set and offset of each page of several result sets of known
+        sizes, pages of each set go from the last one if `reverse` is set.
+        """
+        for page_set, size in zip(sets, sizes):
+            if not isinstance(size, int):
+                raise QBError('Unexpected size of results: {!r}'.format(size))
+
+            offsets = range(0, size, count)
+            for offset in (reversed(offsets) if reverse else offsets):
+                yield page_set, offset
+
     @staticmethod
     def _validate_for_id(configuration: str) -> None:
         if '</id>' in configuration:
@@ -0,0 +1,122 @@
+import os
+import re
+
+from http import HTTPStatus
+from typing import IO, Any, Mapping, Optional, Union
+
+from quickbuild.exceptions import QBError
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# statuses of download responses which carry file content
+DOWNLOAD_STATUSES = (
+    HTTPStatus.OK,
+    HTTPStatus.PARTIAL_CONTENT,
+    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+)
+
+CONTENT_RANGE = re.compile(r'bytes (?:(\d+)-\d+|\*)/(\d+)')
+
+Target = Union[str, 'os.PathLike[str]', IO[bytes]]
+
+
+class DownloadTarget:
+    """
+    Destination of streamed download, which keeps track of written bytes to
+    resume interrupted download with Range request and verify its size.
+
+    Args:
+        target (Union[str, os.PathLike, IO[bytes]]):
+            File path or binary file-like object.
+
+        resume (bool):
+            Continue writing to existing file instead of overwriting it.
+    """
+    def __init__(self, target: Target, resume: bool = False) -> None:
+        self.size = None  # type: Optional[int]
+        self.written = 0
+
+        self._skip = 0
+        self._close = isinstance(target, (str, os.PathLike))
+
+        if isinstance(target, (str, os.PathLike)):
+            # pylint: disable=consider-using-with
+            self.file = open(target, 'ab' if resume else 'wb')  # type: IO[bytes]
+            self.written = self.file.tell()
+        else:
+            self.file = target
+
+    def __enter__(self) -> 'DownloadTarget':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._close:
+            self.file.close()
+
+    def get_headers(self) -> dict:
+        """
+        Headers of next request, compression is disabled, so size of body
+        matches Content-Length.
+        """
+        headers = {'Accept-Encoding': 'identity'}
+
+        if self.written:
+            headers['Range'] = 'bytes={}-'.format(self.written)
+
+        return headers
+
+    def begin(self, status: int, headers: Mapping[str, str]) -> bool:
+        """
+        Prepare to receive response body, returns false if there is nothing
+        to receive, e.g. download is already complete.
+
+        Raises:
+            QBError: response doesn't match download state.
+        """
+        if status == HTTPStatus.OK:
+            # server ignores Range, so already written part has to be skipped
+            self._skip = self.written
+            if 'Content-Length' in headers:
+                self.size = int(headers['Content-Length'])
+            return True
+
+        match = CONTENT_RANGE.fullmatch(headers.get('Content-Range', ''))
+        if match is None:
+            raise QBError('Invalid Content-Range of partial response')
+
+        start, self.size = match.group(1), int(match.group(2))
+
+        if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            return False
+
+        if start is None or int(start) != self.written:
+            raise QBError('Partial response starts from unexpected position')
+
+        return True
+
+    def write(self, chunk: bytes) -> None:
+        if self._skip:
+            if len(chunk) <= self._skip:
+                self._skip -= len(chunk)
+                return
+
+            chunk = chunk[self._skip:]
+            self._skip = 0
+
+        self.file.write(chunk)
+        self.written += len(chunk)
+
+    def is_complete(self) -> bool:
+        """
+        Check size of received data.
+
+        Raises:
+            QBError: received more data than expected.
+        """
+        if self.size is None:
+            return True
+
+        if self.written > self.size:
+            raise QBError('Downloaded {} bytes, but expected {}'.format(self.written, self.size))
+
+        return self.written == self.size
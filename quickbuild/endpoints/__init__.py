@@ -1,24 +1,28 @@
-from .agents import Agents
-from .audits import Audits
-from .authorizations import Authorizations
-from .builds import Builds
-from .changes import Changes
-from .configurations import Configurations
-from .dashboards import Dashboards
-from .groups import Groups
-from .identifiers import Identifiers
-from .issues import Issues
-from .measurements import Measurements
-from .memberships import Memberships
-from .nodes import Nodes
-from .profiles import Profiles
-from .reports import Reports
-from .requests import Requests
-from .resources import Resources
-from .shares import Shares
-from .system import System
-from .tokens import Tokens
-from .users import Users
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .agents import Agents
+    from .audits import Audits
+    from .authorizations import Authorizations
+    from .builds import Builds
+    from .changes import Changes
+    from .configurations import Configurations
+    from .dashboards import Dashboards
+    from .groups import Groups
+    from .identifiers import Identifiers
+    from .issues import Issues
+    from .measurements import Measurements
+    from .memberships import Memberships
+    from .nodes import Nodes
+    from .profiles import Profiles
+    from .reports import Reports
+    from .requests import Requests
+    from .resources import Resources
+    from .shares import Shares
+    from .system import System
+    from .tokens import Tokens
+    from .users import Users
 
 __all__ = (
     'Agents',
@@ -43,3 +47,19 @@ __all__ = (
     'Tokens',
     'Users',
 )
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Endpoint modules are imported on first access.
+    """
+    if name not in __all__:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(import_module('.' + name.lower(), __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
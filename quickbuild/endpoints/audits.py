@@ -1,6 +1,12 @@
-from typing import Dict, List, Optional, Union
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-from quickbuild.helpers import response2py
+from quickbuild.exceptions import QBError
+from quickbuild.helpers import parse_date, response2py
+from quickbuild.records import AuditRecord, response2records
+
+DATE_FORMAT = '%Y-%m-%d %H:%M'
 
 
 class Audits:
@@ -53,7 +59,8 @@ class Audits:
                 0 is assumed.
 
         Returns:
-            List[dict]: list of audits.
+            List[dict]: list of audits, AuditRecord items for RECORDS content
+            type.
         """
         params = dict(count=count)  # type: Dict[str, Union[str, int]]
 
@@ -78,19 +85,206 @@ class Audits:
         return self.quickbuild._request(
             'GET',
             'audits',
-            callback=response2py,
+            callback=partial(response2records, record_type=AuditRecord),
             params=params,
         )
 
-    def count(self) -> int:
+    def iter(self,
+             since: datetime,
+             until: Optional[datetime] = None,
+             *,
+             shard: timedelta = timedelta(days=1),
+             page_size: int = 100,
+             concurrency: int = 4,
+             username: Optional[str] = None,
+             source: Optional[str] = None,
+             action: Optional[str] = None
+             ) -> Iterator[dict]:
+        """
+        Iterate over audits of long time range in time order, range is split
+        into shards, count of audits of each shard is requested first, then
+        pages of all shards are requested concurrently from the oldest one
+        using `first` and `count` arguments of `get()`.
+
+        Only `concurrency` pages are kept in memory, which makes it suitable
+        for incremental export, e.g. next export could start from timestamp of
+        the last exported audit.
+
+        Server accepts dates with minutes precision, so shards are requested
+        with bounds rounded to whole minutes and audits are trimmed to exact
+        time range of shard by their timestamps. Dates are sent as is,
+        without time zone, and server interprets them in its own time zone,
+        so naive dates are compared with timestamps of audits as local time
+        of client, which must be the same as time zone of server, otherwise
+        aware dates in time zone of server should be used.
+
+        Time range always ends in the past, audits created while iterating
+        shift audits of server pages and would be missed, so `until` should
+        not be in the future.
+
+        For async client this is an async generator.
+
+        Example:
+
+        .. code-block:: python
+
+            since = datetime(2024, 1, 1)
+
+            for audit in client.audits.iter(since, shard=timedelta(hours=6)):
+                print(audit['timestamp'], audit['action'])
+
+        Args:
+            since (datetime):
+                Search audits generated since this date, inclusive.
+
+            until (Optional[datetime]):
+                Search audits generated before this date, exclusive (default
+                start of the current minute).
+
+            shard (timedelta):
+                Time range of one count request, at least one minute (default
+                one day).
+
+            page_size (int):
+                Number of audits requested at once (default 100).
+
+            concurrency (int):
+                Number of pages requested at once (default 4).
+
+            username (Optional[str]):
+                Name of the user to audit.
+
+            source (Optional[str]):
+                Source of audit to match, * can be used for wildcard match.
+
+            action (Optional[str]):
+                Action of the audit to match.
+
+        Returns:
+            Iterator[dict]: audits from oldest to newest.
+
+        Raises:
+            QBError: invalid arguments, unexpected audit timestamp or client
+            content type is XML.
+        """
+        if until is None:
+            until = datetime.now(since.tzinfo).replace(second=0, microsecond=0)
+
+        if shard < timedelta(minutes=1):
+            raise QBError('Invalid `shard` argument must be at least one minute')
+
+        if since >= until:
+            raise QBError('Invalid `since` argument must be before `until`')
+
+        self.quickbuild._validate_concurrency(concurrency)
+        self.quickbuild._validate_pagination()
+
+        filters = dict(username=username, source=source, action=action)
+
+        def get_shard(start: datetime, stop: datetime) -> Tuple[Callable, Callable, Callable]:
+            dates = self._get_dates(start, stop)
+
+            return (
+                partial(self.count, **filters, **dates),
+                lambda first, count: self.get(count, first=first, **filters, **dates),
+                partial(self._trim, start.timestamp(), stop.timestamp()),
+            )
+
+        return self.quickbuild._paginate_many(
+            (get_shard(start, stop) for start, stop in self._get_shards(since, until, shard)),
+            page_size,
+            concurrency=concurrency,
+            reverse=True,
+        )
+
+    @staticmethod
+    def _get_params(**kwargs: Optional[str]) -> Dict[str, str]:
+        return {key: value for key, value in kwargs.items() if value}
+
+    @staticmethod
+    def _get_shards(since: datetime,
+                    until: datetime,
+                    shard: timedelta
+                    ) -> Iterator[Tuple[datetime, datetime]]:
+        while since < until:
+            end = min(since + shard, until)
+            yield since, end
+            since = end
+
+    @staticmethod
+    def _get_dates(since: datetime, until: datetime) -> Dict[str, str]:
+        """
+        Get `since` and `until` arguments of time range rounded outwards to
+        whole minutes.
+        """
+        if until.second or until.microsecond:
+            until = until.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+        return dict(since=since.strftime(DATE_FORMAT), until=until.strftime(DATE_FORMAT))
+
+    @staticmethod
+    def _trim(since: float, until: float, audits: List[dict]) -> List[dict]:
+        """
+        Get audits of page generated in `[since, until)` time range sorted
+        from oldest to newest, server returns the newest audits first.
+        """
+        trimmed = []
+
+        for audit in audits:
+            timestamp = parse_date(audit['timestamp'])
+            if timestamp is None:
+                raise QBError('Unexpected audit timestamp: {!r}'.format(audit['timestamp']))
+
+            if since <= timestamp < until:
+                trimmed.append((timestamp, audit['id'], audit))
+
+        trimmed.sort(key=lambda item: item[:2])
+
+        return [audit for _, _, audit in trimmed]
+
+    def count(self,
+              *,
+              username: Optional[str] = None,
+              source: Optional[str] = None,
+              action: Optional[str] = None,
+              since: Optional[str] = None,
+              until: Optional[str] = None
+              ) -> int:
         """
         Get count of audits.
 
+        Args:
+            username (Optional[str]):
+                Name of the user to audit.
+
+            source (Optional[str]):
+                Source of audit to match, * can be used for wildcard match.
+
+            action (Optional[str]):
+                Action of the audit to match.
+
+            since (Optional[str]):
+                In the format of yyyy-MM-dd HH:mm, count audits generated
+                after this date.
+
+            until (Optional[str]):
+                In the format of yyyy-MM-dd HH:mm, count audits generated
+                before this date.
+
         Returns:
             int: count of audits.
         """
+        params = self._get_params(
+            username=username,
+            source=source,
+            action=action,
+            since=since,
+            until=until,
+        )
+
         return self.quickbuild._request(
             'GET',
             'audits/count',
             callback=response2py,
+            params=params,
         )
@@ -1,11 +1,24 @@
 from datetime import datetime
 from functools import partial
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from quickbuild.core import BatchResult
+from quickbuild.download import DEFAULT_CHUNK_SIZE, Target
+from quickbuild.exceptions import QBError
+from quickbuild.graph import DEPENDENCIES, BuildGraph, get_crawl_roots
 from quickbuild.helpers import ContentType, response2py
+from quickbuild.models import (
+    BuildReference,
+    Repository,
+    StepTree,
+    parse_builds,
+    parse_repositories,
+    parse_steps,
+)
+from quickbuild.records import BuildRecord, response2records
 
 
-class Builds:
+class Builds:  # pylint: disable=too-many-public-methods
 
     def __init__(self, quickbuild) -> None:
         self.quickbuild = quickbuild
@@ -163,25 +176,41 @@ class Builds:
         """
         return self.quickbuild.identifiers.get_build_id_by_build_name(name)
 
-    def get_steps(self, build_id: int) -> str:
+    def get_steps(self,
+                  build_id: int,
+                  *,
+                  content_type: Optional[ContentType] = None
+                  ) -> Union[StepTree, str]:
         """
-        Get build steps.
+        Get build steps as tree with parent links and name index.
 
         Args:
             build_id (int):
                 Build identifier.
 
+            content_type (Optional[ContentType]):
+                Select needed content type if not set, default value of client
+                instance is used.
+
         Returns:
-            str: builds steps as XML document
-        """
-        response = self.quickbuild._request(
-            'GET',
-            'builds/{}/steps'.format(build_id)
+            Union[StepTree, str]: build steps, XML document for XML content
+            type.
+        """
+        return self.quickbuild._then(
+            self.quickbuild._request(
+                'GET',
+                'builds/{}/steps'.format(build_id),
+                callback=partial(response2py, content_type=content_type),
+                content_type=content_type,
+            ),
+            parse_steps,
         )
 
-        return response
-
-    def get_repositories(self, build_id: int) -> str:
+    def get_repositories(self,
+                         build_id: int,
+                         *,
+                         content_type: Optional[ContentType] = None
+                         ) -> Union[List[Repository], str]:
         """
         Get build repositories.
 
@@ -189,51 +218,158 @@ class Builds:
             build_id (int):
                 Build identifier.
 
+            content_type (Optional[ContentType]):
+                Select needed content type if not set, default value of client
+                instance is used.
+
         Returns:
-            str: builds repositories as XML document
-        """
-        response = self.quickbuild._request(
-            'GET',
-            'builds/{}/repositories'.format(build_id)
+            Union[List[Repository], str]: build repositories, XML document for
+            XML content type.
+        """
+        return self.quickbuild._then(
+            self.quickbuild._request(
+                'GET',
+                'builds/{}/repositories'.format(build_id),
+                callback=partial(response2py, content_type=content_type),
+                content_type=content_type,
+            ),
+            parse_repositories,
         )
 
-        return response
-
-    def get_dependencies(self, build_id: int) -> str:
+    def get_dependencies(self,
+                         build_id: int,
+                         *,
+                         content_type: Optional[ContentType] = None
+                         ) -> Union[List[BuildReference], str]:
         """
-        Get build dependencies.
+        Get builds which build depends on.
 
         Args:
             build_id (int):
                 Build identifier.
 
+            content_type (Optional[ContentType]):
+                Select needed content type if not set, default value of client
+                instance is used.
+
         Returns:
-            str: builds dependencies as XML document
-        """
-        response = self.quickbuild._request(
-            'GET',
-            'builds/{}/dependencies'.format(build_id)
+            Union[List[BuildReference], str]: dependency builds, XML document
+            for XML content type.
+        """
+        return self.quickbuild._then(
+            self.quickbuild._request(
+                'GET',
+                'builds/{}/dependencies'.format(build_id),
+                callback=partial(response2py, content_type=content_type),
+                content_type=content_type,
+            ),
+            parse_builds,
         )
 
-        return response
-
-    def get_dependents(self, build_id: int) -> str:
+    def get_dependents(self,
+                       build_id: int,
+                       *,
+                       content_type: Optional[ContentType] = None
+                       ) -> Union[List[BuildReference], str]:
         """
-        Get build dependents.
+        Get builds which depend on build.
 
         Args:
             build_id (int):
                 Build identifier.
 
+            content_type (Optional[ContentType]):
+                Select needed content type if not set, default value of client
+                instance is used.
+
         Returns:
-            str: builds dependents as XML document
-        """
-        response = self.quickbuild._request(
-            'GET',
-            'builds/{}/dependents'.format(build_id)
+            Union[List[BuildReference], str]: dependent builds, XML document
+            for XML content type.
+        """
+        return self.quickbuild._then(
+            self.quickbuild._request(
+                'GET',
+                'builds/{}/dependents'.format(build_id),
+                callback=partial(response2py, content_type=content_type),
+                content_type=content_type,
+            ),
+            parse_builds,
         )
 
-        return response
+    def get_graph(self,
+                  build_ids: Union[int, Iterable[int]],
+                  *,
+                  direction: str = DEPENDENCIES,
+                  max_depth: Optional[int] = None,
+                  concurrency: int = 10
+                  ) -> BuildGraph:
+        """
+        Get graph of transitive dependencies and/or dependents of builds.
+
+        Graph is expanded breadth-first: all builds of the same depth are
+        requested concurrently and each build is requested only once, so
+        shared dependencies and dependency cycles don't cause extra requests.
+
+        Example:
+
+        .. code-block:: python
+
+            graph = client.builds.get_graph(123, direction='dependents')
+            print(graph.get_dependents(123, transitive=True))
+
+        Args:
+            build_ids (Union[int, Iterable[int]]):
+                Build identifier or identifiers to start from.
+
+            direction (str):
+                Which edges to follow: `dependencies`, `dependents` or `both`
+                (default `dependencies`).
+
+            max_depth (Optional[int]):
+                Maximum distance from starting builds to expand, 0 means only
+                starting builds are requested (default unlimited).
+
+            concurrency (int):
+                Maximum number of in-flight requests (default 10).
+
+        Returns:
+            BuildGraph: builds and edges between them.
+
+        Raises:
+            QBError: client content type is XML.
+        """
+        if isinstance(build_ids, int):
+            build_ids = [build_ids]
+
+        roots = get_crawl_roots(build_ids, direction)
+        self.quickbuild._validate_concurrency(concurrency)
+
+        if max_depth is not None and max_depth < 0:
+            raise QBError('Invalid `max_depth` argument must be >= 0')
+
+        graph = BuildGraph()
+
+        def fetch(item: Tuple[str, int]) -> Any:
+            item_direction, build_id = item
+            if item_direction == DEPENDENCIES:
+                return self.get_dependencies(build_id)
+            return self.get_dependents(build_id)
+
+        def neighbours(item: Any, result: Any) -> List[Tuple[str, int]]:
+            item_direction, build_id = item
+            graph.update(item_direction, build_id, result)
+            return [(item_direction, build.id) for build in result]
+
+        return self.quickbuild._then(
+            self.quickbuild._crawl(
+                fetch,
+                roots,
+                neighbours,
+                concurrency=concurrency,
+                max_depth=max_depth,
+            ),
+            lambda _: graph,
+        )
 
     def get_files(self, build_id: int, path: str) -> str:
         """
@@ -267,6 +403,107 @@ class Builds:
 
         return response
 
+    def download_file(self,
+                      build_id: int,
+                      path: str,
+                      target: Target,
+                      *,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      retries: int = 3,
+                      resume: bool = False
+                      ) -> int:
+        """
+        Download published file of build, content is streamed to target by
+        chunks, so whole file is never kept in memory.
+
+        If connection is broken, download is continued from received position
+        using HTTP Range request. Received size is verified against size
+        reported by server.
+
+        Args:
+            build_id (int):
+                Build id.
+
+            path (str):
+                Relative path of file under publish directory of the build.
+
+            target (Union[str, os.PathLike, IO[bytes]]):
+                File path or binary file-like object to write content to.
+
+            chunk_size (int):
+                Size of chunks in bytes (default 1 MiB).
+
+            retries (int):
+                Number of attempts to resume interrupted download (default 3).
+
+            resume (bool):
+                If target is file path and the file exists, continue download
+                from its size instead of overwriting it (default false).
+
+        Returns:
+            int: size of downloaded file in bytes.
+
+        Raises:
+            QBProcessingError: will be raised if specified path does not exist.
+            QBError: download can't be completed.
+        """
+        return self.quickbuild._download(
+            'files',
+            target,
+            params=dict(build_id=build_id, path=path),
+            chunk_size=chunk_size,
+            retries=retries,
+            resume=resume,
+        )
+
+    def download_files(self,
+                       build_id: int,
+                       files: Dict[str, Target],
+                       *,
+                       concurrency: int = 4,
+                       return_exceptions: bool = False,
+                       **kwargs: Any
+                       ) -> BatchResult:
+        """
+        Download many published files of build concurrently.
+
+        Example:
+
+        .. code-block:: python
+
+            batch = client.builds.download_files(1, {
+                'artifacts/app.zip': '/tmp/app.zip',
+                'artifacts/app.pdb': '/tmp/app.pdb',
+            })
+
+        Args:
+            build_id (int):
+                Build id.
+
+            files (Dict[str, Union[str, os.PathLike, IO[bytes]]]):
+                Targets by relative paths of files.
+
+            concurrency (int):
+                Maximum number of downloads at the same time (default 4).
+
+            return_exceptions (bool):
+                If set, QBError raised for file is placed into results instead
+                of failing whole batch (default false).
+
+            kwargs:
+                Options of `download_file`: chunk_size, retries, resume.
+
+        Returns:
+            BatchResult: sizes of files in order of `files`, time spent on
+            each file and total elapsed time in seconds.
+        """
+        return self.quickbuild.gather_map(
+            lambda item: self.download_file(build_id, item[0], item[1], **kwargs),
+            list(files.items()),
+            concurrency=concurrency,
+            return_exceptions=return_exceptions,
+        )
+
     def get_notifications(self,
                           last_notified_build_id: Optional[int] = None
                           ) -> Union[List[dict], str]:
@@ -363,7 +600,8 @@ class Builds:
                 if this param is not specified.
 
         Returns:
-            List[dict]: builds search result list.
+            List[dict]: builds search result list, BuildRecord items for
+            RECORDS content type.
         """
         params = dict(
             count=count,
@@ -405,12 +643,59 @@ class Builds:
         response = self.quickbuild._request(
             'GET',
             'builds',
-            callback=response2py,
+            callback=partial(response2records, record_type=BuildRecord),
             params=params
         )
 
         return response
 
+    def iter_search(self,
+                    page_size: int = 100,
+                    *,
+                    first: int = 0,
+                    read_ahead: bool = False,
+                    **kwargs: Any
+                    ) -> Iterator[dict]:
+        """
+        Iterate over builds search results, builds are requested page by page
+        using `first` and `count` arguments of `search()`, so only one page is
+        kept in memory. Iteration stops when page shorter than `page_size` is
+        returned.
+
+        For async client this is an async generator.
+
+        Args:
+            page_size (int):
+                Number of builds requested at once (default 100).
+
+            first (int):
+                Start position of search results (default 0).
+
+            read_ahead (bool):
+                Request next page in background while current page is being
+                consumed to hide round-trip latency (default false).
+
+            kwargs:
+                Search criteria, the same as for `search()`.
+
+        Returns:
+            Iterator[dict]: builds search result iterator.
+
+        Raises:
+            QBError: client content type is XML.
+        """
+        self.quickbuild._validate_pagination()
+
+        def fetch(first: int, count: int) -> List[dict]:
+            return self.search(count, first=first, **kwargs)
+
+        return self.quickbuild._paginate(
+            fetch,
+            page_size,
+            first=first,
+            read_ahead=read_ahead,
+        )
+
     def count(self,
               *,
               configuration_id: Optional[int] = None,
@@ -1,6 +1,8 @@
+from functools import partial
 from typing import Any, Dict, List, Optional
 
 from quickbuild.helpers import response2py
+from quickbuild.records import ChangesetRecord, response2records
 
 
 class Changes:
@@ -186,7 +188,8 @@ class Changes:
                 descendent, by default, it is descendent.
 
         Returns:
-            List[dict]: changesets list.
+            List[dict]: changesets list, ChangesetRecord items for RECORDS
+            content type.
         """
         params = dict()  # type: Dict[str, Any]
 
@@ -226,7 +229,7 @@ class Changes:
         response = self.quickbuild._request(
             'GET',
             'changes/{}'.format(configuration),
-            callback=response2py,
+            callback=partial(response2records, record_type=ChangesetRecord),
             params=params,
         )
 
@@ -245,12 +248,13 @@ class Changes:
                 Build id.
 
         Returns:
-            List[dict]: changesets list.
+            List[dict]: changesets list, ChangesetRecord items for RECORDS
+            content type.
         """
         response = self.quickbuild._request(
             'GET',
             'changes/commits/build/{}'.format(build_id),
-            callback=response2py,
+            callback=partial(response2records, record_type=ChangesetRecord),
         )
 
         return response
@@ -4,6 +4,7 @@ from functools import partial
 from typing import List, Optional, Union
 
 from quickbuild.helpers import ContentType, response2py
+from quickbuild.tree import ConfigurationTree
 
 
 class Configurations:
@@ -57,6 +58,49 @@ class Configurations:
         """
         return self._get(dict(recursive=True, parent_id=parent_id))
 
+    def get_tree(self) -> ConfigurationTree:
+        """
+        Get snapshot of all configurations as tree using one request, so
+        paths, parents, children and ancestors could be found locally.
+
+        Returns:
+            ConfigurationTree: configuration tree.
+        """
+        return self.quickbuild._then(self.get(), ConfigurationTree)
+
+    def refresh_tree(self,
+                     tree: ConfigurationTree,
+                     parent_id: int,
+                     *,
+                     recursive: bool = True
+                     ) -> None:
+        """
+        Update subtree of configuration tree from server.
+
+        Args:
+            tree (ConfigurationTree):
+                Configuration tree to update.
+
+            parent_id (int):
+                Identifier of configuration which subtree is updated.
+
+            recursive (bool):
+                If set, all descendants are requested and replaced, otherwise
+                only children are requested (default true).
+
+        Returns:
+            None
+        """
+        if recursive:
+            configurations = self.get_descendent(parent_id)
+        else:
+            configurations = self.get_child(parent_id)
+
+        return self.quickbuild._then(
+            configurations,
+            partial(tree.update, parent_id, recursive=recursive),
+        )
+
     def get_info(self,
                  configuration_id: int,
                  *,
@@ -1,7 +1,19 @@
-from typing import Any
+from typing import Any, Dict, Iterable, Optional
 
+from quickbuild.cache import IdentifierCache
+from quickbuild.exceptions import QBError, QBNotFoundError, QBProcessingError
 from quickbuild.helpers import response2py
 
+# kind of object for bulk resolution -> query parameter of id service
+KINDS = {
+    'configuration': 'configuration_path',
+    'dashboard': 'dashboard_fqn',
+    'group': 'group_name',
+    'queue': 'queue_name',
+    'resource': 'resource_name',
+    'user': 'user_name',
+}
+
 
 class Identifiers:
     """
@@ -12,6 +24,7 @@ class Identifiers:
     """
     def __init__(self, quickbuild) -> None:
         self.quickbuild = quickbuild
+        self.cache = IdentifierCache()
 
     def _get(self, params: dict) -> Any:
         return self.quickbuild._request(
@@ -156,3 +169,72 @@ class Identifiers:
             QBProcessingError: will be raised if resource is not found.
         """
         return self._get(dict(dashboard_fqn=fqn))
+
+    def resolve_many(self,
+                     kind: str,
+                     names: Iterable[str],
+                     *,
+                     concurrency: int = 10
+                     ) -> Dict[str, Optional[int]]:
+        """
+        Resolve many names of the same kind to identifiers concurrently.
+
+        Results are memoized in ``client.identifiers.cache`` (IdentifierCache),
+        so next calls request only unknown names, missing names are memoized
+        for a short time as well. Cache is cleared by any update, create or
+        delete request of client. Cache can be tuned by replacing it, e.g.
+        ``client.identifiers.cache = IdentifierCache(ttl=60)``, and it can be
+        used for reverse lookup of names by identifiers.
+
+        Args:
+            kind (str):
+                Kind of objects: `configuration` (names are paths),
+                `dashboard` (names are FQNs), `group`, `queue`, `resource`
+                or `user`.
+
+            names (Iterable[str]):
+                Names to resolve.
+
+            concurrency (int):
+                Maximum number of requests at the same time (default 10).
+
+        Returns:
+            Dict[str, Optional[int]]: identifiers by names in order of names,
+            None for missing objects.
+        """
+        if kind not in KINDS:
+            raise QBError('Unknown kind of identifier: ' + kind)
+
+        param = KINDS[kind]
+        names = list(dict.fromkeys(names))
+
+        resolved = {}  # type: Dict[str, Optional[int]]
+        unknown = []
+
+        for name in names:
+            found, identifier = self.cache.get_id(kind, name)
+            if found:
+                resolved[name] = identifier
+            else:
+                unknown.append(name)
+
+        def store(batch: Any) -> Dict[str, Optional[int]]:
+            for name, result in zip(unknown, batch.results):
+                if isinstance(result, (QBNotFoundError, QBProcessingError)):
+                    result = None
+                elif isinstance(result, QBError):
+                    raise result
+
+                self.cache.store(kind, name, result)
+                resolved[name] = result
+
+            return {name: resolved[name] for name in names}
+
+        batch = self.quickbuild.gather_map(
+            lambda name: self._get({param: name}),
+            unknown,
+            concurrency=concurrency,
+            return_exceptions=True,
+        )
+
+        return self.quickbuild._then(batch, store)
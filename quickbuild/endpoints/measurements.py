@@ -1,6 +1,9 @@
-from typing import List, Optional, Union
+from functools import partial
+from typing import Dict, List, Optional, Union
 
-from quickbuild.helpers import response2py
+from quickbuild.columns import MeasurementColumns, get_numpy, parse_columns
+from quickbuild.helpers import ContentType
+from quickbuild.records import MeasurementRecord, response2records
 
 
 class Measurements:
@@ -51,35 +54,108 @@ class Measurements:
                 By default, ISO 8601 is used.
 
         Returns:
-            Union[List[dict], str]: list of measurements.
+            Union[List[dict], str]: list of measurements, MeasurementRecord
+            items for RECORDS content type.
         """
-        params = dict()
+        params = self._get_params(
+            source=source,
+            period=period,
+            start_time=start_time,
+            end_time=end_time,
+            metric=metric,
+            date_pattern=date_pattern,
+        )
+
+        return self.quickbuild._request(
+            'GET',
+            'grid/measurements',
+            callback=partial(response2records, record_type=MeasurementRecord),
+            params=params,
+        )
+
+    def get_columns(self,
+                    *,
+                    source: Optional[str] = None,
+                    period: Optional[str] = None,
+                    start_time: Optional[str] = None,
+                    end_time: Optional[str] = None,
+                    metric: Optional[str] = None,
+                    date_pattern: Optional[str] = None,
+                    numpy: bool = False
+                    ) -> MeasurementColumns:
+        """
+        Get measurements as columns of timestamps and values grouped by node
+        and metric.
+
+        Response is parsed right into arrays without creating object for each
+        measurement, so one point takes 16 bytes. Series could be downsampled
+        and percentiles could be computed without converting them back to
+        Python objects.
 
-        if source:
-            params['source'] = source
+        Example:
 
-        if period:
-            params['period'] = period
+        .. code-block:: python
 
-        if start_time:
-            params['start_time'] = start_time
+            columns = client.measurements.get_columns(period='LAST_MONTH', numpy=True)
 
-        if end_time:
-            params['end_time'] = end_time
+            for (source, metric), series in columns.items():
+                hourly = series.downsample(timedelta(hours=1))
+                print(source, metric, hourly.percentile(95))
 
-        if metric:
-            params['metric'] = metric
+        Args:
+            source (Optional[str]):
+                Specify the node you want to query. If not specified, then all
+                nodes will be used. (Example: `myagent:8811`)
 
-        if date_pattern:
-            params['date_pattern'] = date_pattern
+            period (Optional[str]):
+                Specify the time range you want to query, see `get()`.
+
+            start_time (Optional[str]):
+                Specify the start time you want to query.
+
+            end_time (Optional[str]):
+                Specify the end time you want to query.
+
+            metric (Optional[str]):
+                Specify the metric name you want to query. (Example: `disk.usage`)
+
+            date_pattern (Optional[str]):
+                Specify the date pattern you are using for from_date and to_date.
+
+            numpy (bool):
+                If set, columns are NumPy arrays instead of `array.array`,
+                requires numpy package (default false).
+
+        Returns:
+            MeasurementColumns: series by `(source, metric)` key.
+
+        Raises:
+            QBError: numpy is set, but numpy package is not installed.
+        """
+        if numpy:
+            get_numpy()
+
+        params = self._get_params(
+            source=source,
+            period=period,
+            start_time=start_time,
+            end_time=end_time,
+            metric=metric,
+            date_pattern=date_pattern,
+        )
 
         return self.quickbuild._request(
             'GET',
             'grid/measurements',
-            callback=response2py,
+            callback=partial(parse_columns, numpy=numpy),
             params=params,
+            content_type=ContentType.PARSE,
         )
 
+    @staticmethod
+    def _get_params(**kwargs: Optional[str]) -> Dict[str, str]:
+        return {key: value for key, value in kwargs.items() if value}
+
     def get_version(self) -> str:
         """
         Get current version for the measurements related REST API.
@@ -1,5 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+from quickbuild.exceptions import QBError
 from quickbuild.helpers import response2py
 
 
@@ -227,6 +228,112 @@ class Tracker:
             callback=response2py,
         )
 
+    def iter_records(self,
+                     report_name: str,
+                     configuration_or_build_id: int,
+                     reportset: str,
+                     *,
+                     page_size: int = 500,
+                     concurrency: int = 4,
+                     filters: Optional[str] = None
+                     ) -> Iterator[dict]:
+        """
+        Iterate over all report records, number of records is requested once
+        by `get_records_size()`, then pages are requested concurrently by
+        `get_records_data()` and records are yielded in order.
+
+        For async client this is an async generator.
+
+        Example:
+
+        .. code-block:: python
+
+            tracker = client.reports.get_tracker('junit')
+
+            for record in tracker.iter_records('tests', 103, 'DEFAULT'):
+                print(record['testName'], record['status'])
+
+        Args:
+            report_name (str):
+                Specify the report name.
+
+            configuration_or_build_id (int):
+                Build id when report belongs to BUILD group, otherwise
+                configuration id.
+
+            reportset (str):
+                The report set or aggregation name.
+
+            page_size (int):
+                Number of records requested at once (default 500).
+
+            concurrency (int):
+                Number of pages requested at once (default 4).
+
+            filters (Optional[str]):
+                Specify filters based on SQL to filter the records, for example,
+                duration>5 and duration<10.
+
+        Returns:
+            Iterator[dict]: report records.
+
+        Raises:
+            QBError: invalid arguments or client content type is XML.
+        """
+        if page_size <= 0:
+            raise QBError('Invalid `page_size` argument must be > 0')
+
+        self.quickbuild._validate_concurrency(concurrency)
+
+        def fetch(offset: int, count: int) -> List[dict]:
+            return self.quickbuild._then(
+                self.get_records_data(
+                    report_name,
+                    configuration_or_build_id,
+                    reportset,
+                    offset=offset,
+                    limit=count,
+                    filters=filters,
+                ),
+                self._get_rows,
+            )
+
+        def get_size() -> int:
+            return self.quickbuild._then(
+                self.get_records_size(
+                    report_name,
+                    configuration_or_build_id,
+                    reportset,
+                    filters,
+                ),
+                int,
+            )
+
+        return self.quickbuild._paginate_offsets(
+            get_size,
+            fetch,
+            page_size,
+            concurrency=concurrency,
+        )
+
+    @staticmethod
+    def _get_rows(page: Any) -> List[dict]:
+        """
+        Get records of page, single record is converted to dict instead of
+        list by XML parser.
+        """
+        if isinstance(page, list):
+            return page
+
+        if not isinstance(page, dict):
+            raise QBError('Records iteration requires PARSE or JSON content type')
+
+        rows = page.get('row') or []
+        if isinstance(rows, dict):
+            return [rows]
+
+        return rows
+
 
 class Reports:
     """
@@ -0,0 +1,222 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from quickbuild.exceptions import QBError, QBNotFoundError
+from quickbuild.models import BuildReference
+
+DEPENDENCIES = 'dependencies'
+DEPENDENTS = 'dependents'
+
+DIRECTIONS = {
+    DEPENDENCIES: (DEPENDENCIES,),
+    DEPENDENTS: (DEPENDENTS,),
+    'both': (DEPENDENCIES, DEPENDENTS),
+}
+
+
+class BuildGraph:
+    """
+    Graph of builds and their dependencies, edges are kept as adjacency lists
+    in both directions: `dependencies` maps build id to ids of builds it
+    depends on, `dependents` maps build id to ids of builds depending on it.
+
+    Usually it's created by `client.builds.get_graph()`.
+
+    Example:
+
+    .. code-block:: python
+
+        graph = client.builds.get_graph(123, direction='dependents')
+
+        impact = graph.get_dependents(123, transitive=True)
+        for build_id in graph.topological_order():
+            print(build_id, graph.nodes[build_id].version)
+    """
+    def __init__(self) -> None:
+        self.nodes = {}  # type: Dict[int, BuildReference]
+        self.dependencies = {}  # type: Dict[int, List[int]]
+        self.dependents = {}  # type: Dict[int, List[int]]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, build_id: object) -> bool:
+        return build_id in self.nodes
+
+    def add_node(self, build: BuildReference) -> None:
+        """
+        Add build, known details of build are kept.
+        """
+        node = self.nodes.setdefault(build.id, build)
+        if node.version is None and build.version is not None:
+            self.nodes[build.id] = build
+
+        self.dependencies.setdefault(build.id, [])
+        self.dependents.setdefault(build.id, [])
+
+    def add_edge(self, build_id: int, dependency_id: int) -> None:
+        """
+        Add dependency of build.
+        """
+        self.add_node(BuildReference(build_id))
+        self.add_node(BuildReference(dependency_id))
+
+        if dependency_id not in self.dependencies[build_id]:
+            self.dependencies[build_id].append(dependency_id)
+            self.dependents[dependency_id].append(build_id)
+
+    def update(self, direction: str, build_id: int, builds: Any) -> None:
+        """
+        Add result of `builds.get_dependencies()` or `builds.get_dependents()`.
+        """
+        if not isinstance(builds, list):
+            raise QBError('Build graph requires PARSE or JSON content type')
+
+        self.add_node(BuildReference(build_id))
+
+        for build in builds:
+            self.add_node(build)
+
+            if direction == DEPENDENCIES:
+                self.add_edge(build_id, build.id)
+            else:
+                self.add_edge(build.id, build_id)
+
+    def _check(self, build_id: int) -> None:
+        if build_id not in self.nodes:
+            raise QBNotFoundError('Build {} is not in the graph'.format(build_id))
+
+    def _walk(self, adjacency: Dict[int, List[int]], build_id: int, transitive: bool) -> List[int]:
+        self._check(build_id)
+
+        if not transitive:
+            return list(adjacency[build_id])
+
+        visited = {build_id}
+        result = []
+        queue = list(adjacency[build_id])
+
+        # breadth-first, so nearest builds go first
+        for current_id in queue:
+            if current_id in visited:
+                continue
+
+            visited.add(current_id)
+            result.append(current_id)
+            queue.extend(adjacency[current_id])
+
+        return result
+
+    def get_dependencies(self, build_id: int, *, transitive: bool = False) -> List[int]:
+        """
+        Get ids of builds which build depends on.
+
+        Args:
+            build_id (int):
+                Build identifier.
+
+            transitive (bool):
+                If set, dependencies of dependencies are included too.
+
+        Returns:
+            List[int]: dependency ids, nearest go first.
+
+        Raises:
+            QBNotFoundError: build is not in the graph.
+        """
+        return self._walk(self.dependencies, build_id, transitive)
+
+    def get_dependents(self, build_id: int, *, transitive: bool = False) -> List[int]:
+        """
+        Get ids of builds which depend on build, transitive dependents are
+        builds affected by build, e.g. by its promotion.
+
+        Args:
+            build_id (int):
+                Build identifier.
+
+            transitive (bool):
+                If set, dependents of dependents are included too.
+
+        Returns:
+            List[int]: dependent ids, nearest go first.
+
+        Raises:
+            QBNotFoundError: build is not in the graph.
+        """
+        return self._walk(self.dependents, build_id, transitive)
+
+    def find_cycle(self) -> Optional[List[int]]:
+        """
+        Find dependency cycle.
+
+        Returns:
+            Optional[List[int]]: ids of builds forming a cycle, where each
+            build depends on the next one and the last one depends on the
+            first one, or None if there are no cycles.
+        """
+        done = set()  # type: Set[int]
+
+        for root_id in sorted(self.nodes):
+            if root_id in done:
+                continue
+
+            path = [root_id]
+            on_path = {root_id}
+            stack = [iter(self.dependencies[root_id])]
+
+            while stack:
+                dependency_id = next(stack[-1], None)
+
+                if dependency_id is None:
+                    stack.pop()
+                    finished_id = path.pop()
+                    on_path.discard(finished_id)
+                    done.add(finished_id)
+                    continue
+
+                if dependency_id in on_path:
+                    return path[path.index(dependency_id):]
+
+                if dependency_id not in done:
+                    path.append(dependency_id)
+                    on_path.add(dependency_id)
+                    stack.append(iter(self.dependencies[dependency_id]))
+
+        return None
+
+    def topological_order(self) -> List[int]:
+        """
+        Order builds so dependencies go before builds depending on them.
+
+        Returns:
+            List[int]: build ids.
+
+        Raises:
+            QBError: graph has dependency cycle.
+        """
+        remaining = {i: len(dependencies) for i, dependencies in self.dependencies.items()}
+        ready = sorted(i for i, count in remaining.items() if count == 0)
+        order = []
+
+        for build_id in ready:
+            order.append(build_id)
+
+            for dependent_id in self.dependents[build_id]:
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    ready.append(dependent_id)
+
+        if len(order) != len(self.nodes):
+            raise QBError('Dependency cycle of builds: {}'.format(self.find_cycle()))
+
+        return order
+
+
+def get_crawl_roots(build_ids: Iterable[int], direction: str) -> List[Any]:
+    """
+    Get items of crawl, each item is pair of direction and build id.
+    """
+    if direction not in DIRECTIONS:
+        raise QBError('Invalid `direction` argument must be one of: ' + ', '.join(DIRECTIONS))
+
+    return [(item, build_id) for build_id in build_ids for item in DIRECTIONS[direction]]
@@ -1,10 +1,12 @@
+from datetime import datetime
 from enum import Enum
-from typing import Any
-from xml.parsers.expat import ExpatError
-
-import xmltodict
+from typing import Any, Dict, List, Optional, Union
+from xml.parsers.expat import ExpatError, ParserCreate
 
 CLASS_KEYWORD = '@class'
+CLASS_PREFIX = 'com.pmease.quickbuild'
+LIST_KEYWORD = 'list'
+TEXT_KEYWORD = '#text'
 
 
 class ContentType(Enum):
@@ -12,105 +14,217 @@ class ContentType(Enum):
     - PARSE: get XML and parse it to native Python types
     - XML: get and post native XML documents
     - JSON: get and post native JSON documents (QuickBuild 10+)
+    - RAW: get undecoded response body as bytes, post native XML documents
+    - RECORDS: the same as PARSE, but builds, audits, changesets and
+      measurements are returned as compact records instead of dicts
     """
     PARSE = 1
     XML = 2
     JSON = 3
+    RAW = 4
+    RECORDS = 5
 
     _DEFAULT = PARSE
 
 
-def response2py(obj: Any, content_type: ContentType) -> Any:
+def response2py(obj: Any, content_type: Optional[ContentType]) -> Any:
     """
     Smart and heuristic response converter to native python types.
 
     It`s much more convenient to work with native types instead of parsed XML
     which in strings inside. Also the main goal is to be equal with native json
     response from QuickBuild when used to be consistend in different versions.
+
+    UTF-8 encoded bytes are accepted too, so XML parser consumes response body
+    without decoding.
     """
-    if content_type == content_type.XML:
+    if content_type == ContentType.RAW:
         return obj
 
-    if obj == '':
+    if content_type == ContentType.XML:
+        return _to_str(obj)
+
+    if obj in ('', b''):
         return None
 
     try:
         # let's suppose it could be an XML document
-        obj = xmltodict.parse(obj)
+        return _XMLConverter().parse(obj)
     except ExpatError:
         pass
 
-    # case №1 - some primitive, like integer
-    if isinstance(obj, dict) is False:
-        return _to_python(obj)
+    # some primitive, like integer
+    return _to_int(_to_str(obj))
 
-    # case №2 - one object
-    if 'list' not in obj:
-        key = next(iter(obj))
-        new_obj = obj[key]
-        new_obj[CLASS_KEYWORD] = key
-        return _to_python(new_obj)
 
-    # case №3 - list of objects
-    obj = obj['list']
-    if obj is None:
-        return []
+def _to_str(obj: Any) -> Any:
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', 'replace')
 
-    return _to_python(obj, to_list=True)
+    return obj
 
 
-def _to_python(obj: Any, to_list: bool = False) -> Any:
-    # pylint: disable=R0912
+def _to_int(obj: Any) -> Any:
+    if isinstance(obj, str) and obj.isdigit():
+        return int(obj)
 
-    if isinstance(obj, str):
-        if obj.isdigit():
-            return int(obj)
+    return obj
 
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            obj[i] = _to_python(v)
-        return obj
 
-    if isinstance(obj, dict) is False:
-        return obj
+def parse_date(value: Any) -> Optional[float]:
+    """
+    Convert date of QuickBuild XML/JSON document to timestamp, dates are ISO
+    8601 strings or numbers of milliseconds since epoch.
 
-    if list(obj.keys())[0].startswith('com.pmease.quickbuild') or to_list:
-        new_obj = []
-
-        for k, v in obj.items():
-            if isinstance(v, list):
-                for item in v:
-                    item = _to_python(item)
-                    if isinstance(item, dict):
-                        item[CLASS_KEYWORD] = k
-                    new_obj.append(_to_python(item))
-            elif isinstance(v, dict):
-                v[CLASS_KEYWORD] = k
-                new_obj.append(_to_python(v))
-            else:
-                new_obj.append(_to_python(v))
-
-        return new_obj
-
-    orig, obj = obj, {}
-
-    for k, v in orig.items():
-        # make more json similar
-        if k.startswith('@') and k != CLASS_KEYWORD:
-            k = k[1:]
-
-        if isinstance(v, (dict, list)):
-            obj[k] = _to_python(v)
-        elif isinstance(v, str) is False:
-            obj[k] = v
-            continue
-        elif v == 'true':
-            obj[k] = True
-        elif v == 'false':
-            obj[k] = False
-        elif v.isdigit():
-            obj[k] = int(v)
+    Returns None if value is not a date.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000
+
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+class _Element:
+
+    __slots__ = ('name', 'children', 'text')
+
+    def __init__(self, name: str, attributes: List[str]) -> None:
+        self.name = name
+        self.text = []  # type: List[str]
+
+        # children values are grouped by tag name in order of first occurrence,
+        # attributes go first with `@` prefix, as xmltodict used to do it
+        self.children = {}  # type: Dict[str, List[Any]]
+        for i in range(0, len(attributes), 2):
+            self.children['@' + attributes[i]] = [attributes[i + 1]]
+
+
+class _XMLConverter:
+    """
+    Single pass XML to native Python types converter based on expat.
+
+    Each element is converted right on its closing tag, scalar values are left
+    as raw strings until parent element is closed, because conversion of them
+    depends on parent (bool values are converted only inside objects, and
+    repeated elements become lists).
+    """
+    def __init__(self) -> None:
+        self.stack = []  # type: List[_Element]
+        self.result = None  # type: Any
+
+    def parse(self, document: Union[str, bytes]) -> Any:
+        parser = ParserCreate('utf-8')
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._characters
+
+        # do not expand entities declared in DTD
+        parser.DefaultHandler = lambda _: None
+        parser.ExternalEntityRefHandler = lambda *_: 1
+
+        if isinstance(document, str):
+            document = document.encode('utf-8')
+
+        parser.Parse(document, True)
+        return self.result
+
+    def _start(self, name: str, attributes: List[str]) -> None:
+        self.stack.append(_Element(name, attributes))
+
+    def _characters(self, data: str) -> None:
+        self.stack[-1].text.append(data)
+
+    def _end(self, name: str) -> None:
+        element = self.stack.pop()
+        text = ''.join(element.text).strip() or None
+
+        if element.children and text:
+            element.children[TEXT_KEYWORD] = [text]
+
+        if not self.stack:
+            self.result = self._convert_root(element, text)
+            return
+
+        if element.children:
+            value = self._convert(element.children)  # type: Any
         else:
-            obj[k] = v
+            value = text
 
-    return obj
+        self.stack[-1].children.setdefault(name, []).append(value)
+
+    def _convert_root(self, element: _Element, text: Optional[str]) -> Any:
+        if element.name == LIST_KEYWORD:
+            if not element.children:
+                return [] if text is None else _to_int(text)
+            return self._convert(element.children, to_list=True)
+
+        if not element.children:
+            return _to_int(text)
+
+        return self._classify(element.name, self._convert(element.children))
+
+    @staticmethod
+    def _classify(name: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            value[CLASS_KEYWORD] = name
+        elif isinstance(value, list):
+            value.append(name)
+        else:
+            value = _to_int(value)
+
+        return value
+
+    def _convert(self, children: Dict[str, List[Any]], to_list: bool = False) -> Any:
+        if to_list or next(iter(children)).startswith(CLASS_PREFIX):
+            return self._convert_list(children)
+
+        return self._convert_dict(children)
+
+    def _convert_list(self, children: Dict[str, List[Any]]) -> List[Any]:
+        new_list = []  # type: List[Any]
+
+        for key, values in children.items():
+            if len(values) == 1:
+                new_list.append(self._classify(key, values[0]))
+                continue
+
+            for value in values:
+                value = _to_int(value)
+                if isinstance(value, dict):
+                    value[CLASS_KEYWORD] = key
+                new_list.append(value)
+
+        return new_list
+
+    @staticmethod
+    def _convert_dict(children: Dict[str, List[Any]]) -> Dict[str, Any]:
+        obj = {}  # type: Dict[str, Any]
+
+        for key, values in children.items():
+            # make more json similar
+            if key.startswith('@') and key != CLASS_KEYWORD:
+                key = key[1:]
+
+            if len(values) > 1:
+                obj[key] = [_to_int(v) for v in values]
+                continue
+
+            value = values[0]
+
+            if not isinstance(value, str):
+                obj[key] = value
+            elif value == 'true':
+                obj[key] = True
+            elif value == 'false':
+                obj[key] = False
+            elif value.isdigit():
+                obj[key] = int(value)
+            else:
+                obj[key] = value
+
+        return obj
@@ -0,0 +1,171 @@
+import time
+
+from typing import Any, Callable, List, NamedTuple
+
+from quickbuild.exceptions import QBError
+
+RequestMetrics = NamedTuple(
+    'RequestMetrics', [
+        ('method', str),
+        ('path', str),
+        ('status', int),
+        ('size', int),
+        ('network_time', float),
+        ('parse_time', float),
+        ('retries', int),
+    ]
+)
+
+MetricsHook = Callable[[RequestMetrics], None]
+
+# constant segments of REST paths, any other segment is identifier or name
+# given by caller, e.g. configuration path or build agent address
+PATH_SEGMENTS = frozenset((
+    'active', 'audits', 'authorizations', 'authorize', 'available',
+    'average_duration', 'backup', 'begin_date', 'build', 'build_requests',
+    'buildagents', 'builds', 'buildstats', 'changes', 'cloud_profiles',
+    'commits', 'configurations', 'copy', 'count', 'dashboards',
+    'dependencies', 'dependents', 'description', 'display_name', 'duration',
+    'error_message', 'files', 'grid', 'group_shares', 'groups', 'ids',
+    'inactive', 'issues', 'measurements', 'memberships', 'meta', 'name',
+    'notifications', 'parent', 'path', 'pause', 'paused', 'records',
+    'reports', 'reportsets', 'repositories', 'request_id', 'resources',
+    'resume', 'run_mode', 'running_steps', 'schedule', 'size', 'stats',
+    'status', 'steps', 'success_rate', 'system_attributes', 'tokens', 'total',
+    'trigger', 'unauthorize', 'unauthorized', 'user_attributes',
+    'user_shares', 'users', 'version',
+))
+
+
+def path_template(path: str) -> str:
+    """
+    Replace identifiers and names in REST path, so requests to the same
+    endpoint could be aggregated and number of distinct paths is bounded,
+    e.g. `builds/1/status` -> `builds/{id}/status`,
+    `buildagents/agent:8811/running_steps` -> `buildagents/{name}/running_steps`.
+
+    Names could contain slashes, e.g. configuration paths, so adjacent name
+    segments are replaced at once.
+    """
+    segments = []  # type: List[str]
+
+    for segment in path.split('/'):
+        if segment.isdigit():
+            segment = '{id}'
+        elif segment not in PATH_SEGMENTS:
+            segment = '{name}'
+            if segments and segments[-1] == segment:
+                continue
+
+        segments.append(segment)
+
+    return '/'.join(segments)
+
+
+class PrometheusHook:
+    """
+    Metrics hook which exposes Prometheus counters and histograms, requires
+    `prometheus_client` package.
+
+    Example:
+
+    .. code-block:: python
+
+        client = QBClient('http://server')
+        client.add_hook(PrometheusHook())
+
+    Args:
+        registry (Optional[prometheus_client.CollectorRegistry]):
+            Registry of metrics (default global registry).
+
+        namespace (str):
+            Prefix of metric names (default `quickbuild`).
+    """
+    def __init__(self, registry: Any = None, namespace: str = 'quickbuild') -> None:
+        try:
+            import prometheus_client  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise QBError('PrometheusHook requires prometheus_client package') from e
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+
+        labels = ('method', 'path', 'status')
+        options = dict(namespace=namespace, registry=registry)
+
+        self.requests = prometheus_client.Counter(
+            'requests', 'Number of requests.', labels, **options
+        )
+        self.bytes = prometheus_client.Counter(
+            'response_bytes', 'Size of response bodies.', labels, **options
+        )
+        self.retries = prometheus_client.Counter(
+            'retries', 'Number of retried attempts.', labels, **options
+        )
+        self.network_time = prometheus_client.Histogram(
+            'network_seconds', 'Time of request and response download.', labels, **options
+        )
+        self.parse_time = prometheus_client.Histogram(
+            'parse_seconds', 'Time of response parsing.', labels, **options
+        )
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        labels = (metrics.method, metrics.path, str(metrics.status))
+
+        self.requests.labels(*labels).inc()
+        self.bytes.labels(*labels).inc(metrics.size)
+        self.network_time.labels(*labels).observe(metrics.network_time)
+        self.parse_time.labels(*labels).observe(metrics.parse_time)
+
+        if metrics.retries:
+            self.retries.labels(*labels).inc(metrics.retries)
+
+
+class OpenTelemetryHook:
+    """
+    Metrics hook which records OpenTelemetry client span for each request,
+    requires `opentelemetry-api` package.
+
+    Span is created after response is processed, its start time is computed
+    from measured durations.
+
+    Args:
+        tracer (Optional[opentelemetry.trace.Tracer]):
+            Tracer to use (default tracer of global provider).
+    """
+    def __init__(self, tracer: Any = None) -> None:
+        try:
+            from opentelemetry import \
+                trace  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise QBError('OpenTelemetryHook requires opentelemetry-api package') from e
+
+        if tracer is None:
+            tracer = trace.get_tracer('quickbuild')
+
+        self.tracer = tracer
+        self._trace = trace
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        end = time.time_ns()
+        start = end - int((metrics.network_time + metrics.parse_time) * 1e9)
+
+        span = self.tracer.start_span(
+            '{} {}'.format(metrics.method, metrics.path),
+            kind=self._trace.SpanKind.CLIENT,
+            start_time=start,
+            attributes={
+                'http.request.method': metrics.method,
+                'http.route': metrics.path,
+                'http.response.status_code': metrics.status,
+                'http.response.body.size': metrics.size,
+                'http.request.resend_count': metrics.retries,
+                'quickbuild.network_time': metrics.network_time,
+                'quickbuild.parse_time': metrics.parse_time,
+            },
+        )
+
+        if metrics.status >= 400:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+
+        span.end(end_time=end)
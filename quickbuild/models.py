@@ -0,0 +1,265 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from quickbuild.exceptions import QBError, QBNotFoundError
+from quickbuild.helpers import CLASS_KEYWORD
+
+STEP_PATH_SEPARATOR = '>'
+
+# scalar values of documents which are kept in `properties`
+SCALAR_TYPES = (str, int, float, bool)
+
+
+def _as_list(value: Any) -> List[Any]:
+    """
+    Single element is converted to dict instead of list by XML parser.
+    """
+    if value is None:
+        return []
+
+    if isinstance(value, list):
+        return value
+
+    return [value]
+
+
+def _get_kind(document: dict) -> Optional[str]:
+    """
+    Get short class name of document, e.g. `SequentialStep`.
+    """
+    class_name = document.get(CLASS_KEYWORD)
+    if class_name is None:
+        return None
+
+    return class_name.rsplit('.', 1)[-1]
+
+
+def _get_properties(document: dict, known: tuple) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in document.items()
+        if key not in known and key != CLASS_KEYWORD and isinstance(value, SCALAR_TYPES)
+    }
+
+
+class Step:
+    """
+    Build step, scalar settings of step, e.g. `command` of command line step,
+    are kept in `properties`.
+    """
+    __slots__ = (
+        'name',
+        'kind',
+        'enabled',
+        'path',
+        'properties',
+        'parent',
+        'children',
+    )
+
+    KNOWN = ('name', 'enabled', 'path', 'childStepNames')
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 name: str,
+                 kind: Optional[str],
+                 enabled: bool,
+                 path: str,
+                 properties: Dict[str, Any]
+                 ) -> None:
+        self.name = name
+        self.kind = kind
+        self.enabled = enabled
+        self.path = path
+        self.properties = properties
+        self.parent = None  # type: Optional[Step]
+        self.children = []  # type: List[Step]
+
+    def __repr__(self) -> str:
+        return 'Step({!r})'.format(self.path)
+
+    @classmethod
+    def from_document(cls, document: dict) -> 'Step':
+        elements = _as_list((document.get('path') or {}).get('elements'))
+        names = [element['stepName'] for element in elements if isinstance(element, dict)]
+
+        return cls(
+            document['name'],
+            _get_kind(document),
+            document.get('enabled', True),
+            STEP_PATH_SEPARATOR.join(names or [document['name']]),
+            _get_properties(document, cls.KNOWN),
+        )
+
+
+class StepTree:
+    """
+    Tree of build steps with parent links, steps are indexed by path, e.g.
+    `master>build`, and by name.
+
+    Example:
+
+    .. code-block:: python
+
+        steps = client.builds.get_steps(1)
+
+        step = steps.get('build')
+        print(step.parent.name, [child.name for child in step.children])
+
+    Args:
+        steps (List[dict]):
+            Parsed steps of `builds/{id}/steps` document.
+    """
+    __slots__ = ('roots', '_paths', '_names')
+
+    def __init__(self, steps: List[dict]) -> None:
+        self.roots = []  # type: List[Step]
+        self._paths = {}  # type: Dict[str, Step]
+        self._names = {}  # type: Dict[str, Step]
+
+        for document in _as_list(steps):
+            step = Step.from_document(document)
+            self._paths[step.path] = step
+            self._names.setdefault(step.name, step)
+
+        for step in self._paths.values():
+            parent_path = step.path.rpartition(STEP_PATH_SEPARATOR)[0]
+            parent = self._paths.get(parent_path) if parent_path else None
+
+            if parent is None:
+                self.roots.append(step)
+            else:
+                step.parent = parent
+                parent.children.append(step)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[Step]:
+        return iter(self._paths.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def get(self, name: str) -> Step:
+        """
+        Get step by name, the first one is returned if several steps have the
+        same name.
+
+        Raises:
+            QBNotFoundError: there is no step with such name.
+        """
+        try:
+            return self._names[name]
+        except KeyError:
+            raise QBNotFoundError('Step {} is not found'.format(name)) from None
+
+    def get_by_path(self, path: str) -> Step:
+        """
+        Get step by path, e.g. `master>build`.
+
+        Raises:
+            QBNotFoundError: there is no step with such path.
+        """
+        try:
+            return self._paths[path]
+        except KeyError:
+            raise QBNotFoundError('Step {} is not found'.format(path)) from None
+
+
+class Repository:
+    """
+    Build repository, scalar settings of repository, e.g. `url`, are kept in
+    `properties`.
+    """
+    __slots__ = ('name', 'kind', 'properties')
+
+    KNOWN = ('name',)
+
+    def __init__(self, name: str, kind: Optional[str], properties: Dict[str, Any]) -> None:
+        self.name = name
+        self.kind = kind
+        self.properties = properties
+
+    def __repr__(self) -> str:
+        return 'Repository({!r})'.format(self.name)
+
+    @classmethod
+    def from_document(cls, document: dict) -> 'Repository':
+        return cls(
+            document['name'],
+            _get_kind(document),
+            _get_properties(document, cls.KNOWN),
+        )
+
+
+class BuildReference:
+    """
+    Brief info of dependency or dependent build.
+    """
+    __slots__ = ('id', 'configuration', 'version', 'status')
+
+    def __init__(self,
+                 build_id: int,
+                 configuration: Optional[int] = None,
+                 version: Optional[str] = None,
+                 status: Optional[str] = None
+                 ) -> None:
+        self.id = build_id
+        self.configuration = configuration
+        self.version = version
+        self.status = status
+
+    def __repr__(self) -> str:
+        return 'BuildReference({!r})'.format(self.id)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BuildReference) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @classmethod
+    def from_document(cls, document: Any) -> 'BuildReference':
+        # document could be plain build identifier
+        if not isinstance(document, dict):
+            return cls(int(document))
+
+        return cls(
+            document['id'],
+            document.get('configuration'),
+            document.get('version'),
+            document.get('status'),
+        )
+
+
+def _is_document(result: Any) -> bool:
+    """
+    XML string and raw bytes are returned as is.
+    """
+    if isinstance(result, (str, bytes)):
+        return False
+
+    if result is not None and not isinstance(result, (list, dict)):
+        raise QBError('Unexpected document: {!r}'.format(result))
+
+    return True
+
+
+def parse_steps(result: Any) -> Union[StepTree, str, bytes]:
+    if not _is_document(result):
+        return result
+
+    return StepTree(result)
+
+
+def parse_repositories(result: Any) -> Union[List[Repository], str, bytes]:
+    if not _is_document(result):
+        return result
+
+    return [Repository.from_document(document) for document in _as_list(result)]
+
+
+def parse_builds(result: Any) -> Union[List[BuildReference], str, bytes]:
+    if not _is_document(result):
+        return result
+
+    return [BuildReference.from_document(document) for document in _as_list(result)]
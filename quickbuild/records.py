@@ -0,0 +1,245 @@
+import sys
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from quickbuild.exceptions import QBError
+from quickbuild.helpers import ContentType, response2py
+
+# field is defined by key of document, attribute name and value converter
+Field = Tuple[str, str, Optional[Callable[[Any], Any]]]
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() == 'true'
+
+    return bool(value)
+
+
+def _intern(value: Any) -> Any:
+    """
+    Values like status or user name repeat in almost every record, so only
+    one copy of each of them is kept.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+
+    return value
+
+
+class Record(Mapping):
+    """
+    Compact read-only record of document, values are kept in `__slots__`
+    instead of dict and converted to declared types.
+
+    Fields are available as attributes in snake case and by keys of original
+    document, so record could be used instead of dict:
+
+    .. code-block:: python
+
+        build.begin_date == build['beginDate']
+
+    Elements of document which aren't declared as fields are not kept, e.g.
+    step runtimes of builds, use PARSE content type to get them.
+    """
+    __slots__ = ()
+
+    FIELDS = ()  # type: Tuple[Field, ...]
+
+    # document key mapped to attribute name
+    _KEYS = {}  # type: Dict[str, str]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._KEYS = {key: attribute for key, attribute, _ in cls.FIELDS}
+
+    @classmethod
+    def from_document(cls, document: dict) -> 'Record':
+        record = cls.__new__(cls)
+
+        for key, attribute, convert in cls.FIELDS:
+            value = document.get(key)
+            if value is not None and convert is not None:
+                value = convert(value)
+            setattr(record, attribute, value)
+
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            attribute = self._KEYS[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+        return getattr(self, attribute)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(attribute, getattr(self, attribute))
+                      for _, attribute, _ in self.FIELDS),
+        )
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, attribute) for _, attribute, _ in self.FIELDS)
+
+    def __setstate__(self, state: tuple) -> None:
+        for (_, attribute, _), value in zip(self.FIELDS, state):
+            setattr(self, attribute, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get record as dict with keys of original document.
+        """
+        return dict(self.items())
+
+
+class BuildRecord(Record):
+    __slots__ = (
+        'id',
+        'configuration',
+        'version',
+        'requester',
+        'scheduled',
+        'status',
+        'status_date',
+        'begin_date',
+        'duration',
+        'wait_duration',
+    )
+
+    FIELDS = (
+        ('id', 'id', int),
+        ('configuration', 'configuration', int),
+        ('version', 'version', str),
+        ('requester', 'requester', int),
+        ('scheduled', 'scheduled', _to_bool),
+        ('status', 'status', _intern),
+        ('statusDate', 'status_date', str),
+        ('beginDate', 'begin_date', str),
+        ('duration', 'duration', int),
+        ('waitDuration', 'wait_duration', int),
+    )
+
+
+class AuditRecord(Record):
+    __slots__ = ('id', 'user', 'source', 'timestamp', 'configuration', 'action')
+
+    FIELDS = (
+        ('id', 'id', int),
+        ('user', 'user', _intern),
+        ('source', 'source', _intern),
+        ('timestamp', 'timestamp', str),
+        ('configuration', 'configuration', int),
+        ('action', 'action', _intern),
+    )
+
+
+class ModificationRecord(Record):
+    __slots__ = ('action', 'path', 'edition', 'previous_edition', 'additional')
+
+    FIELDS = (
+        ('action', 'action', _intern),
+        ('path', 'path', str),
+        ('edition', 'edition', None),
+        ('previousEdition', 'previous_edition', None),
+        ('additional', 'additional', None),
+    )
+
+
+def _parse_modifications(value: Any) -> List[ModificationRecord]:
+    # XML document has `modification` elements inside `modifications`
+    if isinstance(value, dict):
+        value = value.get('modification')
+
+    return parse_records(ModificationRecord, value)
+
+
+class ChangesetRecord(Record):
+    __slots__ = (
+        'id',
+        'user',
+        'date',
+        'comment',
+        'repository_name',
+        'repository_type',
+        'additional',
+        'build_id',
+        'modifications',
+    )
+
+    FIELDS = (
+        # revision could be number or hash depending on repository type
+        ('id', 'id', None),
+        ('user', 'user', _intern),
+        ('date', 'date', str),
+        ('comment', 'comment', str),
+        ('repositoryName', 'repository_name', _intern),
+        ('repositoryType', 'repository_type', _intern),
+        ('additional', 'additional', None),
+        ('buildId', 'build_id', int),
+        ('modifications', 'modifications', _parse_modifications),
+    )
+
+
+class MeasurementRecord(Record):
+    __slots__ = ('id', 'timestamp', 'source', 'metric_name', 'value')
+
+    FIELDS = (
+        ('id', 'id', int),
+        ('timestamp', 'timestamp', int),
+        ('source', 'source', _intern),
+        ('metricName', 'metric_name', _intern),
+        ('value', 'value', float),
+    )
+
+
+def parse_records(record_type: Type[Record], result: Any) -> List[Any]:
+    """
+    Convert parsed documents to records.
+
+    Raises:
+        QBError: result is not a list of documents.
+    """
+    if result is None:
+        return []
+
+    # single element is converted to dict instead of list by XML parser
+    if isinstance(result, dict):
+        result = [result]
+
+    if not isinstance(result, list):
+        raise QBError('Unexpected document: {!r}'.format(result))
+
+    # documents are replaced in place, so each dict is released as soon as
+    # it's converted and peak memory doesn't hold both dicts and records
+    for i, document in enumerate(result):
+        if not isinstance(document, dict):
+            raise QBError('Unexpected document: {!r}'.format(document))
+
+        result[i] = record_type.from_document(document)
+
+    return result
+
+
+def response2records(obj: Any,
+                     content_type: Optional[ContentType],
+                     record_type: Type[Record]
+                     ) -> Any:
+    """
+    The same as `response2py`, but documents are converted to records for
+    RECORDS content type.
+    """
+    result = response2py(obj, content_type)
+
+    if content_type != ContentType.RECORDS:
+        return result
+
+    return parse_records(record_type, result)
@@ -0,0 +1,300 @@
+import json
+import os
+import sqlite3
+
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from quickbuild.exceptions import QBError
+from quickbuild.helpers import parse_date
+
+HighWaterMark = NamedTuple(
+    'HighWaterMark', [
+        ('count', int),
+        ('timestamp', float),
+        ('ids', List[int]),
+    ]
+)
+
+
+class MarkStore:
+    """
+    Storage of audit tailer position, mark is kept in memory only, so tailing
+    starts from scratch in each process.
+    """
+    def __init__(self) -> None:
+        self._mark = None  # type: Optional[HighWaterMark]
+
+    def load(self) -> Optional[HighWaterMark]:
+        """
+        Load saved mark, None is returned if there is no mark yet.
+        """
+        return self._mark
+
+    def save(self, mark: HighWaterMark) -> None:
+        """
+        Save mark after new audits are fetched.
+        """
+        self._mark = mark
+
+
+class FileMarkStore(MarkStore):
+    """
+    Mark store which keeps mark in JSON file, file is replaced atomically.
+
+    Args:
+        path (str):
+            Path of JSON file.
+    """
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+    def load(self) -> Optional[HighWaterMark]:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        return HighWaterMark(data['count'], data['timestamp'], data['ids'])
+
+    def save(self, mark: HighWaterMark) -> None:
+        temporary = self.path + '.tmp'
+
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(mark._asdict(), file)
+
+        os.replace(temporary, self.path)
+
+
+class SQLiteMarkStore(MarkStore):
+    """
+    Mark store which keeps marks in SQLite database, so several tailers
+    could share one database.
+
+    Args:
+        path (str):
+            Path of database file.
+
+        name (str):
+            Name of tailer mark (default `audits`).
+    """
+    def __init__(self, path: str, name: str = 'audits') -> None:
+        super().__init__()
+        self.path = path
+        self.name = name
+
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS marks ('
+            'name TEXT PRIMARY KEY, count INTEGER, timestamp REAL, ids TEXT)'
+        )
+
+    def _execute(self, query: str, *args: Any) -> Optional[tuple]:
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                return connection.execute(query, args).fetchone()
+        finally:
+            connection.close()
+
+    def load(self) -> Optional[HighWaterMark]:
+        row = self._execute('SELECT count, timestamp, ids FROM marks WHERE name = ?', self.name)
+        if row is None:
+            return None
+
+        return HighWaterMark(row[0], row[1], json.loads(row[2]))
+
+    def save(self, mark: HighWaterMark) -> None:
+        self._execute(
+            'INSERT OR REPLACE INTO marks VALUES (?, ?, ?, ?)',
+            self.name,
+            mark.count,
+            mark.timestamp,
+            json.dumps(mark.ids),
+        )
+
+
+class BaseAuditTailer:
+    """
+    Common state of audit tailers, which doesn't depend on client type.
+    """
+    def __init__(self,
+                 client: Any,
+                 store: Optional[MarkStore] = None,
+                 *,
+                 page_size: int = 100,
+                 since: Optional[datetime] = None,
+                 username: Optional[str] = None,
+                 source: Optional[str] = None,
+                 action: Optional[str] = None
+                 ) -> None:
+        if page_size <= 0:
+            raise QBError('Invalid `page_size` argument must be > 0')
+
+        self.client = client
+        self.store = store or MarkStore()
+        self.page_size = page_size
+        self.since = None if since is None else since.timestamp()
+        self.filters = dict(username=username, source=source, action=action)
+
+        self._mark = self.store.load()
+        self._audits = {}  # type: Dict[int, Tuple[float, dict]]
+
+    def _begin(self, count: int) -> bool:
+        """
+        Start poll, returns false if total count of audits is the same as on
+        previous poll, so there is nothing to request.
+        """
+        self._audits = {}
+        return self._mark is None or self._mark.count != count
+
+    def _get_page(self, first: int) -> Any:
+        return self.client.audits.get(self.page_size, first=first, **self.filters)
+
+    def _collect(self, page: Any) -> bool:
+        """
+        Collect new audits from page, audits are returned from newest to
+        oldest, so returns false if older audits are reached.
+        """
+        if not isinstance(page, list):
+            raise QBError('Audit tailer requires PARSE or JSON content type')
+
+        if self._mark is None:
+            start, seen = self.since, []  # type: Tuple[Optional[float], List[int]]
+        else:
+            start, seen = self._mark.timestamp, self._mark.ids
+
+        for audit in page:
+            timestamp = parse_date(audit.get('timestamp'))
+            if timestamp is None:
+                raise QBError('Unexpected audit timestamp: {!r}'.format(audit.get('timestamp')))
+
+            if start is not None and timestamp < start:
+                return False
+
+            if audit['id'] not in seen:
+                self._audits[audit['id']] = (timestamp, audit)
+
+        return len(page) == self.page_size
+
+    def _advance(self, count: int) -> List[dict]:
+        """
+        Save new mark and get collected audits from oldest to newest.
+        """
+        collected = sorted(self._audits.values(), key=lambda item: (item[0], item[1]['id']))
+        self._audits = {}
+
+        if collected:
+            timestamp = collected[-1][0]
+            ids = [audit['id'] for time, audit in collected if time == timestamp]
+
+            # audits of the same millisecond could be fetched by previous poll
+            if self._mark is not None and self._mark.timestamp == timestamp:
+                ids.extend(self._mark.ids)
+        elif self._mark is not None:
+            timestamp, ids = self._mark.timestamp, self._mark.ids
+        else:
+            timestamp, ids = self.since or 0.0, []
+
+        self._mark = HighWaterMark(count, timestamp, ids)
+        self.store.save(self._mark)
+
+        return [audit for _, audit in collected]
+
+
+class AuditTailer(BaseAuditTailer):
+    """
+    Fetch only new audits on each poll, position is kept as high-water mark:
+    total count of audits, timestamp of the newest audit and ids of audits
+    with this timestamp.
+
+    Count of audits matched by filters is requested first and audits aren't
+    requested at all if it hasn't changed, otherwise pages of the newest
+    audits are requested until already seen audits are reached.
+
+    Count is a heuristic: if as many matched audits are deleted as created
+    between polls, new audits are returned by the first poll after count
+    changes.
+
+    Example:
+
+    .. code-block:: python
+
+        tailer = AuditTailer(client, FileMarkStore('audits.json'))
+
+        while True:
+            for audit in tailer.poll():
+                print(audit['timestamp'], audit['action'])
+
+            time.sleep(60)
+
+    Args:
+        client (QBClient):
+            Client instance.
+
+        store (Optional[MarkStore]):
+            Storage of mark, e.g. FileMarkStore or SQLiteMarkStore (default
+            in memory).
+
+        page_size (int):
+            Number of audits requested at once (default 100).
+
+        since (Optional[datetime]):
+            If there is no saved mark, older audits are skipped, otherwise all
+            existing audits are returned by the first poll.
+
+        username (Optional[str]):
+            Name of the user to audit.
+
+        source (Optional[str]):
+            Source of audit to match, * can be used for wildcard match.
+
+        action (Optional[str]):
+            Action of the audit to match.
+    """
+    def poll(self) -> List[dict]:
+        """
+        Fetch new audits.
+
+        Returns:
+            List[dict]: new audits from oldest to newest.
+        """
+        count = self.client.audits.count(**self.filters)
+        if not self._begin(count):
+            return []
+
+        first = 0
+        while self._collect(self._get_page(first)):
+            first += self.page_size
+
+        return self._advance(count)
+
+
+class AsyncAuditTailer(BaseAuditTailer):
+    """
+    Async version of AuditTailer, see its documentation.
+
+    Example:
+
+    .. code-block:: python
+
+        tailer = AsyncAuditTailer(client, SQLiteMarkStore('tailers.db'))
+        audits = await tailer.poll()
+    """
+    async def poll(self) -> List[dict]:
+        """
+        Fetch new audits.
+
+        Returns:
+            List[dict]: new audits from oldest to newest.
+        """
+        count = await self.client.audits.count(**self.filters)
+        if not self._begin(count):
+            return []
+
+        first = 0
+        while self._collect(await self._get_page(first)):
+            first += self.page_size
+
+        return self._advance(count)
@@ -0,0 +1,266 @@
+from typing import Dict, Iterator, List, Optional
+
+from quickbuild.exceptions import QBError, QBNotFoundError
+
+
+class ConfigurationTree:
+    """
+    Snapshot of configuration tree built from brief configurations list, all
+    lookups are made locally without requests to server.
+
+    Usually it's created by `client.configurations.get_tree()` and updated by
+    `client.configurations.refresh_tree()`.
+
+    Example:
+
+    .. code-block:: python
+
+        tree = client.configurations.get_tree()
+
+        for configuration_id in tree.iter_descendants(1):
+            print(tree.get_path(configuration_id))
+
+    Args:
+        configurations (List[dict]):
+            Configurations with `id`, `name` and `parent` (except root) keys,
+            e.g. result of `configurations.get()`.
+    """
+    def __init__(self, configurations: List[dict]) -> None:
+        if not isinstance(configurations, list):
+            raise QBError('Configuration tree requires PARSE or JSON content type')
+
+        self._configurations = {}  # type: Dict[int, dict]
+        self._children = {}  # type: Dict[Optional[int], List[int]]
+        self._paths = {}  # type: Dict[int, str]
+        self._ids = {}  # type: Dict[str, int]
+
+        for configuration in configurations:
+            self._link(configuration)
+
+        for root_id in self._children.get(None, []):
+            self._index(root_id)
+
+    def __len__(self) -> int:
+        return len(self._configurations)
+
+    def __contains__(self, configuration_id: object) -> bool:
+        return configuration_id in self._configurations
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._configurations.values())
+
+    def _link(self, configuration: dict) -> None:
+        self._configurations[configuration['id']] = configuration
+        self._children.setdefault(configuration.get('parent'), []).append(configuration['id'])
+
+    def _index(self, configuration_id: int) -> None:
+        """
+        Compute paths of configuration and its descendants, paths are unknown
+        if tree doesn't contain parent of configuration.
+        """
+        parent_id = self._configurations[configuration_id].get('parent')
+        if parent_id is not None and parent_id not in self._paths:
+            return
+
+        stack = [configuration_id]
+
+        while stack:
+            current_id = stack.pop()
+            configuration = self._configurations[current_id]
+
+            parent_id = configuration.get('parent')
+            if parent_id is None:
+                path = configuration['name']
+            else:
+                path = self._paths[parent_id] + '/' + configuration['name']
+
+            self._paths[current_id] = path
+            self._ids[path] = current_id
+
+            stack.extend(self._children.get(current_id, ()))
+
+    def _remove(self, configuration_id: int) -> None:
+        """
+        Remove configuration and its descendants.
+        """
+        stack = [configuration_id]
+
+        while stack:
+            current_id = stack.pop()
+            self._configurations.pop(current_id, None)
+            stack.extend(self._children.pop(current_id, ()))
+
+    def get(self, configuration_id: int) -> dict:
+        """
+        Get brief configuration info.
+
+        Args:
+            configuration_id (int):
+                Configuration identifier.
+
+        Returns:
+            dict: configuration info.
+
+        Raises:
+            QBNotFoundError: configuration is not in the tree.
+        """
+        try:
+            return self._configurations[configuration_id]
+        except KeyError:
+            raise QBNotFoundError(
+                'Configuration {} is not in the tree'.format(configuration_id)
+            ) from None
+
+    def get_path(self, configuration_id: int) -> str:
+        """
+        Get configuration path.
+
+        Args:
+            configuration_id (int):
+                Configuration identifier.
+
+        Returns:
+            str: configuration path.
+
+        Raises:
+            QBNotFoundError: configuration or one of its ancestors is not in
+                             the tree.
+        """
+        try:
+            return self._paths[configuration_id]
+        except KeyError:
+            raise QBNotFoundError(
+                'Path of configuration {} is unknown'.format(configuration_id)
+            ) from None
+
+    def get_id_by_path(self, path: str) -> int:
+        """
+        Get configuration id by path.
+
+        Args:
+            path (str):
+                Configuration path.
+
+        Returns:
+            int: configuration identifier.
+
+        Raises:
+            QBNotFoundError: there is no configuration with such path.
+        """
+        try:
+            return self._ids[path]
+        except KeyError:
+            raise QBNotFoundError('Configuration {} is not in the tree'.format(path)) from None
+
+    def get_parent(self, configuration_id: int) -> Optional[int]:
+        """
+        Get parent configuration id.
+
+        Args:
+            configuration_id (int):
+                Configuration identifier.
+
+        Returns:
+            Optional[int]: id of a parent configuration, None for root.
+        """
+        return self.get(configuration_id).get('parent')
+
+    def get_ancestors(self, configuration_id: int) -> List[int]:
+        """
+        Get ids of configuration ancestors.
+
+        Args:
+            configuration_id (int):
+                Configuration identifier.
+
+        Returns:
+            List[int]: ids from parent up to root configuration.
+        """
+        ancestors = []
+
+        parent_id = self.get_parent(configuration_id)
+        while parent_id is not None and parent_id in self._configurations:
+            ancestors.append(parent_id)
+            parent_id = self._configurations[parent_id].get('parent')
+
+        return ancestors
+
+    def iter_children(self, configuration_id: int) -> Iterator[int]:
+        """
+        Iterate over ids of child configurations.
+
+        Args:
+            configuration_id (int):
+                Parent configuration identifier.
+
+        Returns:
+            Iterator[int]: child configuration ids.
+        """
+        self.get(configuration_id)
+        return iter(list(self._children.get(configuration_id, ())))
+
+    def iter_descendants(self, configuration_id: int) -> Iterator[int]:
+        """
+        Iterate over ids of descendant configurations in depth-first order,
+        each configuration is yielded before its children.
+
+        Args:
+            configuration_id (int):
+                Parent configuration identifier.
+
+        Returns:
+            Iterator[int]: descendant configuration ids.
+        """
+        self.get(configuration_id)
+        return self._iter_descendants(configuration_id)
+
+    def _iter_descendants(self, configuration_id: int) -> Iterator[int]:
+        stack = list(reversed(self._children.get(configuration_id, ())))
+
+        while stack:
+            current_id = stack.pop()
+            yield current_id
+            stack.extend(reversed(self._children.get(current_id, ())))
+
+    def update(self,
+               parent_id: int,
+               configurations: List[dict],
+               *,
+               recursive: bool = True
+               ) -> None:
+        """
+        Replace subtree of configuration with new data.
+
+        Args:
+            parent_id (int):
+                Parent configuration identifier.
+
+            configurations (List[dict]):
+                Descendant configurations if recursive, otherwise child ones.
+
+            recursive (bool):
+                If set, all descendants are replaced, otherwise only children
+                are replaced, subtrees of remaining children are kept
+                (default true).
+        """
+        self.get(parent_id)
+
+        if not isinstance(configurations, list):
+            raise QBError('Configuration tree requires PARSE or JSON content type')
+
+        current = {configuration['id'] for configuration in configurations}
+
+        for configuration_id in self.iter_descendants(parent_id):
+            path = self._paths.pop(configuration_id, None)
+            if path is not None:
+                del self._ids[path]
+
+        for child_id in self._children.pop(parent_id, []):
+            if recursive or child_id not in current:
+                self._remove(child_id)
+
+        for configuration in configurations:
+            if configuration['id'] != parent_id:
+                self._link(configuration)
+
+        self._index(parent_id)
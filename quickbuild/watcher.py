@@ -0,0 +1,370 @@
+import asyncio
+import time
+
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from quickbuild.exceptions import QBError, QBNotFoundError
+from quickbuild.helpers import parse_date
+
+RUNNING = 'RUNNING'
+
+WatchCallback = Callable[[int, str], None]
+
+
+class _Watch:
+
+    __slots__ = ('future', 'callback', 'configuration_id', 'begin')
+
+    def __init__(self, future: Any, callback: Optional[WatchCallback]) -> None:
+        self.future = future
+        self.callback = callback
+        self.configuration_id = None  # type: Optional[int]
+        self.begin = None  # type: Optional[float]
+
+
+class BaseBuildWatcher:
+    """
+    Common state of build watchers, which don't depend on client type.
+    """
+    def __init__(self,
+                 client: Any,
+                 *,
+                 count: int = 1000,
+                 configuration_id: Optional[int] = None,
+                 interval: float = 10,
+                 min_interval: float = 1,
+                 max_interval: float = 60
+                 ) -> None:
+        if not min_interval <= interval <= max_interval:
+            raise QBError('Interval must be in range of min_interval and max_interval')
+
+        self.client = client
+        self.count = count
+        self.configuration_id = configuration_id
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self._watches = {}  # type: Dict[int, _Watch]
+        self._durations = {}  # type: Dict[int, Optional[float]]
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def _search_running(self) -> Any:
+        return self.client.builds.search(
+            self.count,
+            status=RUNNING,
+            configuration_id=self.configuration_id,
+            recursive=self.configuration_id is not None,
+        )
+
+    def _update(self, running: Any) -> List[int]:
+        """
+        Update watched builds from running builds search result, returns ids
+        of builds which could be finished.
+        """
+        if not isinstance(running, list):
+            raise QBError('Build watcher requires PARSE or JSON content type')
+
+        # builds of cancelled futures aren't checked anymore
+        for build_id in [i for i, watch in self._watches.items() if watch.future.cancelled()]:
+            del self._watches[build_id]
+
+        running_ids = set()
+
+        for build in running:
+            watch = self._watches.get(build['id'])
+            if watch is None:
+                continue
+
+            running_ids.add(build['id'])
+            if watch.configuration_id is None:
+                watch.configuration_id = build.get('configuration')
+                watch.begin = parse_date(build.get('beginDate')) or time.time()
+
+        # missing builds are finished or search result is truncated, anyway
+        # their status must be checked one by one
+        return [i for i in self._watches if i not in running_ids]
+
+    def _get_unknown_durations(self) -> List[int]:
+        configurations = set()
+
+        for watch in self._watches.values():
+            if watch.configuration_id is not None and \
+               watch.configuration_id not in self._durations:
+                configurations.add(watch.configuration_id)
+
+        return sorted(configurations)
+
+    def _set_duration(self, configuration_id: int, duration: Any) -> None:
+        if isinstance(duration, QBError) or not duration:
+            self._durations[configuration_id] = None
+        else:
+            self._durations[configuration_id] = duration / 1000
+
+    def _complete(self, build_id: int, status: Any) -> None:
+        if status == RUNNING:
+            return
+
+        watch = self._watches.pop(build_id)
+
+        # future could be cancelled by caller during poll
+        if watch.future.done():
+            return
+
+        if isinstance(status, QBError):
+            watch.future.set_exception(status)
+            return
+
+        watch.future.set_result(status)
+
+        if watch.callback is not None:
+            watch.callback(build_id, status)
+
+    def _get_next_interval(self) -> float:
+        """
+        Poll again when the nearest build is expected to finish according to
+        average duration of its configuration.
+        """
+        now = time.time()
+        remaining = []
+
+        for watch in self._watches.values():
+            if watch.begin is None or watch.configuration_id is None:
+                continue
+
+            duration = self._durations.get(watch.configuration_id)
+            if duration is not None and watch.begin + duration > now:
+                remaining.append(watch.begin + duration - now)
+
+        if not remaining:
+            return self.interval
+
+        return min(max(min(remaining), self.min_interval), self.max_interval)
+
+
+class BuildWatcher(BaseBuildWatcher):
+    """
+    Wait for many builds to finish using one running builds search per poll
+    instead of requesting status of each build.
+
+    Example:
+
+    .. code-block:: python
+
+        watcher = BuildWatcher(client)
+        for build_id in (1, 2, 3):
+            watcher.add(build_id, lambda i, status: print(i, status))
+
+        statuses = watcher.wait()
+
+    Args:
+        client (QBClient):
+            Client instance.
+
+        count (int):
+            Maximum number of running builds requested at once (default 1000).
+
+        configuration_id (Optional[int]):
+            Search running builds only in this configuration and descendants.
+
+        interval (float):
+            Poll interval in seconds used if finish time of builds can't be
+            estimated (default 10).
+
+        min_interval (float):
+            Minimal poll interval in seconds (default 1).
+
+        max_interval (float):
+            Maximum poll interval in seconds (default 60).
+    """
+    def add(self,
+            build_id: int,
+            callback: Optional[WatchCallback] = None
+            ) -> Future:
+        """
+        Watch build.
+
+        Args:
+            build_id (int):
+                Build identifier.
+
+            callback (Optional[Callable[[int, str], None]]):
+                Function called with build id and status when build finished.
+
+        Returns:
+            Future: resolved with build status.
+        """
+        if build_id not in self._watches:
+            self._watches[build_id] = _Watch(Future(), callback)
+
+        return self._watches[build_id].future
+
+    def poll(self) -> float:
+        """
+        Check watched builds once.
+
+        Returns:
+            float: seconds to wait before next poll.
+        """
+        missing = self._update(self._search_running())
+
+        for configuration_id in self._get_unknown_durations():
+            try:
+                duration = self.client.configurations.get_average_duration(configuration_id)
+            except QBError as e:
+                duration = e
+            self._set_duration(configuration_id, duration)
+
+        for build_id in missing:
+            try:
+                status = self.client.builds.get_status(build_id)
+            except QBNotFoundError as e:
+                status = e
+            self._complete(build_id, status)
+
+        return self._get_next_interval()
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[int, Any]:
+        """
+        Poll until all watched builds are finished.
+
+        Args:
+            timeout (Optional[float]):
+                Maximum time to wait in seconds.
+
+        Returns:
+            Dict[int, Any]: build statuses, or exceptions for not found builds,
+            builds of cancelled futures are omitted.
+
+        Raises:
+            QBError: timeout expired.
+        """
+        futures = {i: watch.future for i, watch in self._watches.items()}
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._watches:
+            interval = self.poll()
+            if not self._watches:
+                break
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise QBError('Timeout expired waiting for builds to finish')
+
+                # builds are checked once more at deadline
+                interval = min(interval, remaining)
+
+            time.sleep(interval)
+
+        return {
+            i: future.exception() or future.result()
+            for i, future in futures.items() if not future.cancelled()
+        }
+
+
+class AsyncBuildWatcher(BaseBuildWatcher):
+    """
+    Async version of BuildWatcher, see its documentation.
+
+    Example:
+
+    .. code-block:: python
+
+        watcher = AsyncBuildWatcher(client)
+        futures = [watcher.add(build_id) for build_id in (1, 2, 3)]
+
+        statuses = await watcher.wait()
+    """
+    def add(self,
+            build_id: int,
+            callback: Optional[WatchCallback] = None
+            ) -> asyncio.Future:
+        """
+        Watch build.
+
+        Args:
+            build_id (int):
+                Build identifier.
+
+            callback (Optional[Callable[[int, str], None]]):
+                Function called with build id and status when build finished.
+
+        Returns:
+            asyncio.Future: resolved with build status.
+        """
+        if build_id not in self._watches:
+            future = asyncio.get_event_loop().create_future()
+            self._watches[build_id] = _Watch(future, callback)
+
+        return self._watches[build_id].future
+
+    async def poll(self) -> float:
+        """
+        Check watched builds once.
+
+        Returns:
+            float: seconds to wait before next poll.
+        """
+        missing = self._update(await self._search_running())
+
+        configurations = self._get_unknown_durations()
+        durations = await asyncio.gather(*(
+            self.client.configurations.get_average_duration(configuration_id)
+            for configuration_id in configurations
+        ), return_exceptions=True)
+
+        for configuration_id, duration in zip(configurations, durations):
+            self._set_duration(configuration_id, duration)
+
+        statuses = await asyncio.gather(*(
+            self.client.builds.get_status(build_id) for build_id in missing
+        ), return_exceptions=True)
+
+        for build_id, status in zip(missing, statuses):
+            if isinstance(status, Exception) and not isinstance(status, QBNotFoundError):
+                raise status
+            self._complete(build_id, status)
+
+        return self._get_next_interval()
+
+    async def wait(self, timeout: Optional[float] = None) -> Dict[int, Any]:
+        """
+        Poll until all watched builds are finished.
+
+        Args:
+            timeout (Optional[float]):
+                Maximum time to wait in seconds.
+
+        Returns:
+            Dict[int, Any]: build statuses, or exceptions for not found builds,
+            builds of cancelled futures are omitted.
+
+        Raises:
+            QBError: timeout expired.
+        """
+        futures = {i: watch.future for i, watch in self._watches.items()}
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._watches:
+            interval = await self.poll()
+            if not self._watches:
+                break
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise QBError('Timeout expired waiting for builds to finish')
+
+                # builds are checked once more at deadline
+                interval = min(interval, remaining)
+
+            await asyncio.sleep(interval)
+
+        return {
+            i: future.exception() or future.result()
+            for i, future in futures.items() if not future.cancelled()
+        }
@@ -45,11 +45,17 @@ install_requires = [
     'aiohttp>=3.6,<4',
     'requests>=2.24,<3',
     'urllib3>=1.26,<3',
-    'xmltodict==0.12',
 ]
 
+extras_require = {
+    'numpy': ['numpy>=1.17'],
+    'opentelemetry': ['opentelemetry-api>=1.0'],
+    'prometheus': ['prometheus_client>=0.8'],
+}
+
 setup(
     install_requires=install_requires,
+    extras_require=extras_require,
     python_requires='>=3.7',
     **setup_args
 )
@@ -1,9 +1,12 @@
+import asyncio
+import re
+
 from http import HTTPStatus
 
 import aiohttp
 import pytest
 
-from quickbuild import AsyncQBClient, QBError
+from quickbuild import AsyncQBClient, ContentType, QBError, QBNotFoundError
 
 GET_VERSION_DATA = '6.0.9'
 
@@ -141,3 +144,216 @@ async def test_update_auth_callback(aiohttp_mock):
     assert client.auth.password == 'password_new'
 
     await client.close()
+
+
+@pytest.mark.asyncio
+async def test_gather_map():
+    client = AsyncQBClient('http://server')
+    in_flight = max_in_flight = 0
+
+    async def func(item):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(in_flight, max_in_flight)
+        await asyncio.sleep(0.01 * (item % 3))
+        in_flight -= 1
+        return item * 2
+
+    batch = await client.gather_map(func, range(10), concurrency=3)
+    assert batch.results == [i * 2 for i in range(10)]
+    assert len(batch.timings) == 10
+    assert batch.elapsed > 0
+    assert max_in_flight == 3
+
+    with pytest.raises(QBError):
+        await client.gather_map(func, range(10), concurrency=0)
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_gather_map_exceptions(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain',
+        body='SUCCESSFUL',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/2/status'),
+        content_type='text/plain',
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    client = AsyncQBClient('http://server')
+
+    batch = await client.gather_map(
+        client.builds.get_status,
+        [1, 2],
+        return_exceptions=True
+    )
+    assert batch.results[0] == 'SUCCESSFUL'
+    assert isinstance(batch.results[1], QBNotFoundError)
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/2/status'),
+        content_type='text/plain',
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    with pytest.raises(QBNotFoundError):
+        await client.gather_map(client.builds.get_status, [2])
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_pool():
+    client = AsyncQBClient(
+        'http://server',
+        pool=dict(
+            limit=200,
+            limit_per_host=50,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+    )
+
+    assert client.session.connector.limit == 200
+    assert client.session.connector.limit_per_host == 50
+    await client.close()
+
+    client = AsyncQBClient('http://server', retry=dict(total=2), pool=dict(limit=10))
+    assert client.session.session.connector.limit == 10
+    await client.close()
+
+    with pytest.raises(QBError):
+        AsyncQBClient('http://server', pool=dict(strange_argument=1))
+
+
+@pytest.mark.asyncio
+async def test_coalesce(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain',
+        body='RUNNING',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/2/status'),
+        content_type='text/plain',
+        body='SUCCESSFUL',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/duration'),
+        content_type='text/plain',
+        body='100',
+    )
+
+    client = AsyncQBClient('http://server', coalesce=True)
+
+    results = await asyncio.gather(
+        client.builds.get_status(1),
+        client.builds.get_status(1),
+        client.builds.get_status(2),
+        client.builds.get_status(1),
+        client.builds.get_duration(1),
+    )
+
+    assert results == ['RUNNING', 'RUNNING', 'SUCCESSFUL', 'RUNNING', 100]
+    assert client.coalesced == 2
+    assert client._in_flight == {}
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_offload(aiohttp_mock, monkeypatch):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1$'),
+        content_type='application/xml',
+        body='<com.pmease.quickbuild.model.Build><id>1</id></com.pmease.quickbuild.model.Build>',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/begin_date'),
+        content_type='text/plain',
+        body='1609963192617',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/version'),
+        content_type='text/plain',
+        body=GET_VERSION_DATA,
+    )
+
+    client = AsyncQBClient('http://server', offload=dict(threshold=10, processes=True))
+
+    executors = []
+    loop = asyncio.get_event_loop()
+    run_in_executor = loop.run_in_executor
+
+    def spy(executor, *args):
+        executors.append(executor)
+        return run_in_executor(executor, *args)
+
+    monkeypatch.setattr(loop, 'run_in_executor', spy)
+
+    try:
+        build = await client.builds.get_info(1)
+        assert build['id'] == 1
+
+        # local callback can't be pickled, so default executor is used
+        begin_date = await client.builds.get_begin_date(1)
+        assert begin_date.year == 2021
+
+        # too small to offload
+        await client.system.get_version()
+
+        assert len(executors) == 2
+        assert executors[0] is client._executor
+        assert executors[1] is None
+    finally:
+        await client.close()
+
+    with pytest.raises(QBError):
+        AsyncQBClient('http://server', offload=dict(strange_argument=1))
+
+
+@pytest.mark.asyncio
+async def test_bool_params(aiohttp_mock):
+    aiohttp_mock.get(
+        'http://server/rest/configurations?recursive=true',
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    client = AsyncQBClient('http://server')
+    try:
+        assert await client.configurations.get() == []
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_content_type_raw(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1$'),
+        content_type='application/xml',
+        body='<build><id>1</id></build>',
+        repeat=True,
+    )
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain; charset=windows-1251',
+        body='Успешно'.encode('windows-1251'),
+    )
+
+    client = AsyncQBClient('http://server')
+    try:
+        assert (await client.builds.get_info(1))['id'] == 1
+        assert await client.builds.get_info(1, content_type=ContentType.RAW) == b'<build><id>1</id></build>'
+        assert await client.builds.get_status(1) == 'Успешно'
+    finally:
+        await client.close()
@@ -1,11 +1,14 @@
 import re
+import time
 
 from http import HTTPStatus
 
 import pytest
 import responses
 
-from quickbuild import QBClient, QBError
+from requests.adapters import DEFAULT_POOLSIZE
+
+from quickbuild import QBClient, QBError, QBNotFoundError
 
 GET_VERSION_DATA = '6.0.9'
 
@@ -101,3 +104,88 @@ def test_update_auth_callback():
     assert client.session.auth == ('login_new', 'password_new')
 
     client.close()
+
+
+@responses.activate
+def test_gather_map():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        body='SUCCESSFUL',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/2/status'),
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    client = QBClient('http://server')
+
+    batch = client.gather_map(
+        client.builds.get_status,
+        [1, 2, 1],
+        concurrency=20,
+        return_exceptions=True,
+    )
+    assert batch.results[0] == 'SUCCESSFUL'
+    assert isinstance(batch.results[1], QBNotFoundError)
+    assert batch.results[2] == 'SUCCESSFUL'
+    assert len(batch.timings) == 3
+    assert client.session.adapters['http://']._pool_maxsize == 20
+
+    with pytest.raises(QBNotFoundError):
+        client.gather_map(client.builds.get_status, [1, 2])
+
+    with pytest.raises(QBError):
+        client.gather_map(client.builds.get_status, [1], concurrency=0)
+
+    client.close()
+
+
+def test_gather_map_cancel():
+    client = QBClient('http://server')
+    called = []
+
+    def func(item):
+        called.append(item)
+        if item == 1:
+            raise QBNotFoundError('build 1')
+
+        time.sleep(0.2 if item == 0 else 0.01)
+        return item
+
+    with pytest.raises(QBNotFoundError):
+        client.gather_map(func, range(100), concurrency=2)
+
+    # calls are not started after the first error, even if previous items
+    # are still running
+    assert len(called) <= 4
+
+
+def test_gather_map_keeps_retry():
+    client = QBClient('http://server', retry=dict(total=3))
+    client._resize_pool(50)
+
+    adapter = client.session.adapters['https://']
+    assert adapter._pool_maxsize == 50
+    assert adapter.max_retries.total == 3
+
+
+def test_client_pool():
+    client = QBClient('http://server', pool=dict(limit_per_host=20))
+    assert client.session.adapters['http://']._pool_maxsize == 20
+
+    # total limit of aiohttp isn't supported, so the same options could be
+    # passed to both clients
+    client = QBClient('http://server', pool=dict(limit=200, limit_per_host=30))
+    assert client.session.adapters['https://']._pool_maxsize == 30
+
+    client = QBClient('http://server', pool=dict(limit=200))
+    assert client.session.adapters['https://']._pool_maxsize == DEFAULT_POOLSIZE
+
+    with pytest.raises(QBError):
+        QBClient('http://server', pool=dict(strange_argument=1))
+
+    with pytest.raises(QBError):
+        QBClient('http://server', pool=dict(limit=0))
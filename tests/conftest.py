@@ -1,6 +1,10 @@
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlparse
+
 import pytest
+import responses
 
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
 
 from quickbuild import QBClient
 
@@ -14,3 +18,32 @@ def aiohttp_mock():
 @pytest.fixture
 def client():
     yield QBClient('http://server')
+
+
+def add_callback(mock, pattern, handler):
+    """
+    Respond to GET requests matched by `pattern` with body returned by
+    `handler(path, query)`, so fake server could depend on query arguments.
+
+    `mock` is `responses` module or `aiohttp_mock` fixture.
+    """
+    if isinstance(mock, aioresponses):
+        mock.get(
+            pattern,
+            callback=lambda url, **kwargs: CallbackResult(
+                content_type='application/xml',
+                body=handler(url.path, dict(url.query)),
+            ),
+            repeat=True,
+        )
+        return
+
+    mock.add_callback(
+        responses.GET,
+        pattern,
+        callback=lambda request: (
+            HTTPStatus.OK,
+            {},
+            handler(urlparse(request.url).path, dict(parse_qsl(urlparse(request.url).query))),
+        ),
+    )
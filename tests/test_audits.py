@@ -1,7 +1,20 @@
 import re
 
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 import responses
 
+from quickbuild import AsyncQBClient, QBError
+from tests.conftest import add_callback
+
+# audit every 30 minutes during 12 hours, id grows with time
+AUDITS = [
+    (i + 1, datetime(2024, 1, 1) + timedelta(minutes=30 * i))
+    for i in range(24)
+]
+
 AUDITS_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
 
 <list>
@@ -64,3 +77,141 @@ def test_count(client):
 
     response = client.audits.count()
     assert response == 11
+
+
+def make_audits_response(path, query, audits=AUDITS):
+    # server accepts dates with minutes precision, both ends are included
+    since, until = (datetime.strptime(query[key], '%Y-%m-%d %H:%M') for key in ('since', 'until'))
+
+    # newest audits go first
+    audits = [
+        (audit_id, timestamp) for audit_id, timestamp in reversed(audits)
+        if since <= timestamp <= until
+    ]
+
+    if path.endswith('/count'):
+        return str(len(audits))
+
+    first = int(query.get('first', 0))
+    count = int(query['count'])
+
+    audit = (
+        '<com.pmease.quickbuild.model.Audit><id>{}</id>'
+        '<timestamp>{}</timestamp></com.pmease.quickbuild.model.Audit>'
+    )
+    return '<list>{}</list>'.format(''.join(
+        audit.format(audit_id, timestamp.astimezone().isoformat(timespec='milliseconds'))
+        for audit_id, timestamp in audits[first:first + count]
+    ))
+
+
+def get_shard_dates(calls):
+    queries = (
+        parse_qs(urlparse(call.request.url).query)
+        for call in calls if '/count' in call.request.url
+    )
+    return {(query['since'][0], query['until'][0]) for query in queries}
+
+
+@responses.activate
+def test_iter(client):
+    add_callback(responses, re.compile(r'.*/rest/audits.*'), make_audits_response)
+
+    audits = client.audits.iter(
+        datetime(2024, 1, 1, 1),
+        datetime(2024, 1, 1, 10),
+        shard=timedelta(hours=2),
+        page_size=3,
+        concurrency=2,
+    )
+
+    # counts of 5 shards, then no more than 2 pages are requested ahead
+    assert next(audits)['id'] == 3
+    assert len(responses.calls) <= 7
+
+    assert [audit['id'] for audit in audits] == list(range(4, 21))
+
+    # 4 shards of 5 audits require 2 pages, the last one of 3 audits 1 page
+    assert len(responses.calls) == 5 + 9
+
+
+@responses.activate
+def test_iter_shard_boundary(client):
+    add_callback(responses, re.compile(r'.*/rest/audits.*'), make_audits_response)
+
+    # boundaries are 02:00:00, which is time of audit, 02:59:30 and 03:59:00
+    audits = client.audits.iter(
+        datetime(2024, 1, 1, 1, 0, 30),
+        datetime(2024, 1, 1, 4),
+        shard=timedelta(minutes=59, seconds=30),
+        page_size=2,
+    )
+
+    # audits of overlapping minutes are trimmed to exact shards
+    assert [audit['id'] for audit in audits] == [4, 5, 6, 7, 8]
+
+    # shards are requested with whole minutes
+    assert get_shard_dates(responses.calls) == {
+        ('2024-01-01 01:00', '2024-01-01 02:00'),
+        ('2024-01-01 02:00', '2024-01-01 03:00'),
+        ('2024-01-01 02:59', '2024-01-01 03:59'),
+        ('2024-01-01 03:59', '2024-01-01 04:00'),
+    }
+
+
+@responses.activate
+def test_iter_new_audits(client):
+    now = datetime.now().replace(second=0, microsecond=0)
+
+    # audit every 10 minutes during the last 2 hours
+    audits = [(i + 1, now - timedelta(minutes=120 - 10 * i)) for i in range(12)]
+
+    def make_response(path, query):
+        response = make_audits_response(path, query, audits)
+
+        # new audit is created on each page request
+        if not path.endswith('/count'):
+            audits.append((len(audits) + 1, datetime.now()))
+
+        return response
+
+    add_callback(responses, re.compile(r'.*/rest/audits.*'), make_response)
+
+    result = client.audits.iter(
+        now - timedelta(minutes=90),
+        shard=timedelta(hours=2),
+        page_size=3,
+        concurrency=1,
+    )
+
+    # the last shard is limited by time of call, new audits don't shift pages
+    assert [audit['id'] for audit in result] == list(range(4, 13))
+    assert len(audits) > 12
+
+
+def test_iter_arguments(client):
+    with pytest.raises(QBError):
+        client.audits.iter(datetime(2024, 1, 1), shard=timedelta(seconds=1))
+
+    with pytest.raises(QBError):
+        client.audits.iter(datetime(2024, 1, 2), datetime(2024, 1, 1))
+
+    with pytest.raises(QBError):
+        client.audits.iter(datetime(2024, 1, 1), concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_iter_async(aiohttp_mock):
+    add_callback(aiohttp_mock, re.compile(r'.*/rest/audits.*'), make_audits_response)
+
+    client = AsyncQBClient('http://server')
+    try:
+        audits = client.audits.iter(
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 1, 12),
+            shard=timedelta(hours=5),
+            page_size=4,
+        )
+        assert [audit['id'] async for audit in audits] == list(range(1, 25))
+    finally:
+        await client.close()
@@ -1,12 +1,14 @@
 import re
 
 from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import responses
 
 from quickbuild import (
     AsyncQBClient,
+    QBClient,
     QBError,
     QBNotFoundError,
     QBProcessingError,
@@ -447,7 +449,18 @@ def test_get_steps(client):
         body=BUILD_STEPS_XML,
     )
 
-    response = client.builds.get_steps(1)
+    steps = client.builds.get_steps(1)
+    assert len(steps) == 2
+    assert [step.name for step in steps.roots] == ['master']
+
+    step = steps.get('sleep')
+    assert step.path == 'master>sleep'
+    assert step.kind == 'CommandlineBuildStep'
+    assert step.properties['command'] == 'sleep 60'
+    assert step.parent is steps.get_by_path('master')
+    assert step.parent.children == [step]
+
+    response = client.builds.get_steps(1, content_type=ContentType.XML)
     assert '<name>master</name>' in response
 
 
@@ -455,7 +468,14 @@ def test_get_steps(client):
 def test_get_repositories(client):
     BUILD_REPOSITORIES_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
 
-    <list/>
+    <list>
+      <com.pmease.quickbuild.plugin.scm.git.GitRepository>
+        <name>app</name>
+        <url>https://git.example.com/app.git</url>
+        <branch>master</branch>
+        <quietPeriod>0</quietPeriod>
+      </com.pmease.quickbuild.plugin.scm.git.GitRepository>
+    </list>
     """
 
     responses.add(
@@ -465,8 +485,18 @@ def test_get_repositories(client):
         body=BUILD_REPOSITORIES_XML,
     )
 
-    response = client.builds.get_repositories(1)
-    assert 'list' in response
+    repositories = client.builds.get_repositories(1)
+    assert len(repositories) == 1
+    assert repositories[0].name == 'app'
+    assert repositories[0].kind == 'GitRepository'
+    assert repositories[0].properties == {
+        'url': 'https://git.example.com/app.git',
+        'branch': 'master',
+        'quietPeriod': 0,
+    }
+
+    response = client.builds.get_repositories(1, content_type=ContentType.XML)
+    assert 'GitRepository' in response
 
 
 @responses.activate
@@ -483,26 +513,28 @@ def test_get_dependencies(client):
         body=RESPONSE_DATA,
     )
 
-    response = client.builds.get_dependencies(1)
+    assert client.builds.get_dependencies(1) == []
+
+    response = client.builds.get_dependencies(1, content_type=ContentType.XML)
     assert 'list' in response
 
 
 @responses.activate
 def test_get_dependents(client):
-    RESPONSE_DATA = r"""<?xml version="1.0" encoding="UTF-8"?>
-
-    <list/>
-    """
-
     responses.add(
         responses.GET,
         re.compile(r'.*/rest/builds/\d+/dependents'),
         content_type='application/xml',
-        body=RESPONSE_DATA,
+        body=BUILD_SEARCH_XML,
     )
 
-    response = client.builds.get_dependents(1)
-    assert 'list' in response
+    dependents = client.builds.get_dependents(1)
+    assert [build.id for build in dependents] == [4, 3]
+    assert dependents[0].version == '1.0.3'
+    assert dependents[0].status == 'SUCCESSFUL'
+
+    response = client.builds.get_dependents(1, content_type=ContentType.RAW)
+    assert isinstance(response, bytes)
 
 
 @responses.activate
@@ -551,6 +583,84 @@ def test_search(client):
     assert len(response) == 2
 
 
+def make_builds_xml(first, count):
+    build = '<com.pmease.quickbuild.model.Build><id>{}</id></com.pmease.quickbuild.model.Build>'
+    builds = ''.join(build.format(i) for i in range(first, first + count))
+    return '<list>{}</list>'.format(builds)
+
+
+def builds_search_callback(request):
+    query = parse_qs(urlparse(request.url).query)
+    first = int(query.get('first', [0])[0])
+    count = min(int(query['count'][0]), 5 - first)
+    return (HTTPStatus.OK, {}, make_builds_xml(first, count))
+
+
+@pytest.mark.parametrize('read_ahead', [False, True])
+@responses.activate
+def test_iter_search(client, read_ahead):
+    responses.add_callback(
+        responses.GET,
+        re.compile(r'.*/rest/builds.*'),
+        callback=builds_search_callback,
+    )
+
+    builds = client.builds.iter_search(2, configuration_id=1, read_ahead=read_ahead)
+    assert [build['id'] for build in builds] == [0, 1, 2, 3, 4]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_iter_search_xml():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds.*'),
+        content_type='application/xml',
+        body=BUILD_SEARCH_XML,
+    )
+
+    client = QBClient('http://server', content_type=ContentType.XML)
+    with pytest.raises(QBError, match='content types'):
+        list(client.builds.iter_search(2))
+
+    # content type is checked before the first request
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_iter_search_empty_page(client, monkeypatch):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds.*'),
+        body='',
+    )
+
+    # background thread is used only for read-ahead
+    monkeypatch.setattr('quickbuild.adapters.sync.ThreadPoolExecutor', None)
+
+    with pytest.raises(QBError, match='Unexpected page of results: None'):
+        list(client.builds.iter_search(2))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('read_ahead', [False, True])
+async def test_iter_search_async(aiohttp_mock, read_ahead):
+    try:
+        client = AsyncQBClient('http://server')
+
+        for first, count in ((0, 2), (2, 2), (4, 1)):
+            aiohttp_mock.get(
+                re.compile(r'.*/rest/builds.*'),
+                content_type='application/xml',
+                body=make_builds_xml(first, count),
+            )
+
+        builds = client.builds.iter_search(2, read_ahead=read_ahead)
+        assert [build['id'] async for build in builds] == [0, 1, 2, 3, 4]
+    finally:
+        await client.close()
+
+
 @responses.activate
 def test_count(client):
     responses.add(
@@ -0,0 +1,336 @@
+import re
+
+from array import array
+from functools import partial
+from http import HTTPStatus
+
+import pytest
+import responses
+
+from quickbuild import AsyncQBClient, QBClient, QBError
+from quickbuild.cache import IdentifierCache, ResponseCache, RevalidationCache
+from quickbuild.columns import parse_columns
+from tests.test_measurements import make_measurements_xml
+
+CONFIGURATION_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
+
+<com.pmease.quickbuild.model.Configuration>
+  <name>root</name>
+</com.pmease.quickbuild.model.Configuration>
+"""
+
+
+@responses.activate
+def test_cache_hit():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/\d+/path'),
+        body='root/child',
+    )
+
+    client = QBClient('http://server', cache=dict(size=10))
+
+    assert client.configurations.get_path(1) == 'root/child'
+    assert client.configurations.get_path(1) == 'root/child'
+    assert len(responses.calls) == 1
+
+    client.configurations.get_path(2)
+    assert len(responses.calls) == 2
+
+    client.cache.invalidate()
+    client.configurations.get_path(1)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_cache_not_cached_endpoint():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/\d+/status'),
+        body='RUNNING',
+    )
+
+    client = QBClient('http://server', cache=dict(size=10))
+    client.builds.get_status(1)
+    client.builds.get_status(1)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_cache_invalidation():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/\d+/path'),
+        body='root/child',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/ids.*'),
+        body='1',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/users/\d+/display_name'),
+        body='Admin',
+    )
+
+    responses.add(
+        responses.POST,
+        re.compile(r'.*/rest/configurations'),
+        body='1',
+    )
+
+    client = QBClient('http://server', cache=dict(size=10))
+    client.configurations.get_path(1)
+    client.configurations.get_id_by_path('root/child')
+    client.users.get_display_name(1)
+    assert len(client.cache) == 3
+
+    client.configurations.update(CONFIGURATION_XML)
+    assert len(client.cache) == 1
+
+    client.users.get_display_name(1)
+    assert len(responses.calls) == 4
+
+
+def test_cache_lru_and_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('quickbuild.cache.time.monotonic', lambda: now)
+
+    cache = ResponseCache(size=2, endpoints={r'a/\d+': 10})
+
+    keys = [cache.key('GET', 'a/{}'.format(i)) for i in range(3)]
+    assert cache.key('GET', 'b/1') is None
+    assert cache.key('POST', 'a/1') is None
+
+    cache.store('GET', 'a/0', keys[0], 0)
+    cache.store('GET', 'a/1', keys[1], 1)
+    assert cache.get(keys[0]) == (True, 0)
+
+    cache.store('GET', 'a/2', keys[2], 2)
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0]) == (True, 0)
+
+    now += 11
+    assert cache.get(keys[0]) == (False, None)
+
+    with pytest.raises(QBError):
+        ResponseCache(size=0)
+
+    with pytest.raises(QBError):
+        QBClient('http://server', cache=dict(strange_argument=1))
+
+
+@responses.activate
+def test_cache_callback():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/grid/measurements'),
+        body=make_measurements_xml([(0, 'agent:8811', 'disk.usage', 1)]),
+    )
+
+    client = QBClient('http://server', cache=dict(ttl=60))
+
+    # the same request is parsed in different ways
+    columns = client.measurements.get_columns()
+    assert isinstance(columns['agent:8811', 'disk.usage'].values, array)
+    assert client.measurements.get()[0]['value'] == 1
+    assert len(responses.calls) == 2
+
+    client.measurements.get_columns()
+    assert len(responses.calls) == 2
+
+    numpy = pytest.importorskip('numpy')
+
+    columns = client.measurements.get_columns(numpy=True)
+    assert isinstance(columns['agent:8811', 'disk.usage'].values, numpy.ndarray)
+    assert len(responses.calls) == 3
+
+
+def test_cache_callback_key():
+    cache = ResponseCache(ttl=60)
+
+    assert cache.key('GET', 'a', callback=partial(parse_columns, numpy=False)) != \
+        cache.key('GET', 'a', callback=partial(parse_columns, numpy=True))
+
+    assert cache.key('GET', 'a', callback=partial(parse_columns, numpy=True)) == \
+        cache.key('GET', 'a', callback=partial(parse_columns, numpy=True))
+
+    # unhashable arguments of callback
+    assert cache.key('GET', 'a', callback=partial(parse_columns, numpy=[])) is None
+
+    # closures and bound methods with different state
+    def make_callback(numpy):
+        return lambda body: parse_columns(body, numpy=numpy)
+
+    assert cache.key('GET', 'a', callback=make_callback(False)) != \
+        cache.key('GET', 'a', callback=make_callback(True))
+
+    assert cache.key('GET', 'a', callback=make_callback(True)) == \
+        cache.key('GET', 'a', callback=make_callback(True))
+
+    assert cache.key('GET', 'a', callback=ResponseCache().key) != \
+        cache.key('GET', 'a', callback=ResponseCache().key)
+
+
+@pytest.mark.asyncio
+async def test_cache_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/version'),
+        content_type='text/plain',
+        body='12.0.5',
+    )
+
+    client = AsyncQBClient('http://server', cache=dict(size=10))
+
+    try:
+        version = await client.system.get_version()
+        assert version.major == 12
+
+        # only one mocked response, so second request would fail
+        assert await client.system.get_version() == version
+    finally:
+        await client.close()
+
+
+@responses.activate
+def test_revalidate():
+    requests_headers = []
+
+    def callback(request):
+        requests_headers.append(request.headers)
+
+        if request.headers.get('If-None-Match') == '"v1"':
+            return (HTTPStatus.NOT_MODIFIED, {}, '')
+
+        return (HTTPStatus.OK, {'ETag': '"v1"'}, CONFIGURATION_XML)
+
+    responses.add_callback(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/\d+'),
+        callback=callback,
+    )
+
+    client = QBClient('http://server', revalidate=dict(size=10))
+
+    info = client.configurations.get_info(1)
+    assert info['name'] == 'root'
+    assert 'If-None-Match' not in requests_headers[0]
+
+    assert client.configurations.get_info(1) is info
+    assert requests_headers[1]['If-None-Match'] == '"v1"'
+    assert len(client.revalidation) == 1
+
+
+@responses.activate
+def test_revalidate_callback():
+    numpy = pytest.importorskip('numpy')
+
+    def callback(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return (HTTPStatus.NOT_MODIFIED, {}, '')
+
+        body = make_measurements_xml([(0, 'agent:8811', 'disk.usage', 1)])
+        return (HTTPStatus.OK, {'ETag': '"v1"'}, body)
+
+    responses.add_callback(
+        responses.GET,
+        re.compile(r'.*/rest/grid/measurements'),
+        callback=callback,
+    )
+
+    client = QBClient('http://server', revalidate=dict(size=10))
+
+    client.measurements.get_columns()
+    columns = client.measurements.get_columns(numpy=True)
+    assert isinstance(columns['agent:8811', 'disk.usage'].values, numpy.ndarray)
+    assert len(client.revalidation) == 2
+
+    # both results are revalidated separately
+    columns = client.measurements.get_columns()
+    assert isinstance(columns['agent:8811', 'disk.usage'].values, array)
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_revalidate_no_validators():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/\d+'),
+        body=CONFIGURATION_XML,
+    )
+
+    client = QBClient('http://server', revalidate={})
+    client.configurations.get_info(1)
+    client.configurations.get_info(1)
+
+    assert len(client.revalidation) == 0
+    assert 'If-None-Match' not in responses.calls[1].request.headers
+    assert 'If-Modified-Since' not in responses.calls[1].request.headers
+
+    with pytest.raises(QBError):
+        QBClient('http://server', revalidate=dict(strange_argument=1))
+
+
+def test_revalidation_cache():
+    cache = RevalidationCache(endpoints=[r'builds/\d+'])
+    assert cache.key('GET', 'configurations/1') is None
+    assert cache.key('POST', 'builds/1') is None
+
+    key = cache.key('GET', 'builds/1')
+    cache.store(key, {'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}, 'value')
+    assert cache.get(key).headers == {'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+    assert cache.get(key).value == 'value'
+
+
+@pytest.mark.asyncio
+async def test_revalidate_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/configurations/\d+'),
+        content_type='application/xml',
+        body=CONFIGURATION_XML,
+        headers={'ETag': '"v1"'},
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/configurations/\d+'),
+        status=HTTPStatus.NOT_MODIFIED,
+    )
+
+    client = AsyncQBClient('http://server', revalidate={})
+
+    try:
+        info = await client.configurations.get_info(1)
+        assert await client.configurations.get_info(1) is info
+
+        request = list(aiohttp_mock.requests.values())[0][1]
+        assert request.kwargs['headers']['If-None-Match'] == '"v1"'
+    finally:
+        await client.close()
+
+
+def test_identifier_cache():
+    cache = IdentifierCache(ttl=300, negative_ttl=300)
+
+    assert cache.get_id('user', 'admin') == (False, None)
+
+    cache.store('user', 'admin', 1)
+    cache.store('user', 'missing', None)
+
+    assert cache.get_id('user', 'admin') == (True, 1)
+    assert cache.get_id('user', 'missing') == (True, None)
+    assert cache.get_id('group', 'admin') == (False, None)
+    assert cache.get_name('user', 1) == 'admin'
+    assert len(cache) == 2
+
+    cache.invalidate()
+    assert cache.get_id('user', 'admin') == (False, None)
+    assert cache.get_name('user', 1) is None
+
+    cache = IdentifierCache(ttl=0)
+    cache.store('user', 'admin', 1)
+    assert cache.get_id('user', 'admin') == (False, None)
+    assert cache.get_name('user', 1) is None
+    assert len(cache) == 0
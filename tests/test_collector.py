@@ -0,0 +1,207 @@
+import re
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pytest
+import responses
+
+from quickbuild import (
+    AsyncMeasurementsCollector,
+    AsyncQBClient,
+    ContentType,
+    MeasurementsCollector,
+    QBClient,
+    QBError,
+)
+from quickbuild.collector import DATE_FORMAT
+from tests.conftest import add_callback
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+AGENT = (
+    '<com.pmease.quickbuild.model.Token><ip>10.0.0.{0}</ip><port>8811</port>'
+    '<hostName>agent{0}</hostName></com.pmease.quickbuild.model.Token>'
+)
+
+ACTIVE_AGENTS_XML = '<list>{}{}</list>'.format(AGENT.format(1), AGENT.format(2))
+INACTIVE_AGENTS_XML = '<list>{}{}</list>'.format(AGENT.format(2), AGENT.format(3))
+
+
+def make_points(minutes):
+    """
+    Measurements of all nodes every 10 minutes.
+    """
+    return [
+        (
+            int((START + timedelta(minutes=minute)).timestamp() * 1000),
+            'agent{}:8811'.format(node),
+            'disk.usage',
+            minute + node,
+        )
+        for minute in range(0, minutes, 10)
+        for node in (1, 2, 3)
+    ]
+
+
+def select(points, query):
+    start, end = (
+        datetime.strptime(query[key], DATE_FORMAT).timestamp() * 1000
+        for key in ('start_time', 'end_time')
+    )
+
+    # server includes both ends of range, index of point is used as id
+    return [
+        (i,) + point for i, point in enumerate(points)
+        if point[1] == query['source'] and start <= point[0] <= end
+    ]
+
+
+def make_measurements(points, _, query):
+    measurement = (
+        '<com.pmease.quickbuild.model.MeasurementDataR00>'
+        '<id>{}</id><timestamp>{}</timestamp><source>{}</source>'
+        '<metricName>{}</metricName><value>{}</value>'
+        '</com.pmease.quickbuild.model.MeasurementDataR00>'
+    )
+
+    return '<list>{}</list>'.format(''.join(
+        measurement.format(*point) for point in select(points, query)
+    ))
+
+
+def add_agents():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/buildagents/active'),
+        body=ACTIVE_AGENTS_XML,
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/buildagents/inactive'),
+        body=INACTIVE_AGENTS_XML,
+    )
+
+
+def add_measurements_callback(mock, points):
+    add_callback(
+        mock,
+        re.compile(r'.*/rest/grid/measurements\?.*'),
+        partial(make_measurements, points),
+    )
+
+
+def get_values(measurements):
+    return [(measurement['source'], measurement['value']) for measurement in measurements]
+
+
+@responses.activate
+def test_collect(client):
+    points = make_points(120)
+    add_agents()
+    add_measurements_callback(responses, points)
+
+    collector = MeasurementsCollector(
+        client,
+        metric='disk.usage',
+        since=START,
+        chunk=timedelta(minutes=30),
+        concurrency=4,
+    )
+
+    measurements = collector.collect(until=START + timedelta(hours=2))
+
+    # each point once in time order, despite of shared chunk boundaries
+    assert len(measurements) == len(points)
+    assert get_values(measurements)[:4] == [
+        ('agent1:8811', 1),
+        ('agent2:8811', 2),
+        ('agent3:8811', 3),
+        ('agent1:8811', 11),
+    ]
+
+    # 2 requests of agents and 4 chunks of 3 nodes
+    assert len(responses.calls) == 14
+
+    last = int((START + timedelta(minutes=110)).timestamp() * 1000)
+    assert collector.positions == {'agent1:8811': last, 'agent2:8811': last, 'agent3:8811': last}
+
+    # new measurements appear
+    points[:] = make_points(150)
+
+    measurements = collector.collect(until=START + timedelta(minutes=150))
+    assert get_values(measurements) == [
+        ('agent{}:8811'.format(node), minute + node)
+        for minute in (120, 130, 140)
+        for node in (1, 2, 3)
+    ]
+
+
+@responses.activate
+def test_collect_resume(client):
+    add_measurements_callback(responses, make_points(120))
+
+    position = int((START + timedelta(minutes=100)).timestamp() * 1000)
+
+    collector = MeasurementsCollector(
+        client,
+        nodes=['agent2:8811'],
+        positions={'agent2:8811': position},
+    )
+
+    measurements = collector.collect(until=START + timedelta(hours=2))
+
+    assert get_values(measurements) == [('agent2:8811', 112)]
+    assert len(responses.calls) == 1
+
+
+def test_collector_arguments():
+    client = QBClient('http://server')
+
+    with pytest.raises(QBError):
+        MeasurementsCollector(client, chunk=timedelta(seconds=1))
+
+    with pytest.raises(QBError):
+        MeasurementsCollector(client, concurrency=0)
+
+
+@responses.activate
+def test_collector_xml():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/buildagents/.+'),
+        body=ACTIVE_AGENTS_XML,
+    )
+
+    client = QBClient('http://server', content_type=ContentType.XML)
+
+    with pytest.raises(QBError):
+        MeasurementsCollector(client).collect()
+
+
+@pytest.mark.asyncio
+async def test_collect_async(aiohttp_mock):
+    points = make_points(60)
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/buildagents/active'),
+        content_type='application/xml',
+        body=ACTIVE_AGENTS_XML,
+    )
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/buildagents/inactive'),
+        content_type='application/xml',
+        body=INACTIVE_AGENTS_XML,
+    )
+    add_measurements_callback(aiohttp_mock, points)
+
+    client = AsyncQBClient('http://server')
+    try:
+        collector = AsyncMeasurementsCollector(client, since=START, chunk=timedelta(minutes=20))
+        measurements = await collector.collect(until=START + timedelta(hours=1))
+    finally:
+        await client.close()
+
+    assert get_values(measurements) == get_values(
+        {'source': point[1], 'value': point[3]} for point in points
+    )
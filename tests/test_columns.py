@@ -0,0 +1,97 @@
+import pickle
+
+from array import array
+from datetime import timedelta
+
+import pytest
+
+from quickbuild import QBError
+from quickbuild.columns import Series, parse_columns
+from tests.test_measurements import make_measurements_xml
+
+# two points per minute during three minutes
+POINTS = [
+    (60000 * (i // 2) + 30000 * (i % 2), 'agent:8811', 'disk.usage', i)
+    for i in range(6)
+]
+
+
+def make_series():
+    return parse_columns(make_measurements_xml(POINTS))['agent:8811', 'disk.usage']
+
+
+@pytest.mark.parametrize('how, expected', [
+    ('mean', [0.5, 2.5, 4.5]),
+    ('min', [0, 2, 4]),
+    ('max', [1, 3, 5]),
+    ('last', [1, 3, 5]),
+])
+def test_downsample(how, expected):
+    series = make_series().downsample(timedelta(minutes=1), how=how)
+
+    assert isinstance(series.values, array)
+    assert list(series.timestamps) == [0, 60000, 120000]
+    assert list(series.values) == expected
+
+
+def test_downsample_arguments():
+    series = make_series()
+
+    with pytest.raises(QBError):
+        series.downsample(timedelta(0))
+
+    with pytest.raises(QBError):
+        series.downsample(timedelta(minutes=1), how='median')
+
+    empty = Series('agent', 'disk.usage', array('q'), array('d'))
+    assert len(empty.downsample(timedelta(minutes=1))) == 0
+
+
+def test_percentile():
+    series = make_series()
+
+    assert series.percentile(0) == 0
+    assert series.percentile(50) == 2.5
+    assert series.percentile(90) == pytest.approx(4.5)
+
+    with pytest.raises(QBError):
+        series.percentile(101)
+
+    with pytest.raises(QBError):
+        Series('agent', 'disk.usage', array('q'), array('d')).percentile(50)
+
+
+def test_parse_columns():
+    assert len(parse_columns('<list/>')) == 0
+
+    columns = parse_columns(make_measurements_xml(POINTS).encode())
+    series = columns['agent:8811', 'disk.usage']
+    assert repr(series) == "Series('agent:8811', 'disk.usage', 6 points)"
+    assert pickle.loads(pickle.dumps(columns))['agent:8811', 'disk.usage'].values[5] == 5
+
+    with pytest.raises(QBError):
+        columns.get_series('agent:8811', 'cpu.usage')
+
+    with pytest.raises(QBError):
+        parse_columns('<list><item><value>1</value></item></list>')
+
+    with pytest.raises(QBError):
+        parse_columns('not xml')
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+
+    columns = parse_columns(make_measurements_xml(reversed(POINTS)), numpy=True)
+    series = columns['agent:8811', 'disk.usage']
+    assert isinstance(series.values, numpy.ndarray)
+    assert list(series.timestamps) == [point[0] for point in POINTS]
+
+    for how in ('mean', 'min', 'max', 'last'):
+        expected = make_series().downsample(timedelta(minutes=1), how=how)
+        result = series.downsample(timedelta(minutes=1), how=how)
+
+        assert list(result.timestamps) == list(expected.timestamps)
+        assert list(result.values) == list(expected.values)
+
+    assert series.percentile(90) == pytest.approx(make_series().percentile(90))
@@ -1,11 +1,17 @@
 import re
+import subprocess
+import sys
 
 from http import HTTPStatus
 
 import pytest
 import responses
 
+import quickbuild
+
 from quickbuild import ContentType, QBClient, QBError, QBServerError
+from quickbuild.core import Endpoint
+from quickbuild.endpoints import Builds
 from quickbuild.exceptions import QBForbiddenError
 
 GET_VERSION_DATA = '6.0.9'
@@ -106,6 +112,66 @@ def test_content_type_json_get():
     assert isinstance(users, list)
 
 
+@responses.activate
+def test_content_type_raw_get():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/users'),
+        content_type='application/xml',
+        body=USERS_XML,
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1'),
+        content_type='application/json',
+        body=USERS_JSON,
+    )
+
+    client = QBClient('http://server', content_type=ContentType.RAW)
+    assert client.users.get() == USERS_XML.encode()
+
+    client = QBClient('http://server')
+    assert client.builds.get_info(1, content_type=ContentType.RAW) == USERS_JSON.encode()
+
+
+@responses.activate
+def test_charset_decoding():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain; charset=windows-1251',
+        body='Успешно'.encode('windows-1251'),
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/version'),
+        content_type='text/plain',
+        body='версия'.encode(),
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/users'),
+        content_type='application/xml; charset=ISO-8859-1',
+        body='<list><user><name>Jos\xe9</name></user></list>'.encode('latin-1'),
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/1/description'),
+        content_type='text/plain; charset=unknown-charset',
+        body='описание'.encode(),
+    )
+
+    client = QBClient('http://server')
+
+    assert client.builds.get_status(1) == 'Успешно'
+    assert client.builds.get_version(1) == 'версия'
+    assert client.users.get()[0]['name'] == 'Jos\xe9'
+
+    # unknown charset falls back to UTF-8
+    assert client.configurations.get_description(1) == 'описание'
+
+
 @responses.activate
 def test_content_type_headers_sync_json_json():
 
@@ -193,3 +259,31 @@ def test_exception_common_error(client):
     )
     with pytest.raises(QBError):
         client.system.get_version()
+
+
+def test_lazy_endpoints(client):
+    assert 'builds' not in vars(client)
+
+    builds = client.builds
+    assert isinstance(builds, Builds)
+    assert builds.quickbuild is client
+    assert client.builds is builds
+    assert 'builds' in vars(client)
+
+    assert isinstance(QBClient.builds, Endpoint)
+
+
+def test_lazy_imports():
+    code = (
+        'import sys, quickbuild;'
+        'assert "requests" not in sys.modules;'
+        'assert "aiohttp" not in sys.modules;'
+        'quickbuild.QBClient("http://server").builds;'
+        'assert "requests" in sys.modules;'
+        'assert "aiohttp" not in sys.modules'
+    )
+
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+    with pytest.raises(AttributeError):
+        quickbuild.UnknownClient  # pylint: disable=pointless-statement
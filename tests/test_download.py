@@ -0,0 +1,189 @@
+import io
+import re
+import threading
+
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from quickbuild import AsyncQBClient, QBClient, QBError, QBProcessingError
+from quickbuild.download import DownloadTarget
+
+CONTENT = bytes(range(256)) * 1024
+
+
+class FilesHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    close_connection = False
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        query = parse_qs(urlparse(self.path).query)
+        path = query['path'][0]
+        self.server.requests.append((path, self.headers.get('Range')))
+
+        if path == 'missing':
+            self.send_response(HTTPStatus.NO_CONTENT)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start = 0
+        match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range') or '')
+
+        if match and path != 'no-range':
+            start = int(match.group(1))
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+                start, len(CONTENT) - 1, len(CONTENT)
+            ))
+        else:
+            self.send_response(HTTPStatus.OK)
+
+        body = CONTENT[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        # first response of `broken` files is interrupted in the middle
+        if (path == 'broken' and len(self.server.requests) == 1) or path == 'always-broken':
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@contextmanager
+def serve_files():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FilesHandler)
+    server.daemon_threads = True
+    server.requests = []
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def get_url(server):
+    return 'http://{}:{}'.format(*server.server_address[:2])
+
+
+def test_download_target_skip():
+    output = io.BytesIO(b'abc')
+    output.seek(3)
+
+    download = DownloadTarget(output)
+    download.written = 3
+
+    assert download.get_headers()['Range'] == 'bytes=3-'
+
+    # server ignored Range
+    assert download.begin(HTTPStatus.OK, {'Content-Length': '5'})
+    download.write(b'ab')
+    download.write(b'cde')
+
+    assert download.is_complete()
+    assert output.getvalue() == b'abcde'
+
+
+def test_download_target_range():
+    download = DownloadTarget(io.BytesIO())
+    download.written = 10
+
+    with pytest.raises(QBError):
+        download.begin(HTTPStatus.PARTIAL_CONTENT, {'Content-Range': 'bytes 5-9/10'})
+
+    assert not download.begin(
+        HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+        {'Content-Range': 'bytes */10'},
+    )
+    assert download.is_complete()
+
+    download.size = 5
+    with pytest.raises(QBError):
+        download.is_complete()
+
+
+def test_download_file(tmp_path):
+    with serve_files() as server:
+        client = QBClient(get_url(server), timeout=10)
+        target = tmp_path / 'file.bin'
+
+        size = client.builds.download_file(1, 'broken', str(target), chunk_size=4096)
+
+        assert size == len(CONTENT)
+        assert target.read_bytes() == CONTENT
+        assert server.requests == [('broken', None), ('broken', 'bytes=131072-')]
+
+        # nothing to download
+        size = client.builds.download_file(1, 'file', target, resume=True)
+        assert size == len(CONTENT)
+        assert target.read_bytes() == CONTENT
+
+
+def test_download_file_errors():
+    with serve_files() as server:
+        client = QBClient(get_url(server))
+
+        with pytest.raises(QBProcessingError):
+            client.builds.download_file(1, 'missing', io.BytesIO())
+
+        with pytest.raises(QBError):
+            client.builds.download_file(1, 'always-broken', io.BytesIO(), retries=1)
+
+        assert len(server.requests) == 3
+
+        with pytest.raises(QBError):
+            client.builds.download_file(1, 'file', io.BytesIO(), chunk_size=0)
+
+
+def test_download_files():
+    with serve_files() as server:
+        client = QBClient(get_url(server))
+        outputs = [io.BytesIO() for _ in range(3)]
+
+        batch = client.builds.download_files(1, {
+            'file': outputs[0],
+            'no-range': outputs[1],
+            'missing': outputs[2],
+        }, concurrency=2, return_exceptions=True)
+
+        assert batch.results[:2] == [len(CONTENT), len(CONTENT)]
+        assert isinstance(batch.results[2], QBProcessingError)
+        assert outputs[0].getvalue() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_download_file_async():
+    with serve_files() as server:
+        client = AsyncQBClient(get_url(server), timeout=10)
+        output = io.BytesIO()
+
+        try:
+            size = await client.builds.download_file(1, 'broken', output)
+
+            with pytest.raises(QBProcessingError):
+                await client.builds.download_file(1, 'missing', io.BytesIO())
+
+            batch = await client.builds.download_files(1, {
+                'file': io.BytesIO(),
+                'no-range': io.BytesIO(),
+            })
+        finally:
+            await client.close()
+
+        assert size == len(CONTENT)
+        assert output.getvalue() == CONTENT
+        assert server.requests[:2] == [('broken', None), ('broken', 'bytes=131072-')]
+        assert batch.results == [len(CONTENT), len(CONTENT)]
@@ -0,0 +1,165 @@
+import re
+
+import pytest
+import responses
+
+from quickbuild import (
+    AsyncQBClient,
+    BuildGraph,
+    QBClient,
+    QBError,
+    QBNotFoundError,
+)
+from quickbuild.helpers import ContentType
+from quickbuild.models import BuildReference
+from tests.conftest import add_callback
+
+# build id mapped to ids of builds it depends on
+DEPENDENCIES = {
+    1: [2, 3],
+    2: [4],
+    3: [4],
+    4: [],
+    # cycle
+    5: [6],
+    6: [7],
+    7: [5],
+}
+
+
+def get_dependents(build_id):
+    return [i for i, dependencies in DEPENDENCIES.items() if build_id in dependencies]
+
+
+def make_builds_response(path, _):
+    build_id, direction = re.search(r'builds/(\d+)/(\w+)', path).groups()
+
+    if direction == 'dependencies':
+        build_ids = DEPENDENCIES[int(build_id)]
+    else:
+        build_ids = get_dependents(int(build_id))
+
+    build = (
+        '<com.pmease.quickbuild.model.Build><id>{0}</id>'
+        '<version>1.0.{0}</version></com.pmease.quickbuild.model.Build>'
+    )
+
+    return '<list>{}</list>'.format(''.join(build.format(i) for i in build_ids))
+
+
+def add_builds_callback(mock):
+    add_callback(
+        mock,
+        re.compile(r'.*/rest/builds/\d+/(dependencies|dependents)'),
+        make_builds_response,
+    )
+
+
+@responses.activate
+def test_get_graph(client):
+    add_builds_callback(responses)
+
+    graph = client.builds.get_graph(1)
+
+    assert sorted(graph.nodes) == [1, 2, 3, 4]
+    assert graph.nodes[4].version == '1.0.4'
+
+    # shared dependency is requested once
+    assert len(responses.calls) == 4
+
+    assert graph.get_dependencies(1) == [2, 3]
+    assert graph.get_dependencies(1, transitive=True) == [2, 3, 4]
+    assert graph.get_dependents(4, transitive=True) == [2, 3, 1]
+    assert graph.topological_order() == [4, 2, 3, 1]
+    assert graph.find_cycle() is None
+
+
+@responses.activate
+def test_get_graph_dependents(client):
+    add_builds_callback(responses)
+
+    graph = client.builds.get_graph(4, direction='dependents')
+
+    assert graph.get_dependents(4, transitive=True) == [2, 3, 1]
+    assert graph.dependencies[1] == [2, 3]
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_get_graph_max_depth(client):
+    add_builds_callback(responses)
+
+    graph = client.builds.get_graph([2], direction='both', max_depth=0)
+
+    assert sorted(graph.nodes) == [1, 2, 4]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_get_graph_cycle(client):
+    add_builds_callback(responses)
+
+    graph = client.builds.get_graph(5)
+
+    assert len(graph) == 3
+    assert len(responses.calls) == 3
+    assert graph.find_cycle() == [5, 6, 7]
+
+    with pytest.raises(QBError):
+        graph.topological_order()
+
+
+def test_get_graph_arguments():
+    client = QBClient('http://server')
+
+    with pytest.raises(QBError):
+        client.builds.get_graph(1, direction='upstream')
+
+    with pytest.raises(QBError):
+        client.builds.get_graph(1, max_depth=-1)
+
+    with pytest.raises(QBError):
+        client.builds.get_graph(1, concurrency=0)
+
+
+@responses.activate
+def test_get_graph_xml():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/\d+/dependencies'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    client = QBClient('http://server', content_type=ContentType.XML)
+    with pytest.raises(QBError):
+        client.builds.get_graph(1)
+
+
+def test_build_graph():
+    graph = BuildGraph()
+    graph.update('dependencies', 1, [BuildReference(2), BuildReference(3, version='1.0')])
+    graph.update('dependents', 2, [BuildReference(3)])
+
+    assert 3 in graph
+    assert graph.nodes[3].version == '1.0'
+    assert graph.get_dependencies(3) == [2]
+    assert graph.topological_order() == [2, 3, 1]
+
+    with pytest.raises(QBNotFoundError):
+        graph.get_dependents(5)
+
+
+@pytest.mark.asyncio
+async def test_get_graph_async(aiohttp_mock):
+    add_builds_callback(aiohttp_mock)
+
+    client = AsyncQBClient('http://server')
+    try:
+        graph = await client.builds.get_graph([1, 5], concurrency=2)
+    finally:
+        await client.close()
+
+    assert sorted(graph.nodes) == [1, 2, 3, 4, 5, 6, 7]
+    assert graph.get_dependencies(1, transitive=True) == [2, 3, 4]
+    assert graph.find_cycle() == [5, 6, 7]
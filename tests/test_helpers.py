@@ -1,6 +1,21 @@
+import importlib
 import json
+import pkgutil
 
-from quickbuild.helpers import ContentType, response2py
+from typing import Any
+from xml.parsers.expat import ExpatError
+
+import pytest
+import xmltodict
+
+import tests
+
+from quickbuild.helpers import (
+    CLASS_KEYWORD,
+    ContentType,
+    parse_date,
+    response2py,
+)
 
 DASHBOARDS_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
 
@@ -99,3 +114,151 @@ def test_xml_json_equal():
     assert column_xml['width'] == column_json['width']
     assert len(column_xml['gadgetDOMs']) == len(column_json['gadgetDOMs'])
     assert column_xml['gadgetDOMs'][0]['@class'] == column_json['gadgetDOMs'][0]['@class']
+
+
+def legacy_response2py(obj: Any) -> Any:
+    """
+    Reference implementation based on xmltodict which streaming converter
+    must be equal to.
+    """
+    if obj == '':
+        return None
+
+    try:
+        obj = xmltodict.parse(obj)
+    except ExpatError:
+        pass
+
+    if isinstance(obj, dict) is False:
+        return _to_python(obj)
+
+    if 'list' not in obj:
+        key = next(iter(obj))
+        new_obj = obj[key]
+        new_obj[CLASS_KEYWORD] = key
+        return _to_python(new_obj)
+
+    obj = obj['list']
+    if obj is None:
+        return []
+
+    return _to_python(obj, to_list=True)
+
+
+def _to_python(obj: Any, to_list: bool = False) -> Any:
+    # pylint: disable=R0912
+
+    if isinstance(obj, str):
+        if obj.isdigit():
+            return int(obj)
+
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            obj[i] = _to_python(v)
+        return obj
+
+    if isinstance(obj, dict) is False:
+        return obj
+
+    if list(obj.keys())[0].startswith('com.pmease.quickbuild') or to_list:
+        new_obj = []
+
+        for k, v in obj.items():
+            if isinstance(v, list):
+                for item in v:
+                    item = _to_python(item)
+                    if isinstance(item, dict):
+                        item[CLASS_KEYWORD] = k
+                    new_obj.append(_to_python(item))
+            elif isinstance(v, dict):
+                v[CLASS_KEYWORD] = k
+                new_obj.append(_to_python(v))
+            else:
+                new_obj.append(_to_python(v))
+
+        return new_obj
+
+    orig, obj = obj, {}
+
+    for k, v in orig.items():
+        # make more json similar
+        if k.startswith('@') and k != CLASS_KEYWORD:
+            k = k[1:]
+
+        if isinstance(v, (dict, list)):
+            obj[k] = _to_python(v)
+        elif isinstance(v, str) is False:
+            obj[k] = v
+            continue
+        elif v == 'true':
+            obj[k] = True
+        elif v == 'false':
+            obj[k] = False
+        elif v.isdigit():
+            obj[k] = int(v)
+        else:
+            obj[k] = v
+
+    return obj
+
+
+def collect_xml_fixtures():
+    fixtures = []
+
+    for module_info in pkgutil.walk_packages(tests.__path__, 'tests.'):
+        module = importlib.import_module(module_info.name)
+
+        for name, value in vars(module).items():
+            if name.isupper() and isinstance(value, str) and value.strip().startswith('<'):
+                fixtures.append(pytest.param(value, id=module_info.name + '.' + name))
+
+    return fixtures
+
+
+EDGE_CASES_XML = (
+    '<list/>',
+    '<list>  </list>',
+    '<list><string>a</string><string>1</string><string>true</string></list>',
+    '<list><long>1</long></list>',
+    '<a><b>true</b><b>false</b><c>true</c><d>007</d><e/></a>',
+    '<a x="1" class="attr"><b>1</b>text<c>2</c> tail </a>',
+    '<a><password secret="hash">value</password></a>',
+    '<a><b><c>1</c></b><d>x</d><b><c>2</c></b></a>',
+    '<a><com.pmease.quickbuild.X><id>1</id></com.pmease.quickbuild.X></a>',
+    '<a><com.pmease.quickbuild.X><com.pmease.quickbuild.Y/></com.pmease.quickbuild.X></a>',
+    '<list><com.pmease.quickbuild.X><com.pmease.quickbuild.Y><id>1</id></com.pmease.quickbuild.Y>'
+    '</com.pmease.quickbuild.X></list>',
+    '<a><b><![CDATA[<b>1</b>]]></b></a>',
+    '<a><b>&lt;&amp;&gt;</b></a><!-- comment -->',
+    '6.0.9',
+    '12345',
+    'SUCCESSFUL',
+    '  ',
+)
+
+
+@pytest.mark.parametrize('document', collect_xml_fixtures() + list(EDGE_CASES_XML))
+def test_streaming_parser_equal_legacy(document):
+    # repr is used to check keys order and strict types (True == 1)
+    assert repr(response2py(document, ContentType.PARSE)) == repr(legacy_response2py(document))
+
+
+def test_response2py_bytes():
+    document = '<a><b>значение</b><c>1</c></a>'
+
+    expected = response2py(document, ContentType.PARSE)
+
+    assert response2py(document.encode(), ContentType.PARSE) == expected
+    assert response2py(document.encode(), ContentType.XML) == document
+    assert response2py(document.encode(), ContentType.RAW) == document.encode()
+    assert response2py(b'12345', ContentType.PARSE) == 12345
+    assert response2py(b'', ContentType.PARSE) is None
+
+
+def test_parse_date():
+    assert parse_date('2021-01-18T13:28:15.033Z') == 1610976495.033
+    assert parse_date('2021-01-18T13:28:15.033+00:00') == 1610976495.033
+    assert parse_date(1610976495033) == 1610976495.033
+    assert parse_date('garbage') is None
+    assert parse_date(None) is None
+    assert parse_date(True) is None
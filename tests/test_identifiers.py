@@ -1,7 +1,14 @@
 import re
 
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 import responses
 
+from quickbuild import AsyncQBClient, QBError, QBServerError
+from quickbuild.cache import IdentifierCache
+
 
 @responses.activate
 def test_get_resource_id_by_name(client):
@@ -105,3 +112,89 @@ def test_get_dashboard_id_by_dashboard_fqn(client):
 
     response = client.dashboards.get_id_by_fqn('1.project1')
     assert response == 1
+
+
+def ids_callback(request):
+    name = parse_qs(urlparse(request.url).query)['user_name'][0]
+    if name == 'missing':
+        return (HTTPStatus.NO_CONTENT, {}, '')
+    if name == 'broken':
+        return (HTTPStatus.INTERNAL_SERVER_ERROR, {}, 'error')
+    return (HTTPStatus.OK, {}, str(len(name)))
+
+
+@responses.activate
+def test_resolve_many(client):
+    responses.add_callback(
+        responses.GET,
+        re.compile(r'.*/rest/ids'),
+        callback=ids_callback,
+    )
+
+    result = client.identifiers.resolve_many('user', ['a', 'bb', 'missing', 'a'])
+    assert result == {'a': 1, 'bb': 2, 'missing': None}
+    assert len(responses.calls) == 3
+
+    result = client.identifiers.resolve_many('user', ['bb', 'missing', 'ccc'])
+    assert result == {'bb': 2, 'missing': None, 'ccc': 3}
+    assert len(responses.calls) == 4
+
+    assert client.identifiers.cache.get_name('user', 3) == 'ccc'
+    assert client.identifiers.cache.get_name('group', 3) is None
+
+    # any modification could rename objects
+    responses.add(responses.POST, re.compile(r'.*/rest/users'), body='4')
+    client.users.update('<com.pmease.quickbuild.model.user.User/>')
+    assert len(client.identifiers.cache) == 0
+    assert len(responses.calls) == 5
+
+    client.identifiers.resolve_many('user', ['bb'])
+    assert len(responses.calls) == 6
+
+    client.identifiers.cache = IdentifierCache(negative_ttl=0)
+    client.identifiers.resolve_many('user', ['missing'])
+    client.identifiers.resolve_many('user', ['missing'])
+    assert len(responses.calls) == 8
+
+    with pytest.raises(QBServerError):
+        client.identifiers.resolve_many('user', ['broken'])
+
+    with pytest.raises(QBError):
+        client.identifiers.resolve_many('build', ['1.latest'])
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_async(aiohttp_mock):
+    aiohttp_mock.get(
+        'http://server/rest/ids?configuration_path=root',
+        content_type='text/plain',
+        body='1',
+    )
+
+    aiohttp_mock.get(
+        'http://server/rest/ids?configuration_path=root/missing',
+        status=HTTPStatus.NO_CONTENT,
+    )
+
+    client = AsyncQBClient('http://server')
+
+    try:
+        result = await client.identifiers.resolve_many(
+            'configuration', ['root', 'root/missing']
+        )
+        assert result == {'root': 1, 'root/missing': None}
+
+        # served from cache
+        result = await client.identifiers.resolve_many('configuration', ['root'])
+        assert result == {'root': 1}
+
+        aiohttp_mock.post(
+            'http://server/rest/configurations',
+            content_type='text/plain',
+            body='1',
+        )
+
+        await client.configurations.update('<configuration/>')
+        assert len(client.identifiers.cache) == 0
+    finally:
+        await client.close()
@@ -1,7 +1,11 @@
 import re
+import sys
 
+import pytest
 import responses
 
+from quickbuild import AsyncQBClient, ContentType, QBClient, QBError
+
 MEASUREMENTS_GET_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
 
 <list>
@@ -56,3 +60,83 @@ def test_get_version(client):
 
     response = client.measurements.get_version()
     assert response == '6.0'
+
+
+def make_measurements_xml(points):
+    measurement = (
+        '<com.pmease.quickbuild.model.MeasurementDataR00>'
+        '<id>1</id><timestamp>{}</timestamp><source>{}</source>'
+        '<metricName>{}</metricName><value>{}</value>'
+        '</com.pmease.quickbuild.model.MeasurementDataR00>'
+    )
+
+    return '<list>{}</list>'.format(''.join(measurement.format(*point) for point in points))
+
+
+@responses.activate
+def test_get_columns(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/grid/measurements'),
+        content_type='application/xml',
+        body=make_measurements_xml([
+            (3000, 'agent1:8811', 'disk.usage', 30),
+            (1000, 'agent1:8811', 'disk.usage', 10.5),
+            (1000, 'agent2:8811', 'disk.usage', 50),
+            (2000, 'agent1:8811', 'cpu.usage', 1),
+        ]),
+    )
+
+    columns = client.measurements.get_columns(period='LAST_MONTH', metric='disk.usage')
+
+    assert len(columns) == 3
+    assert columns.sources == ['agent1:8811', 'agent2:8811']
+    assert columns.metrics == ['disk.usage', 'cpu.usage']
+
+    # series are sorted by timestamp
+    series = columns['agent1:8811', 'disk.usage']
+    assert list(series.timestamps) == [1000, 3000]
+    assert list(series.values) == [10.5, 30.0]
+
+    assert 'period=LAST_MONTH' in responses.calls[0].request.url
+
+
+@responses.activate
+def test_get_columns_xml_client():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/grid/measurements'),
+        content_type='application/xml',
+        body=MEASUREMENTS_GET_XML,
+    )
+
+    # columns are parsed regardless of content type of client
+    client = QBClient('http://server', content_type=ContentType.XML)
+    columns = client.measurements.get_columns()
+
+    series = columns.get_series('Zhenyu-MBP.local:8810', 'web.rpc.oneMinuteRate')
+    assert series.values[0] == pytest.approx(10.3903417298681)
+
+
+def test_get_columns_numpy(client, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+
+    with pytest.raises(QBError):
+        client.measurements.get_columns(numpy=True)
+
+
+@pytest.mark.asyncio
+async def test_get_columns_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/grid/measurements'),
+        content_type='application/xml',
+        body=MEASUREMENTS_GET_XML,
+    )
+
+    client = AsyncQBClient('http://server')
+    try:
+        columns = await client.measurements.get_columns()
+    finally:
+        await client.close()
+
+    assert len(columns) == 2
@@ -0,0 +1,155 @@
+import re
+
+from http import HTTPStatus
+
+import pytest
+import responses
+
+from quickbuild import AsyncQBClient, QBClient, QBNotFoundError
+from quickbuild.metrics import (
+    OpenTelemetryHook,
+    PrometheusHook,
+    RequestMetrics,
+    path_template,
+)
+
+
+def test_path_template():
+    assert path_template('builds/1/status') == 'builds/{id}/status'
+    assert path_template('configurations/10') == 'configurations/{id}'
+    assert path_template('builds/1/steps/master') == 'builds/{id}/steps/{name}'
+    assert path_template('version') == 'version'
+
+    # names given by caller
+    assert path_template('buildagents/agent:8811/running_steps') == \
+        'buildagents/{name}/running_steps'
+    assert path_template('changes/stats/root/a/b') == 'changes/stats/{name}'
+    assert path_template('junit/meta/tests') == '{name}/meta/{name}'
+
+
+@responses.activate
+def test_sync_hook():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        body='SUCCESSFUL',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/2/status'),
+        body='Not found',
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    records = []
+
+    client = QBClient('http://server')
+    client.add_hook(records.append)
+
+    assert client.builds.get_status(1) == 'SUCCESSFUL'
+
+    with pytest.raises(QBNotFoundError):
+        client.builds.get_status(2)
+
+    assert len(records) == 2
+
+    assert records[0].method == 'GET'
+    assert records[0].path == 'builds/{id}/status'
+    assert records[0].status == HTTPStatus.OK
+    assert records[0].size == len('SUCCESSFUL')
+    assert records[0].network_time > 0
+    assert records[0].parse_time > 0
+    assert records[0].retries == 0
+
+    assert records[1].status == HTTPStatus.NOT_FOUND
+
+    client.remove_hook(records.append)
+    client.builds.get_status(1)
+    assert len(records) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_hook(aiohttp_mock):
+    aiohttp_mock.get(
+        'http://server/rest/builds/1/status',
+        content_type='text/plain',
+        body='Server error',
+        status=HTTPStatus.INTERNAL_SERVER_ERROR,
+    )
+
+    aiohttp_mock.get(
+        'http://server/rest/builds/1/status',
+        content_type='text/plain',
+        body='SUCCESSFUL',
+    )
+
+    records = []
+
+    client = AsyncQBClient(
+        'http://server',
+        retry=dict(total=2, factor=0, statuses=[HTTPStatus.INTERNAL_SERVER_ERROR]),
+    )
+    client.add_hook(records.append)
+
+    try:
+        assert await client.builds.get_status(1) == 'SUCCESSFUL'
+    finally:
+        await client.close()
+
+    assert records == [
+        RequestMetrics(
+            'GET',
+            'builds/{id}/status',
+            HTTPStatus.OK,
+            len('SUCCESSFUL'),
+            records[0].network_time,
+            records[0].parse_time,
+            1,
+        )
+    ]
+
+
+def test_prometheus_hook():
+    prometheus_client = pytest.importorskip('prometheus_client')
+
+    registry = prometheus_client.CollectorRegistry()
+    hook = PrometheusHook(registry)
+
+    hook(RequestMetrics('GET', 'builds/{id}/status', 200, 10, 0.5, 0.1, 2))
+    hook(RequestMetrics('GET', 'builds/{id}/status', 200, 20, 0.5, 0.1, 0))
+
+    labels = dict(method='GET', path='builds/{id}/status', status='200')
+
+    assert registry.get_sample_value('quickbuild_requests_total', labels) == 2
+    assert registry.get_sample_value('quickbuild_response_bytes_total', labels) == 30
+    assert registry.get_sample_value('quickbuild_retries_total', labels) == 2
+    assert registry.get_sample_value('quickbuild_network_seconds_sum', labels) == 1
+    assert registry.get_sample_value('quickbuild_parse_seconds_count', labels) == 2
+
+
+def test_opentelemetry_hook():
+    # pylint: disable=import-outside-toplevel
+    pytest.importorskip('opentelemetry.sdk')
+
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from opentelemetry.trace import StatusCode
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    hook = OpenTelemetryHook(provider.get_tracer('test'))
+    hook(RequestMetrics('GET', 'builds/{id}/status', 404, 10, 0.5, 0.25, 0))
+
+    span, = exporter.get_finished_spans()
+
+    assert span.name == 'GET builds/{id}/status'
+    assert span.attributes['http.response.status_code'] == 404
+    assert span.attributes['http.response.body.size'] == 10
+    assert span.end_time - span.start_time == 750_000_000
+    assert span.status.status_code == StatusCode.ERROR
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+
+from quickbuild import AsyncQBClient, QBError, QBNotFoundError
+from quickbuild.helpers import ContentType, response2py
+from quickbuild.models import (
+    BuildReference,
+    StepTree,
+    parse_builds,
+    parse_repositories,
+    parse_steps,
+)
+from tests.test_builds import BUILD_STEPS_XML
+
+
+def make_step(path, kind='SequentialStep'):
+    names = path.split('>')
+    return {
+        '@class': 'com.pmease.quickbuild.stepsupport.' + kind,
+        'name': names[-1],
+        'enabled': True,
+        'path': {'elements': [{'stepName': name} for name in names]},
+        'timeout': 0,
+        'nodeMatcher': {'@class': 'ParentNodeMatcher'},
+    }
+
+
+def test_step_tree():
+    steps = StepTree([
+        make_step('master'),
+        make_step('master>build'),
+        make_step('master>build>compile', 'CommandlineBuildStep'),
+        make_step('master>test'),
+        make_step('master>test>compile'),
+    ])
+
+    assert len(steps) == 5
+    assert 'test' in steps
+
+    # the first step is returned for duplicated name
+    assert steps.get('compile').path == 'master>build>compile'
+    assert steps.get_by_path('master>test>compile').parent.name == 'test'
+
+    master = steps.get('master')
+    assert [child.name for child in master.children] == ['build', 'test']
+    assert master.parent is None
+    assert master.properties == {'timeout': 0}
+
+    with pytest.raises(QBNotFoundError):
+        steps.get('deploy')
+
+    with pytest.raises(QBNotFoundError):
+        steps.get_by_path('master>deploy')
+
+
+def test_step_tree_single_step():
+    steps = parse_steps(response2py(
+        '<list><com.pmease.quickbuild.stepsupport.SequentialStep><name>master</name>'
+        '</com.pmease.quickbuild.stepsupport.SequentialStep></list>',
+        ContentType.PARSE,
+    ))
+
+    assert [step.path for step in steps.roots] == ['master']
+
+
+def test_parse_documents():
+    builds = parse_builds([5, {'id': 6, 'status': 'FAILED'}])
+    assert builds == [BuildReference(5), BuildReference(6)]
+    assert parse_repositories(None) == []
+
+    # native documents are returned as is
+    assert parse_steps('<list/>') == '<list/>'
+    assert parse_builds(b'<list/>') == b'<list/>'
+
+    with pytest.raises(QBError):
+        parse_builds(5)
+
+
+@pytest.mark.asyncio
+async def test_get_steps_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/\d+/steps'),
+        content_type='application/xml',
+        body=BUILD_STEPS_XML,
+    )
+
+    client = AsyncQBClient('http://server')
+    try:
+        steps = await client.builds.get_steps(1)
+    finally:
+        await client.close()
+
+    assert steps.get('sleep').parent.name == 'master'
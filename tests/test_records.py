@@ -0,0 +1,159 @@
+import pickle
+import re
+
+import pytest
+import responses
+
+from quickbuild import AsyncQBClient, ContentType, QBClient, QBError
+from quickbuild.records import (
+    AuditRecord,
+    BuildRecord,
+    ChangesetRecord,
+    MeasurementRecord,
+    parse_records,
+)
+from tests.test_audits import AUDITS_XML
+from tests.test_builds import BUILD_INFO_XML, BUILD_SEARCH_XML
+from tests.test_changes import CHANGESETS_XML
+from tests.test_measurements import MEASUREMENTS_GET_XML
+
+
+@pytest.fixture(name='records_client')
+def records_client_fixture():
+    return QBClient('http://server', content_type=ContentType.RECORDS)
+
+
+@responses.activate
+def test_builds_search(records_client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*'),
+        content_type='application/xml',
+        body=BUILD_SEARCH_XML,
+    )
+
+    builds = records_client.builds.search(count=2)
+    build = builds[0]
+
+    assert isinstance(build, BuildRecord)
+    assert build.id == 4
+    assert build.scheduled is False
+    assert build.wait_duration == 26
+
+    # dict-style access by keys of document
+    assert build['beginDate'] == build.begin_date == '2021-01-18T13:28:15.033Z'
+    assert build.get('status') == 'SUCCESSFUL'
+    assert build.get('stepRuntimes') is None
+    assert 'duration' in build
+    assert build.to_dict()['version'] == '1.0.3'
+
+    with pytest.raises(KeyError):
+        build['stepRuntimes']  # pylint: disable=pointless-statement
+
+    with pytest.raises(AttributeError):
+        build.extra = 1
+
+
+@responses.activate
+def test_other_endpoints(records_client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1'),
+        content_type='application/xml',
+        body=BUILD_INFO_XML,
+    )
+
+    # endpoints without records are parsed as for PARSE content type
+    assert records_client.builds.get_info(1)['id'] == 1
+
+
+@responses.activate
+def test_audits_get(records_client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/audits'),
+        content_type='application/xml',
+        body=AUDITS_XML,
+    )
+
+    audits = records_client.audits.get(3)
+
+    assert [audit.id for audit in audits] == [47, 46, 45]
+    assert audits[1]['configuration'] == 3
+    assert audits[0].action is audits[1].action
+
+
+@responses.activate
+def test_changes_get_changesets(records_client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/changes/.+'),
+        content_type='text/xml',
+        body=CHANGESETS_XML,
+    )
+
+    changeset = records_client.changes.get_changesets(1)[0]
+
+    assert isinstance(changeset, ChangesetRecord)
+    assert changeset.user == 'steve'
+    assert changeset['repositoryName'] == 'hg'
+    assert changeset.build_id == 321
+    assert [item.path for item in changeset.modifications] == ['Test.java', 'big.java']
+    assert changeset.modifications[0]['previousEdition'].startswith('f090')
+
+
+@responses.activate
+def test_measurements_get(records_client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/grid/measurements'),
+        content_type='application/xml',
+        body=MEASUREMENTS_GET_XML,
+    )
+
+    measurement = records_client.measurements.get()[0]
+
+    assert isinstance(measurement, MeasurementRecord)
+    assert measurement.value == pytest.approx(10.3903417298681)
+    assert measurement['metricName'] == 'web.rpc.oneMinuteRate'
+    assert measurement.timestamp == 1361854800000
+
+
+def test_parse_records():
+    assert parse_records(AuditRecord, None) == []
+
+    audits = parse_records(AuditRecord, {'id': '5', 'user': 'admin'})
+    assert audits == [{
+        'id': 5,
+        'user': 'admin',
+        'source': None,
+        'timestamp': None,
+        'configuration': None,
+        'action': None,
+    }]
+
+    assert pickle.loads(pickle.dumps(audits[0])) == audits[0]
+    assert repr(audits[0]).startswith("AuditRecord(id=5, user='admin'")
+
+    with pytest.raises(QBError):
+        parse_records(AuditRecord, '<list/>')
+
+    with pytest.raises(QBError):
+        parse_records(AuditRecord, [5])
+
+
+@pytest.mark.asyncio
+async def test_records_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/grid/measurements'),
+        content_type='application/xml',
+        body=MEASUREMENTS_GET_XML,
+    )
+
+    client = AsyncQBClient('http://server', content_type=ContentType.RECORDS)
+    try:
+        measurements = await client.measurements.get()
+    finally:
+        await client.close()
+
+    assert [measurement.id for measurement in measurements] == [335, 334]
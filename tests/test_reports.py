@@ -1,7 +1,15 @@
 import re
 
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 import responses
 
+from aioresponses import CallbackResult
+
+from quickbuild import AsyncQBClient, ContentType, QBClient, QBError
+
 CATEGORIES_XML = r"""
 <list>
   <string>unprocessed</string>
@@ -160,3 +168,91 @@ def test_get_records_data(client):
 
     assert len(data) == 4
     assert data[0]['testName'] == 'testPojoRetreival'
+
+
+def make_records_xml(query, size=7):
+    offset = int(query.get('offset', [0])[0])
+    limit = int(query.get('limit', [50])[0])
+
+    rows = ''.join(
+        '<row ID="{0}" testName="test{0}"/>'.format(i)
+        for i in range(offset, min(offset + limit, size))
+    )
+    return '<report name="tests">{}</report>'.format(rows)
+
+
+@responses.activate
+def test_iter_records(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/junit/size/tests/103/DEFAULT'),
+        content_type='text/plain',
+        body='7',
+    )
+    responses.add_callback(
+        responses.GET,
+        re.compile(r'.*/rest/junit/records/tests/103/DEFAULT.*'),
+        callback=lambda request: (
+            HTTPStatus.OK, {}, make_records_xml(parse_qs(urlparse(request.url).query))
+        ),
+    )
+
+    records = client.reports.get_tracker('junit').iter_records(
+        'tests',
+        103,
+        'DEFAULT',
+        page_size=3,
+        concurrency=2,
+    )
+
+    # last page has single record
+    assert [record['ID'] for record in records] == list(range(7))
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_iter_records_xml():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/junit/size/tests/103/DEFAULT'),
+        content_type='text/plain',
+        body='7',
+    )
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/junit/records/tests/103/DEFAULT.*'),
+        content_type='application/xml',
+        body=RECORDS_DATA_XML,
+    )
+
+    tracker = QBClient('http://server', content_type=ContentType.XML).reports.get_tracker('junit')
+
+    with pytest.raises(QBError):
+        list(tracker.iter_records('tests', 103, 'DEFAULT'))
+
+    with pytest.raises(QBError):
+        tracker.iter_records('tests', 103, 'DEFAULT', page_size=0)
+
+
+@pytest.mark.asyncio
+async def test_iter_records_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/junit/size/tests/103/DEFAULT'),
+        body='7',
+    )
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/junit/records/tests/103/DEFAULT.*'),
+        callback=lambda url, **kwargs: CallbackResult(
+            content_type='application/xml',
+            body=make_records_xml({k: [v] for k, v in url.query.items()}),
+        ),
+        repeat=True,
+    )
+
+    client = AsyncQBClient('http://server')
+    try:
+        tracker = client.reports.get_tracker('junit')
+        records = tracker.iter_records('tests', 103, 'DEFAULT', page_size=2)
+        assert [record['ID'] async for record in records] == list(range(7))
+    finally:
+        await client.close()
@@ -0,0 +1,173 @@
+import re
+
+from datetime import datetime, timezone
+from functools import partial
+
+import pytest
+import responses
+
+from quickbuild import (
+    AsyncAuditTailer,
+    AsyncQBClient,
+    AuditTailer,
+    ContentType,
+    FileMarkStore,
+    QBClient,
+    QBError,
+    SQLiteMarkStore,
+)
+from quickbuild.tailer import HighWaterMark
+from tests.conftest import add_callback
+
+
+def make_audit(audit_id, second, action='login'):
+    return audit_id, '2024-01-01T00:00:{:02d}.000Z'.format(second), action
+
+
+def make_audits(count):
+    return [make_audit(i, i) for i in range(1, count + 1)]
+
+
+def make_audits_response(audits, path, query):
+    audits = [item for item in audits if item[2] == query.get('action', item[2])]
+
+    if path.endswith('/count'):
+        return str(len(audits))
+
+    first = int(query.get('first', 0))
+    count = int(query['count'])
+
+    audit = (
+        '<com.pmease.quickbuild.model.Audit><id>{}</id><timestamp>{}</timestamp>'
+        '<action>{}</action></com.pmease.quickbuild.model.Audit>'
+    )
+
+    # newest audits go first
+    return '<list>{}</list>'.format(''.join(
+        audit.format(*item) for item in list(reversed(audits))[first:first + count]
+    ))
+
+
+def add_audits_callback(mock, audits):
+    add_callback(mock, re.compile(r'.*/rest/audits.*'), partial(make_audits_response, audits))
+
+
+def get_ids(audits):
+    return [audit['id'] for audit in audits]
+
+
+@responses.activate
+def test_tailer(client, tmp_path):
+    audits = make_audits(5)
+    add_audits_callback(responses, audits)
+
+    store = FileMarkStore(str(tmp_path / 'mark.json'))
+    tailer = AuditTailer(client, store, page_size=2)
+
+    assert get_ids(tailer.poll()) == [1, 2, 3, 4, 5]
+    assert len(responses.calls) == 4
+
+    # count hasn't changed, so only count is requested
+    assert tailer.poll() == []
+    assert len(responses.calls) == 5
+
+    # new audit has the same timestamp as the last seen one
+    audits.extend([make_audit(6, 5), make_audit(7, 8), make_audit(8, 9)])
+
+    tailer = AuditTailer(client, store, page_size=2)
+    assert get_ids(tailer.poll()) == [6, 7, 8]
+
+    # count and pages until older audit is reached: [8, 7], [6, 5], [4, 3]
+    assert len(responses.calls) == 9
+
+    assert store.load() == HighWaterMark(8, tailer._mark.timestamp, [8])
+
+
+@responses.activate
+def test_tailer_since(client):
+    add_audits_callback(responses, make_audits(5))
+
+    since = datetime(2024, 1, 1, 0, 0, 3, tzinfo=timezone.utc)
+    tailer = AuditTailer(client, since=since, page_size=10)
+
+    assert get_ids(tailer.poll()) == [3, 4, 5]
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_tailer_prune(client):
+    audits = make_audits(5)
+    add_audits_callback(responses, audits)
+
+    audits[1:3] = [make_audit(2, 2, 'logout'), make_audit(3, 3, 'logout')]
+
+    tailer = AuditTailer(client, action='login', page_size=10)
+    assert get_ids(tailer.poll()) == [1, 4, 5]
+
+    # the oldest audit is deleted and audit of another action is created,
+    # so the same count of matched audits means there is nothing new
+    del audits[0]
+    audits.append(make_audit(6, 6, 'logout'))
+    assert tailer.poll() == []
+
+    # total count is the same, but count of matched audits has changed
+    del audits[0]
+    audits.append(make_audit(7, 7))
+    assert get_ids(tailer.poll()) == [7]
+
+
+def test_tailer_timestamps(client):
+    tailer = AuditTailer(client, page_size=10)
+    tailer._begin(1)
+
+    # JSON content has timestamps in milliseconds
+    tailer._collect([{'id': 1, 'timestamp': 1704067201000}])
+    assert tailer._advance(1) == [{'id': 1, 'timestamp': 1704067201000}]
+    assert tailer._mark.timestamp == 1704067201.0
+
+    with pytest.raises(QBError):
+        tailer._collect([{'id': 2, 'timestamp': 'yesterday'}])
+
+
+def test_tailer_arguments():
+    client = QBClient('http://server', content_type=ContentType.XML)
+
+    with pytest.raises(QBError):
+        AuditTailer(client, page_size=0)
+
+    tailer = AuditTailer(client)
+    with pytest.raises(QBError):
+        tailer._collect('<list/>')
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / 'marks.db')
+
+    builds = SQLiteMarkStore(path, 'builds')
+    audits = SQLiteMarkStore(path)
+    assert audits.load() is None
+
+    audits.save(HighWaterMark(10, 1.5, [1, 2]))
+    audits.save(HighWaterMark(11, 2.5, [3]))
+    builds.save(HighWaterMark(1, 0.5, []))
+
+    assert SQLiteMarkStore(path).load() == HighWaterMark(11, 2.5, [3])
+    assert builds.load() == HighWaterMark(1, 0.5, [])
+
+
+@pytest.mark.asyncio
+async def test_tailer_async(aiohttp_mock):
+    audits = make_audits(3)
+    add_audits_callback(aiohttp_mock, audits)
+
+    client = AsyncQBClient('http://server')
+    try:
+        tailer = AsyncAuditTailer(client)
+
+        assert get_ids(await tailer.poll()) == [1, 2, 3]
+        assert await tailer.poll() == []
+
+        audits.append(make_audit(4, 10))
+        assert get_ids(await tailer.poll()) == [4]
+    finally:
+        await client.close()
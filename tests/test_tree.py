@@ -0,0 +1,161 @@
+import re
+
+import pytest
+import responses
+
+from quickbuild import (
+    AsyncQBClient,
+    ConfigurationTree,
+    ContentType,
+    QBClient,
+    QBError,
+    QBNotFoundError,
+)
+from tests.test_configurations import CONFIGURATIONS_XML
+
+
+def make_configuration(configuration_id, name, parent=None):
+    configuration = dict(id=configuration_id, name=name)
+    if parent is not None:
+        configuration['parent'] = parent
+    return configuration
+
+
+@pytest.fixture(name='tree')
+def tree_fixture():
+    yield ConfigurationTree([
+        make_configuration(1, 'root'),
+        make_configuration(2, 'a', 1),
+        make_configuration(3, 'b', 1),
+        make_configuration(4, 'c', 2),
+        make_configuration(5, 'd', 4),
+    ])
+
+
+def test_lookup(tree):
+    assert len(tree) == 5
+    assert 4 in tree
+    assert 10 not in tree
+    assert [c['id'] for c in tree] == [1, 2, 3, 4, 5]
+
+    assert tree.get(2)['name'] == 'a'
+    assert tree.get_path(1) == 'root'
+    assert tree.get_path(5) == 'root/a/c/d'
+    assert tree.get_id_by_path('root/b') == 3
+    assert tree.get_parent(1) is None
+    assert tree.get_parent(4) == 2
+    assert tree.get_ancestors(5) == [4, 2, 1]
+    assert tree.get_ancestors(1) == []
+    assert list(tree.iter_children(1)) == [2, 3]
+    assert not list(tree.iter_children(5))
+    assert list(tree.iter_descendants(1)) == [2, 4, 5, 3]
+
+    with pytest.raises(QBNotFoundError):
+        tree.get(10)
+
+    with pytest.raises(QBNotFoundError):
+        tree.get_id_by_path('root/x')
+
+    with pytest.raises(QBNotFoundError):
+        tree.iter_descendants(10)
+
+
+def test_partial_tree():
+    tree = ConfigurationTree([
+        make_configuration(2, 'a', 1),
+        make_configuration(4, 'c', 2),
+    ])
+
+    assert tree.get_ancestors(4) == [2]
+    assert list(tree.iter_descendants(2)) == [4]
+
+    with pytest.raises(QBNotFoundError):
+        tree.get_path(4)
+
+
+def test_update_recursive(tree):
+    tree.update(2, [
+        make_configuration(4, 'renamed', 2),
+        make_configuration(6, 'e', 2),
+    ])
+
+    assert 5 not in tree
+    assert tree.get_path(4) == 'root/a/renamed'
+    assert tree.get_path(6) == 'root/a/e'
+    assert list(tree.iter_descendants(1)) == [2, 4, 6, 3]
+
+    with pytest.raises(QBNotFoundError):
+        tree.get_id_by_path('root/a/c/d')
+
+    with pytest.raises(QBNotFoundError):
+        tree.update(10, [])
+
+
+def test_update_children(tree):
+    tree.update(1, [make_configuration(2, 'renamed', 1)], recursive=False)
+
+    assert 3 not in tree
+    assert tree.get_path(5) == 'root/renamed/c/d'
+    assert tree.get_id_by_path('root/renamed/c') == 4
+    assert list(tree.iter_descendants(1)) == [2, 4, 5]
+
+
+@responses.activate
+def test_get_tree(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations\?recursive=True$'),
+        body=CONFIGURATIONS_XML,
+    )
+
+    tree = client.configurations.get_tree()
+    assert tree.get_path(3) == 'root/~maintenance/sync configurations'
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations\?recursive=True&parent_id=2'),
+        body='<list/>',
+    )
+
+    client.configurations.refresh_tree(tree, 2)
+    assert len(tree) == 2
+
+
+@responses.activate
+def test_get_tree_xml():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations'),
+        body=CONFIGURATIONS_XML,
+    )
+
+    client = QBClient('http://server', content_type=ContentType.XML)
+
+    with pytest.raises(QBError):
+        client.configurations.get_tree()
+
+
+@pytest.mark.asyncio
+async def test_get_tree_async(aiohttp_mock):
+    aiohttp_mock.get(
+        'http://server/rest/configurations?recursive=true',
+        content_type='application/xml',
+        body=CONFIGURATIONS_XML,
+    )
+
+    aiohttp_mock.get(
+        'http://server/rest/configurations?parent_id=1',
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    client = AsyncQBClient('http://server')
+
+    try:
+        tree = await client.configurations.get_tree()
+        assert tree.get_id_by_path('root/~maintenance') == 2
+
+        await client.configurations.refresh_tree(tree, 1, recursive=False)
+        assert len(tree) == 1
+    finally:
+        await client.close()
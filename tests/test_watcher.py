@@ -0,0 +1,314 @@
+import re
+import time
+
+from http import HTTPStatus
+
+import pytest
+import responses
+
+from quickbuild import (
+    AsyncBuildWatcher,
+    AsyncQBClient,
+    BuildWatcher,
+    ContentType,
+    QBClient,
+    QBError,
+    QBNotFoundError,
+)
+
+RUNNING_BUILDS_XML = r"""<?xml version="1.0" encoding="UTF-8"?>
+
+<list>
+  <com.pmease.quickbuild.model.Build>
+    <id>1</id>
+    <configuration>10</configuration>
+    <status>RUNNING</status>
+    <beginDate>2021-01-18T13:28:15.033Z</beginDate>
+  </com.pmease.quickbuild.model.Build>
+  <com.pmease.quickbuild.model.Build>
+    <id>5</id>
+    <configuration>20</configuration>
+    <status>RUNNING</status>
+    <beginDate>2021-01-18T13:28:15.033Z</beginDate>
+  </com.pmease.quickbuild.model.Build>
+</list>
+"""
+
+
+@responses.activate
+def test_watcher(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body=RUNNING_BUILDS_XML,
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/10/average_duration'),
+        body='60000',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/2/status'),
+        body='SUCCESSFUL',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/3/status'),
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    finished = []
+
+    watcher = BuildWatcher(client)
+    future = watcher.add(1)
+    watcher.add(2, lambda i, status: finished.append((i, status)))
+    watcher.add(3)
+
+    assert watcher.poll() == watcher.interval
+    assert len(watcher) == 1
+    assert finished == [(2, 'SUCCESSFUL')]
+    assert watcher._durations == {10: 60}
+    assert not future.done()
+
+    # running builds are requested once per poll, not per build
+    running_searches = [c for c in responses.calls if 'status=RUNNING' in c.request.url]
+    assert len(running_searches) == 1
+
+
+@responses.activate
+def test_watcher_wait(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        body='FAILED',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/2/status'),
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+    watcher = BuildWatcher(client)
+    watcher.add(1)
+    watcher.add(2)
+
+    statuses = watcher.wait(timeout=1)
+    assert statuses[1] == 'FAILED'
+    assert isinstance(statuses[2], QBNotFoundError)
+
+
+@responses.activate
+def test_watcher_wait_deadline(client, monkeypatch):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body=RUNNING_BUILDS_XML,
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/\d+/average_duration'),
+        body='60000',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        body='SUCCESSFUL',
+    )
+
+    sleeps = []
+    monkeypatch.setattr('quickbuild.watcher.time.sleep', sleeps.append)
+
+    watcher = BuildWatcher(client)
+    watcher.add(1)
+
+    # build is finished within the last interval, which is shorter than usual
+    statuses = watcher.wait(timeout=5)
+    assert statuses == {1: 'SUCCESSFUL'}
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 5
+
+
+@responses.activate
+def test_watcher_cancel(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds/1/status'),
+        body='FAILED',
+    )
+
+    finished = []
+
+    watcher = BuildWatcher(client)
+    watcher.add(1)
+    watcher.add(2, lambda i, status: finished.append((i, status))).cancel()
+
+    # cancelled build isn't checked and isn't returned
+    assert watcher.wait(timeout=1) == {1: 'FAILED'}
+    assert all('builds/2' not in call.request.url for call in responses.calls)
+
+    # future is cancelled while its status is requested
+    watcher.add(3, lambda i, status: finished.append((i, status))).cancel()
+    watcher._complete(3, 'SUCCESSFUL')
+    assert len(watcher) == 0
+    assert not finished
+
+
+@responses.activate
+def test_watcher_adaptive_interval(client):
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body=RUNNING_BUILDS_XML.replace('2021-01-18T13:28:15.033Z', '2000-01-01T00:00:00.000Z'),
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/configurations/10/average_duration'),
+        body='60000',
+    )
+
+    watcher = BuildWatcher(client, min_interval=2)
+    watcher.add(1)
+    watcher.poll()
+
+    # build was expected to finish long ago
+    assert watcher._get_next_interval() == watcher.interval
+
+    watcher._watches[1].begin = time.time()
+    assert 50 < watcher._get_next_interval() <= 60
+
+    watcher._watches[1].begin = time.time() - 59.5
+    assert watcher._get_next_interval() == 2
+
+    with pytest.raises(QBError):
+        watcher.wait(timeout=0.1)
+
+
+@responses.activate
+def test_watcher_xml_content_type():
+    responses.add(
+        responses.GET,
+        re.compile(r'.*/rest/builds.*'),
+        content_type='application/xml',
+        body=RUNNING_BUILDS_XML,
+    )
+
+    watcher = BuildWatcher(QBClient('http://server', content_type=ContentType.XML))
+    watcher.add(1)
+
+    with pytest.raises(QBError):
+        watcher.poll()
+
+    with pytest.raises(QBError):
+        BuildWatcher(QBClient('http://server'), interval=100)
+
+
+@pytest.mark.asyncio
+async def test_watcher_async(aiohttp_mock):
+    for _ in range(2):
+        aiohttp_mock.get(
+            re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+            content_type='application/xml',
+            body=RUNNING_BUILDS_XML,
+        )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/configurations/10/average_duration'),
+        content_type='text/plain',
+        body='60000',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/2/status'),
+        content_type='text/plain',
+        body='SUCCESSFUL',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain',
+        body='CANCELLED',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    client = AsyncQBClient('http://server')
+
+    try:
+        finished = []
+
+        watcher = AsyncBuildWatcher(client, interval=1, min_interval=0)
+        future = watcher.add(1, lambda i, status: finished.append((i, status)))
+        watcher.add(2, lambda i, status: finished.append((i, status)))
+
+        assert await watcher.poll() == 1
+        assert finished == [(2, 'SUCCESSFUL')]
+        assert not future.done()
+
+        watcher._get_next_interval = lambda: 0
+        assert await watcher.wait() == {1: 'CANCELLED'}
+        assert await future == 'CANCELLED'
+        assert finished == [(2, 'SUCCESSFUL'), (1, 'CANCELLED')]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_watcher_cancel_async(aiohttp_mock):
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds\?.*status=RUNNING.*'),
+        content_type='application/xml',
+        body='<list/>',
+    )
+
+    aiohttp_mock.get(
+        re.compile(r'.*/rest/builds/1/status'),
+        content_type='text/plain',
+        body='FAILED',
+    )
+
+    client = AsyncQBClient('http://server')
+
+    try:
+        watcher = AsyncBuildWatcher(client)
+        watcher.add(1)
+        watcher.add(2).cancel()
+
+        assert await watcher.wait(timeout=1) == {1: 'FAILED'}
+    finally:
+        await client.close()